@@ -31,7 +31,8 @@ const Chatbot = () => {
         setIsLoading(true);
 
         try {
-            const response = await fetch('http://localhost:5006/chat', {
+            // Tokens arrive as Server-Sent Events and are appended to the reply as they stream in
+            const response = await fetch('http://localhost:5006/chat/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -42,16 +43,41 @@ const Chatbot = () => {
                 })
             });
 
-            const data = await response.json();
+            if (!response.ok || !response.body) {
+                throw new Error('Failed to get response');
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+            let started = false;
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const frames = buffer.split("\n\n");
+                buffer = frames.pop();
+                for (const frame of frames) {
+                    const event = frame.match(/^event: (.*)$/m)?.[1];
+                    const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || "{}");
 
-            if (response.ok && data.response) {
-                const botMsg = {
-                    text: data.response,
-                    sender: "bot"
-                };
-                setMessages(prev => [...prev, botMsg]);
-            } else {
-                throw new Error(data.error || 'Failed to get response');
+                    if (event === "error") {
+                        throw new Error(data.error || 'Failed to get response');
+                    }
+                    if (event === "token") {
+                        if (!started) {
+                            started = true;
+                            setIsLoading(false);
+                            setMessages(prev => [...prev, { text: "", sender: "bot" }]);
+                        }
+                        setMessages(prev => {
+                            const last = prev[prev.length - 1];
+                            return [...prev.slice(0, -1), { ...last, text: last.text + data.text }];
+                        });
+                    }
+                }
             }
         } catch (error) {
             console.error('Chat error:', error);
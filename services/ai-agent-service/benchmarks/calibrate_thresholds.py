@@ -0,0 +1,135 @@
+"""
+Category cut-offs for the chunked resume score, calibrated against the old score.
+
+Resumes used to be scored by the cosine of one whole-document embedding (which the
+model truncates after ~256 tokens). The section-aware score takes the best chunk
+blended with the section-weighted mean and runs higher, so the same 70/50/30 cut-offs
+put more resumes in "Match" and "Partial Match", which is why the service keeps the
+whole-document score (RESUME_SCORING=document) by default. This scores a sample both
+ways and prints the cut-offs that keep each category's share of resumes where the old
+score put it; deploy them as MATCH_THRESHOLD, PARTIAL_MATCH_THRESHOLD and
+SKILLS_GAP_THRESHOLD together with RESUME_SCORING=chunked.
+Run from services/ai-agent-service:
+
+    python benchmarks/calibrate_thresholds.py --limit 2000       # stored resumes and their jobs
+    python benchmarks/calibrate_thresholds.py --synthetic 500    # generated resumes and jobs
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+import synthetic  # noqa: E402
+
+CATEGORIES = ("Match", "Partial Match", "Skills Gap", "Irrelevant")
+
+
+def matched_thresholds(old_scores, new_scores, cutoffs):
+    """New-score cut-offs that put the same share of resumes above each old cut-off."""
+    old_scores = np.asarray(old_scores, dtype=np.float64)
+    new_scores = np.asarray(new_scores, dtype=np.float64)
+    matched = []
+    for cutoff in cutoffs:
+        share_above = float(np.mean(old_scores > cutoff))
+        matched.append(round(float(np.quantile(new_scores, 1 - share_above)), 1))
+    return matched
+
+
+def category_shares(scores, cutoffs):
+    scores = np.asarray(scores, dtype=np.float64)
+    bounds = list(cutoffs) + [float("-inf")]
+    shares, upper = [], float("inf")
+    for lower in bounds:
+        shares.append(float(np.mean((scores > lower) & (scores <= upper))))
+        upper = lower
+    return shares
+
+
+def _stored_pairs(limit):
+    from utils.database import get_db_connection
+    cursor = get_db_connection()["resumes"].find(
+        {"text": {"$nin": [None, ""]}, "job_description": {"$nin": [None, ""]}},
+        {"text": 1, "job_description": 1},
+    ).limit(limit)
+    return [(doc["text"], doc["job_description"]) for doc in cursor]
+
+
+def _synthetic_pairs(count, seed):
+    rng = random.Random(seed)
+    jobs = [synthetic.job_description(rng) for _ in range(5)]
+    return [(synthetic.resume_text(rng), rng.choice(jobs)) for _ in range(count)]
+
+
+def score_both(pairs):
+    """(old whole-document scores, new chunked scores) for [(resume_text, job_description), ...]."""
+    from services.job_embeddings import get_job_embedding
+    from services.rag_pipeline import _normalize_rows, encode_texts, score_resumes
+
+    by_job = defaultdict(list)
+    for text, job in pairs:
+        by_job[job].append(text)
+    old_scores, new_scores = [], []
+    for job, texts in by_job.items():
+        job_vector = _normalize_rows(get_job_embedding(job))
+        old_scores.extend((_normalize_rows(encode_texts(texts)) @ job_vector * 100).tolist())
+        new_scores.extend(score_resumes(texts, job)[0])
+    return old_scores, new_scores
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--limit", type=int, default=2000, help="stored resumes to sample (default 2000)")
+    source.add_argument("--synthetic", type=int, help="score this many generated resumes instead")
+    parser.add_argument("--fake-model", action="store_true", help="use the benchmarks' hashing encoder")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Config insists on a Gemini key; nothing here calls Gemini
+    os.environ.setdefault("GEMINI_API_KEY", "calibration")
+    workdir = None
+    if args.fake_model:
+        # Keep hashing vectors out of the real job-embedding cache
+        workdir = tempfile.TemporaryDirectory(prefix="resume-calibrate-")
+        os.environ["JOB_EMBEDDING_DIR"] = workdir.name
+    from config.config import Config
+    # The score being calibrated, whatever the environment deploys today
+    Config.RESUME_SCORING = "chunked"
+    if args.fake_model:
+        from services import model_registry
+        from run_benchmarks import HashingEncoder
+        model_registry.register_model(Config.EMBEDDING_MODEL, HashingEncoder(Config.EMBEDDING_DIM))
+
+    pairs = _synthetic_pairs(args.synthetic, args.seed) if args.synthetic else _stored_pairs(args.limit)
+    if not pairs:
+        print("No resumes to calibrate on.")
+        return 1
+    old_scores, new_scores = score_both(pairs)
+    cutoffs = (Config.MATCH_THRESHOLD, Config.PARTIAL_MATCH_THRESHOLD, Config.SKILLS_GAP_THRESHOLD)
+    calibrated = matched_thresholds(old_scores, new_scores, cutoffs)
+
+    print(f"{len(pairs)} resumes, model={Config.EMBEDDING_MODEL} backend={Config.EMBEDDING_BACKEND}")
+    print(f"{'category':<16}{'old score':>11}{'new score':>11}{'calibrated':>12}")
+    rows = zip(CATEGORIES, category_shares(old_scores, cutoffs), category_shares(new_scores, cutoffs),
+               category_shares(new_scores, calibrated))
+    for category, old, new, fixed in rows:
+        print(f"{category:<16}{old:>11.1%}{new:>11.1%}{fixed:>12.1%}")
+    print(f"\nRESUME_SCORING=chunked\nMATCH_THRESHOLD={calibrated[0]}\nPARTIAL_MATCH_THRESHOLD={calibrated[1]}\nSKILLS_GAP_THRESHOLD={calibrated[2]}")
+    if workdir is not None:
+        workdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Latency, throughput and memory benchmarks for the screening pipeline.
+
+Each stage runs on synthetic resumes (see synthetic.py) with Gemini, SMTP and
+MongoDB stubbed out (mongomock), so the numbers cover our own code plus the
+embedding model and nothing on the network. Run from services/ai-agent-service:
+
+    python benchmarks/run_benchmarks.py                        # real embedding model
+    python benchmarks/run_benchmarks.py --fake-model -n 20     # pipeline overhead only, no model download
+    python benchmarks/run_benchmarks.py --json after.json --baseline before.json
+
+With --baseline the run exits with status 1 when any stage's p95 latency grew, or its
+throughput fell, by more than --tolerance, so it can gate a deploy.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+import synthetic  # noqa: E402
+
+STAGES = (
+    "extract_pdf", "extract_docx", "extract_png", "embed", "embed_batch",
+    "similarity", "similarity_pool", "process_submission", "submit",
+)
+
+
+class HashingEncoder:
+    """Deterministic bag-of-words stand-in with the SentenceTransformer.encode signature."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def encode(self, texts, **kwargs):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(rss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def measure(name, fn, inputs, items=1, concurrency=1):
+    """
+    Time fn(arg) for every input but the last, `concurrency` calls at a time, then make
+    one more call on the last input under tracemalloc for the allocation peak (kept out
+    of the timings, and on a fresh input so caches do not hide the allocations).
+    """
+    timed_inputs, traced_input = inputs[:-1], inputs[-1]
+
+    def timed(arg):
+        start = time.perf_counter()
+        fn(arg)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, timed_inputs))
+    else:
+        latencies = [timed(arg) for arg in timed_inputs]
+    wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        fn(traced_input)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    ms = np.array(latencies) * 1000
+    return {
+        "stage": name,
+        "calls": len(latencies),
+        "concurrency": concurrency,
+        "throughput_per_s": round(len(latencies) * items / wall, 2),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "peak_alloc_mb": round(peak / 2 ** 20, 2),
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for stages that got slower than `baseline` by more than `tolerance` (a fraction)."""
+    previous = {stage["stage"]: stage for stage in baseline.get("stages", [])}
+    regressions = []
+    for stage in results:
+        old = previous.get(stage["stage"])
+        if old is None:
+            continue
+        if old["p95_ms"] and stage["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{stage['stage']}: p95 {old['p95_ms']} ms -> {stage['p95_ms']} ms")
+        if stage["throughput_per_s"] < old["throughput_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{stage['stage']}: throughput {old['throughput_per_s']}/s -> {stage['throughput_per_s']}/s"
+            )
+    return regressions
+
+
+def _configure(workdir):
+    """Point every on-disk cache at `workdir`; must run before anything imports config."""
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ["WARM_MODELS_ON_STARTUP"] = "false"
+    os.environ["MONGODB_BUFFERED_WRITES"] = "false"
+    os.environ["DATA_DIR"] = workdir
+    os.environ["PARSED_CACHE_DIR"] = os.path.join(workdir, "parsed")
+    os.environ["JOB_EMBEDDING_DIR"] = os.path.join(workdir, "jobs")
+    os.environ["CANDIDATE_INDEX_DIR"] = os.path.join(workdir, "candidates")
+    os.environ["ANALYSIS_CACHE_DB"] = os.path.join(workdir, "analysis_cache.sqlite3")
+
+
+def _stub_dependencies(llm_latency):
+    """Replace MongoDB, the Gemini analysis and candidate emails with local stand-ins."""
+    import mongomock
+    from services import resume_service
+    from utils import database
+
+    database._client = mongomock.MongoClient()
+
+    def fake_analysis(resume_text, job_description):
+        time.sleep(llm_latency)
+        return "Synthetic analysis"
+
+    resume_service.analyze_match = fake_analysis
+    for name in ("send_acknowledgment_email", "send_congratulatory_email", "send_rejection_email"):
+        setattr(resume_service, name, lambda *args, **kwargs: None)
+
+
+def _ocr_available():
+    from services.resume_parser import _ocr_modules
+    ocr = _ocr_modules()
+    if ocr is None:
+        return False
+    try:
+        ocr[0].get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def _upload(path):
+    from werkzeug.datastructures import FileStorage
+    with open(path, "rb") as f:
+        return FileStorage(stream=io.BytesIO(f.read()), filename=os.path.basename(path))
+
+
+def run(args, workdir):
+    _configure(workdir)
+    from config.config import Config
+    from services import model_registry
+    from services.rag_pipeline import encode_resumes, encode_texts, score_embeddings
+    from services.resume_parser import extract_text
+    from services.resume_service import ResumeService
+    from services.job_embeddings import get_job_embedding
+
+    _stub_dependencies(args.llm_latency_ms / 1000)
+    if args.fake_model:
+        model_registry.register_model(Config.EMBEDDING_MODEL, HashingEncoder(Config.EMBEDDING_DIM))
+
+    rng = random.Random(args.seed)
+    jobs = [synthetic.job_description(rng) for _ in range(5)]
+    texts = [synthetic.resume_text(rng) for _ in range(args.n + 1)]
+    selected = args.stages or STAGES
+    results, skipped = [], {}
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    # Load the model and the job vectors up front so no stage pays for first use
+    log(f"Loading {'fake' if args.fake_model else Config.EMBEDDING_MODEL} embedding model...")
+    encode_texts(["warm up"])
+    for job in jobs:
+        get_job_embedding(job)
+
+    for fmt in synthetic.FORMATS:
+        stage = f"extract_{fmt}"
+        if stage not in selected:
+            continue
+        if fmt == "png" and not _ocr_available():
+            skipped[stage] = "OCR (pytesseract + tesseract) is not installed"
+            continue
+        log(f"Generating {args.n + 1} {fmt} resumes...")
+        files = synthetic.generate(os.path.join(workdir, "resumes"), args.n + 1, fmt, seed=args.seed)
+        results.append(measure(stage, extract_text, [path for path, _ in files]))
+
+    if "embed" in selected:
+        results.append(measure("embed", lambda text: encode_resumes([text]), texts))
+    if "embed_batch" in selected:
+        batches = [rng.sample(texts, min(args.batch_size, len(texts))) for _ in range(max(3, args.n // 10) + 1)]
+        results.append(measure("embed_batch", encode_resumes, batches, items=len(batches[0])))
+
+    embeddings = encode_resumes(texts)
+    if "similarity" in selected:
+        results.append(measure("similarity", lambda i: score_embeddings([embeddings[i]], jobs[i % len(jobs)]),
+                               list(range(len(embeddings)))))
+    if "similarity_pool" in selected:
+        pool = [embeddings[i % len(embeddings)] for i in range(args.pool_size)]
+        results.append(measure("similarity_pool", lambda job: score_embeddings(pool, job), jobs * 4,
+                               items=len(pool)))
+
+    if "process_submission" in selected or "submit" in selected:
+        log(f"Generating {2 * (args.n + 1)} pdf resumes for submissions...")
+        submissions = synthetic.generate(os.path.join(workdir, "submissions"), 2 * (args.n + 1), "pdf", seed=args.seed + 1)
+        service = ResumeService(os.path.join(workdir, "uploads"))
+
+    if "process_submission" in selected:
+        def process(path):
+            service.process_submission(_upload(path), None, jobs[0], "Bench Candidate", "bench@example.com")
+        results.append(measure("process_submission", process, [path for path, _ in submissions[:args.n + 1]]))
+
+    if "submit" in selected:
+        submit = _submitter(args.url, service)
+
+        def post(path):
+            with open(path, "rb") as f:
+                status = submit({
+                    "resume": (f, os.path.basename(path)),
+                    "job_description": jobs[1],
+                    "name": "Bench Candidate",
+                    "email": "bench@example.com",
+                    "async": "false",
+                })
+            if status != 200:
+                raise RuntimeError(f"/submit returned {status}")
+        results.append(measure("submit", post, [path for path, _ in submissions[args.n + 1:]],
+                               concurrency=args.concurrency))
+
+    if "process_submission" in selected or "submit" in selected:
+        # Persist the candidate index now, while the temporary directory still exists
+        from services.candidate_index import get_candidate_index
+        get_candidate_index().flush()
+
+    return {
+        "meta": {
+            "model": "fake" if args.fake_model else Config.EMBEDDING_MODEL,
+            "embedding_backend": Config.EMBEDDING_BACKEND,
+            "resumes": args.n,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "target": args.url or "in-process",
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": results,
+        "skipped": skipped,
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def _submitter(url, service):
+    """POST a multipart /submit form either in-process (Flask test client) or to a running server."""
+    if url:
+        import requests
+
+        def submit(form):
+            resume = form.pop("resume")
+            return requests.post(url.rstrip("/") + "/submit", data=form, files={"resume": resume}, timeout=300).status_code
+        return submit
+
+    import server
+    server.resume_service = service
+
+    def submit(form):
+        # One client per call: the test client is not meant to be shared between threads
+        return server.app.test_client().post("/submit", data=form, content_type="multipart/form-data").status_code
+    return submit
+
+
+def print_report(report, out=sys.stdout):
+    header = f"{'stage':<20}{'calls':>7}{'conc':>6}{'items/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'alloc MB':>10}{'rss MB':>9}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for s in report["stages"]:
+        print(f"{s['stage']:<20}{s['calls']:>7}{s['concurrency']:>6}{s['throughput_per_s']:>11}{s['p50_ms']:>10}"
+              f"{s['p95_ms']:>10}{s['p99_ms']:>10}{s['peak_alloc_mb']:>10}{s['max_rss_mb']:>9}", file=out)
+    for stage, reason in report["skipped"].items():
+        print(f"{stage:<20} skipped: {reason}", file=out)
+    meta = report["meta"]
+    print(f"\nmodel={meta['model']} backend={meta['embedding_backend']} resumes={meta['resumes']} "
+          f"target={meta['target']} max RSS={report['max_rss_mb']} MB", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=50, help="timed calls per stage (default 50)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, help="run only these stages")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel clients for the /submit stage")
+    parser.add_argument("--batch-size", type=int, default=32, help="resumes per embed_batch call")
+    parser.add_argument("--pool-size", type=int, default=1000, help="resumes scored per similarity_pool call")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="simulated Gemini latency")
+    parser.add_argument("--fake-model", action="store_true", help="use a hashing encoder instead of the real model")
+    parser.add_argument("--url", help="benchmark /submit on a running server instead of in-process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs the baseline (default 0.25)")
+    args = parser.parse_args(argv)
+    if args.n < 1:
+        parser.error("-n must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as workdir:
+        # The service prints on every request; keep that out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = run(args, workdir)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["stages"], json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:", *regressions, sep="\n  ")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Synthetic resumes and job descriptions for the benchmarks. Everything is generated
+from a seed, so two runs on the same machine parse and score identical documents.
+"""
+import os
+import random
+
+FIRST_NAMES = ["Ada", "Abebe", "Chen", "Fatima", "Grace", "Hana", "Ivan", "Kofi", "Lena", "Marta", "Noah", "Priya", "Samuel", "Tigist", "Yuki"]
+LAST_NAMES = ["Bekele", "Garcia", "Haile", "Ivanova", "Kim", "Lovelace", "Mensah", "Novak", "Okafor", "Rossi", "Sato", "Tesfaye", "Walker"]
+TITLES = ["Backend Engineer", "Data Scientist", "Frontend Developer", "DevOps Engineer", "HR Generalist", "Registered Nurse", "Financial Analyst", "Product Manager"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "C++", "SQL", "Flask", "Django", "React", "Node.js",
+    "MongoDB", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS", "Terraform", "CI/CD", "Pandas", "PyTorch",
+    "machine learning", "NLP", "recruitment", "payroll", "onboarding", "patient care", "Excel", "Tableau", "agile",
+]
+COMPANIES = ["Acme Corp", "Blue Nile Tech", "Globex", "Initech", "Safaricom", "Umbrella Health", "Vandelay Industries"]
+SCHOOLS = ["Addis Ababa University", "MIT", "University of Nairobi", "ETH Zurich", "University of Toronto"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Maintained", "Automated", "Launched", "Mentored"]
+OBJECTS = [
+    "a REST API serving two million requests per day", "the data pipeline for nightly reporting",
+    "a team of five engineers", "the onboarding process for new hires", "a recommendation model",
+    "the CI/CD pipeline", "patient intake workflows", "the quarterly budgeting process", "a React dashboard",
+]
+
+FORMATS = ("pdf", "docx", "png")
+
+
+def resume_text(rng, jobs=3, bullets=4):
+    """Plain-text resume with the usual sections; `jobs` and `bullets` control its length."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, 8)
+    lines = [
+        name,
+        f"{title} | {name.split()[0].lower()}@example.com | +251 911 000 {rng.randint(100, 999)}",
+        "",
+        "SUMMARY",
+        f"{title} with {rng.randint(2, 15)} years of experience in {', '.join(skills[:3])}.",
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(jobs):
+        start = rng.randint(2008, 2022)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        for _ in range(bullets):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}.")
+    lines += [
+        "",
+        "EDUCATION",
+        f"BSc Computer Science, {rng.choice(SCHOOLS)} ({rng.randint(2000, 2020)})",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+    ]
+    return "\n".join(lines)
+
+
+def job_description(rng):
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, 5)
+    return (
+        f"We are hiring a {title}. Must have {rng.randint(2, 8)}+ years of experience with "
+        f"{', '.join(skills[:3])}. Nice to have: {', '.join(skills[3:])}. "
+        f"You will {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)} and work closely with the product team."
+    )
+
+
+def write_pdf(text, path):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    lines = text.split("\n")
+    # ~50 lines per A4 page at 10pt
+    for start in range(0, len(lines), 50):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 545, 800), "\n".join(lines[start:start + 50]), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def write_docx(text, path):
+    from docx import Document
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_png(text, path):
+    """A scanned-looking resume: the first PDF page rendered to an image with no text layer."""
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, 545, 800), "\n".join(text.split("\n")[:50]), fontsize=10)
+    page.get_pixmap(dpi=150).save(path)
+    doc.close()
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "png": write_png}
+
+
+def generate(directory, count, fmt, seed=0, jobs=3):
+    """Write `count` distinct resumes in `fmt`; returns [(path, text), ...]."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(f"{seed}-{fmt}")
+    resumes = []
+    for i in range(count):
+        text = resume_text(rng, jobs=jobs)
+        path = os.path.join(directory, f"resume_{fmt}_{i}.{fmt}")
+        WRITERS[fmt](text, path)
+        resumes.append((path, text))
+    return resumes
@@ -0,0 +1,67 @@
+"""
+Production serving for the AI agent service:
+
+    gunicorn -c gunicorn.conf.py server:app
+
+The app is imported once in the master (preload_app) and the embedding model is
+warmed there before any worker is forked, so every worker shares the model weights
+copy-on-write instead of loading its own copy. On SIGTERM each worker stops
+accepting requests, finishes the ones in flight and drains queued submissions.
+
+Run a single worker (the default) and scale with WEB_THREADS. Several pieces of
+state live in the worker process: the background job map behind GET /submit/<job_id>,
+the candidate index (each worker would save its own copy over the others') and the
+/metrics counters. Extra workers are only safe with ASYNC_SUBMISSIONS=false, and the
+candidate index then has to be rebuilt from Mongo with the server stopped:
+
+    python src/reindex.py
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5005')}"
+workers = int(os.getenv("WEB_WORKERS", "1"))
+threads = int(os.getenv("WEB_THREADS", "16"))
+worker_class = "gthread"
+preload_app = True
+# Submissions can wait on the LLM, so allow long requests and a long drain
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("SHUTDOWN_GRACE_SECONDS", "60"))
+keepalive = 5
+accesslog = "-"
+
+# Split the cores between workers so their inference thread pools do not oversubscribe the CPU
+os.environ.setdefault("EMBEDDING_THREADS", str(max(1, multiprocessing.cpu_count() // workers)))
+
+
+def when_ready(arbiter):
+    # Runs in the master after the preloaded app import and before workers fork
+    from server import warm_up
+
+    if not warm_up.start().wait():
+        arbiter.log.warning("Warm-up did not complete; workers will load models on first use")
+    # Keep the warm objects out of the collector so refcount/GC passes in the
+    # workers touch fewer of the shared pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(arbiter, worker):
+    # MongoClient is not fork-safe; each worker opens its own pool
+    from utils.database import reset_client
+
+    reset_client()
+
+
+def post_worker_init(worker):
+    # After the fork: a Mongo connection opened in the master would be shared by the workers
+    from server import ensure_indexes_in_background
+
+    ensure_indexes_in_background()
+
+
+def worker_exit(arbiter, worker):
+    from server import drain
+
+    drain()
@@ -10,11 +10,123 @@ class Config:
         raise ValueError("GEMINI_API_KEY environment variable is not set")
     
     BASE_DIR = Path(__file__).resolve().parent.parent
-    UPLOAD_FOLDER = BASE_DIR / "data" / "uploads"
-    CHROMA_DB_DIR = BASE_DIR / "data" / "chroma_db"
+    # Uploads, caches and indexes; point DATA_DIR elsewhere to keep them out of the source tree
+    DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR / "data")))
+    UPLOAD_FOLDER = Path(os.getenv("UPLOAD_FOLDER", str(DATA_DIR / "uploads")))
+    CHROMA_DB_DIR = DATA_DIR / "chroma_db"
     
     # Create directories if they don't exist
     UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
     CHROMA_DB_DIR.mkdir(parents=True, exist_ok=True)
 
     MODEL_NAME = "gemini-2.5-flash" # Using the latest available flash model
+
+    # Embedding model used for resume/job similarity
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+    # Max concurrent encode calls per model (avoids CPU oversubscription across Flask threads)
+    EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "2"))
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    WARM_MODELS_ON_STARTUP = os.getenv("WARM_MODELS_ON_STARTUP", "true").lower() == "true"
+    # Inference backend: "torch" (sentence-transformers), "onnx" or "onnx-int8" (ONNX Runtime)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+    # Exported ONNX models live in <ONNX_MODEL_DIR>/<model name>/
+    ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", str(DATA_DIR / "onnx")))
+    # Intra-op threads per inference call; 0 keeps the runtime default
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+    EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH", "256"))
+
+    # Persistent job-description embeddings (LRU in memory, .npy files on disk)
+    JOB_EMBEDDING_DIR = Path(os.getenv("JOB_EMBEDDING_DIR", str(CHROMA_DB_DIR / "job_embeddings")))
+    JOB_EMBEDDING_CACHE_SIZE = int(os.getenv("JOB_EMBEDDING_CACHE_SIZE", "512"))
+
+    # Upper bound on resumes accepted by a single /submit/batch call
+    MAX_BATCH_RESUMES = int(os.getenv("MAX_BATCH_RESUMES", "500"))
+
+    # Persistent ANN index of every stored resume embedding (reverse search)
+    CANDIDATE_INDEX_DIR = Path(os.getenv("CANDIDATE_INDEX_DIR", str(CHROMA_DB_DIR / "candidates")))
+    # Switch from exact flat search to IVF once the pool is this large
+    CANDIDATE_INDEX_IVF_THRESHOLD = int(os.getenv("CANDIDATE_INDEX_IVF_THRESHOLD", "20000"))
+    CANDIDATE_INDEX_NPROBE = int(os.getenv("CANDIDATE_INDEX_NPROBE", "16"))
+    # Flush the index to disk after this many adds/removes (and always at exit)
+    CANDIDATE_INDEX_SAVE_EVERY = int(os.getenv("CANDIDATE_INDEX_SAVE_EVERY", "50"))
+
+    # Background worker pool for LLM analysis, emails and DB writes after /submit
+    ASYNC_SUBMISSIONS = os.getenv("ASYNC_SUBMISSIONS", "true").lower() == "true"
+    ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+    ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "200"))
+    # How long finished job results stay available to GET /submit/<job_id>
+    JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+
+    # Content-addressed cache of LLM match analyses
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "1024"))
+    ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    # Optional SQLite tier shared by all workers; set to an empty string to disable
+    ANALYSIS_CACHE_DB = os.getenv("ANALYSIS_CACHE_DB", str(CHROMA_DB_DIR / "analysis_cache.sqlite3"))
+    ANALYSIS_CACHE_DB_MAX_ROWS = int(os.getenv("ANALYSIS_CACHE_DB_MAX_ROWS", "100000"))
+
+    # Category cut-offs on the 0-100 embedding score: above MATCH_THRESHOLD is a "Match"
+    # (congratulatory email and recruitment flow), then "Partial Match", "Skills Gap" and
+    # "Irrelevant". The defaults belong to the whole-document score (RESUME_SCORING=document);
+    # the chunked score runs higher, so switch to it only together with the cut-offs that
+    # benchmarks/calibrate_thresholds.py prints for the deployed model
+    MATCH_THRESHOLD = float(os.getenv("MATCH_THRESHOLD", "70"))
+    PARTIAL_MATCH_THRESHOLD = float(os.getenv("PARTIAL_MATCH_THRESHOLD", "50"))
+    SKILLS_GAP_THRESHOLD = float(os.getenv("SKILLS_GAP_THRESHOLD", "30"))
+
+    # Tiered screening: Gemini only analyzes resumes whose embedding score falls in
+    # [LLM_ANALYSIS_MIN_SCORE, LLM_ANALYSIS_MAX_SCORE]; the rest can be analyzed on
+    # demand later through POST /resumes/<id>/analysis
+    LLM_ANALYSIS_MIN_SCORE = float(os.getenv("LLM_ANALYSIS_MIN_SCORE", str(SKILLS_GAP_THRESHOLD)))
+    LLM_ANALYSIS_MAX_SCORE = float(os.getenv("LLM_ANALYSIS_MAX_SCORE", "100"))
+    # Below the minimum, still analyze when this share of the job's keywords appear in the resume
+    LLM_KEYWORD_RESCUE = float(os.getenv("LLM_KEYWORD_RESCUE", "0.6"))
+
+    # Optional JSON skills dictionary ({category: {skill: [aliases]}}) merged over the built-in one
+    SKILLS_TAXONOMY_FILE = os.getenv("SKILLS_TAXONOMY_FILE", "")
+
+    # Gemini HTTP client: pooled session, timeouts, retry/backoff and circuit breaker
+    GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+    GEMINI_POOL_SIZE = int(os.getenv("GEMINI_POOL_SIZE", "10"))
+    GEMINI_CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+    GEMINI_READ_TIMEOUT = float(os.getenv("GEMINI_READ_TIMEOUT", "60"))
+    GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+    GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "0.5"))
+    GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "8"))
+    # Consecutive failed calls before the breaker opens, and how long it stays open
+    GEMINI_CIRCUIT_FAILURES = int(os.getenv("GEMINI_CIRCUIT_FAILURES", "5"))
+    GEMINI_CIRCUIT_RESET_SECONDS = float(os.getenv("GEMINI_CIRCUIT_RESET_SECONDS", "30"))
+
+    # Resume text extraction limits and parallelism
+    MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(20 * 1024 * 1024)))
+    MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "50"))
+    # PDFs with at least this many pages are split across a process pool
+    PARALLEL_PDF_MIN_PAGES = int(os.getenv("PARALLEL_PDF_MIN_PAGES", "8"))
+    PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Pages with fewer extracted characters than this are treated as scanned and OCR'd
+    OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+    OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+
+    # Parsed text and resume embeddings cached by upload digest (sha256 of the file)
+    PARSED_CACHE_DIR = Path(os.getenv("PARSED_CACHE_DIR", str(CHROMA_DB_DIR / "parsed")))
+
+    # Threads shared by all submission pipelines for running independent stages concurrently
+    PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "8"))
+
+    # Resume URL downloads
+    FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "5"))
+    FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", "30"))
+    FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+
+    # "document": one embedding of the whole resume, scored by cosine (what the thresholds
+    # above were set for). "chunked": section-aware chunks scored by max-sim, which reads
+    # past the model's ~256-token window but needs calibrated thresholds. Run
+    # src/reindex.py --rebuild after switching so the candidate index uses the same vectors.
+    RESUME_SCORING = os.getenv("RESUME_SCORING", "document")
+
+    # Section-aware resume chunking (MiniLM truncates around 256 tokens, ~150-180 words)
+    CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", "150"))
+    CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", "30"))
+    MAX_RESUME_CHUNKS = int(os.getenv("MAX_RESUME_CHUNKS", "64"))
+    # Final score = MAX_SIM_WEIGHT * best chunk + (1 - MAX_SIM_WEIGHT) * section-weighted mean
+    MAX_SIM_WEIGHT = float(os.getenv("MAX_SIM_WEIGHT", "0.6"))
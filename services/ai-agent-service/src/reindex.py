@@ -0,0 +1,36 @@
+"""
+Build the candidate index (POST /candidates/search) from the resumes stored in MongoDB.
+
+    python src/reindex.py             # add stored resumes the index is missing, drop deleted ones
+    python src/reindex.py --rebuild   # re-embed and re-add every stored resume
+
+Run it once after upgrading, and whenever the index directory was lost or written by
+another worker. Stop the server first: it holds its own copy of the index and would
+save over the result.
+"""
+import argparse
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=256, help="resumes per encode batch (default 256)")
+    parser.add_argument("--rebuild", action="store_true", help="re-add resumes that are already indexed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from services.index_backfill import backfill_candidate_index
+
+    stats = backfill_candidate_index(batch_size=args.batch_size, rebuild=args.rebuild)
+    print(f"[CandidateIndex] Done: {stats['stored']} stored, {stats['added']} added "
+          f"({stats['cached']} from cached vectors), {stats['removed']} removed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Re-score the resumes already stored in MongoDB after a job description was edited.
+
+    python src/rescore.py --job-file new_job.txt --previous-job-file old_job.txt
+    python src/rescore.py --job "Senior Python developer ..." --all --workers 4
+
+Progress is checkpointed after every batch; run the same command again to continue an
+interrupted run (or pass --restart to start over).
+"""
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _read(text, path):
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    return text
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job", help="the new job description")
+    job.add_argument("--job-file", help="file holding the new job description")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--previous-job", help="re-score resumes screened against this job description")
+    selection.add_argument("--previous-job-file", help="file holding the previous job description")
+    selection.add_argument("--previous-job-hash", help="job_hash of the previous job description")
+    selection.add_argument("--all", action="store_true", help="re-score every stored resume")
+    parser.add_argument("--batch-size", type=int, default=256, help="resumes per encode/write batch (default 256)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="embedding processes; 0 encodes in this process (default: CPUs - 1)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: rescore-<job hash>.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="compute scores without writing them")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from services.rescoring import Rescorer
+    from utils.database import job_query
+
+    query = {}
+    previous = _read(args.previous_job, args.previous_job_file)
+    if previous:
+        query = job_query(previous)
+    elif args.previous_job_hash:
+        query = {"job_hash": args.previous_job_hash}
+
+    rescorer = Rescorer(
+        _read(args.job, args.job_file),
+        query=query,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+    )
+    stats = rescorer.run(restart=args.restart)
+    print(f"[Rescore] Done: {stats['processed']} processed ({stats.get('cached', 0)} from cached vectors), "
+          f"{stats['updated']} updated, categories {stats['categories']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,130 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from services.resume_service import ResumeService
+from services import model_registry
+from services.warmup import WarmUp, default_steps
+from services.job_embeddings import get_job_store, get_job_embedding
+from services.candidate_index import get_candidate_index
+from services.skill_matcher import normalize_skills
+from services.analysis_cache import get_analysis_cache
+from services.gemini_client import get_gemini_client
+from services.task_queue import get_task_queue, QueueFullError
+from services.metrics import REGISTRY, HTTP_SECONDS
+from utils.email_service import get_email_dispatcher
+from utils.database import get_resumes_by_ids, delete_resume, ensure_indexes, get_bulk_writer, find_resumes_with_skills
+from utils.database import DatabaseUnavailableError
+from config.config import Config
 
 load_dotenv()
 app = Flask(__name__)
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "../data/uploads")
+UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(os.path.dirname(__file__), "../data/uploads"))
 resume_service = ResumeService(UPLOAD_FOLDER)
 
+def ensure_indexes_in_background():
+    """
+    Index creation talks to Mongo, so keep it off the startup path. Called when the
+    server starts (gunicorn post_worker_init or __main__), not on import, so importing
+    the app (tests, the gunicorn master) never touches the database.
+    """
+    threading.Thread(target=ensure_indexes, daemon=True).start()
+
+# Heavy libraries and the embedding model load in the background; /health/ready
+# reports when they are warm while / and /health/live answer immediately. Started
+# when the server starts (gunicorn when_ready or __main__), never on import: spawned
+# parser workers re-import this module and must not load models of their own.
+warm_up = WarmUp(default_steps() if Config.WARM_MODELS_ON_STARTUP else [])
+
+def collect_service_metrics():
+    """Counters the services already keep, read at scrape time so the hot path pays nothing."""
+    store = resume_service.store.stats()
+    analysis = get_analysis_cache().stats()
+    jobs = get_job_store().stats()
+    email = get_email_dispatcher().stats()
+    gate = resume_service.gate.stats()
+    writes = get_bulk_writer().stats()
+    return [
+        ("cache_lookups_total", "counter", "Cache lookups by cache and result.", [
+            ({"cache": "parsed_text", "result": "hit"}, store["text_hits"]),
+            ({"cache": "parsed_text", "result": "miss"}, store["text_misses"]),
+            ({"cache": "resume_embedding", "result": "hit"}, store["embedding_hits"]),
+            ({"cache": "resume_embedding", "result": "miss"}, store["embedding_misses"]),
+            ({"cache": "job_embedding", "result": "hit"}, jobs["hits"] + jobs["disk_hits"]),
+            ({"cache": "job_embedding", "result": "miss"}, jobs["misses"]),
+            ({"cache": "analysis", "result": "hit"}, analysis["hits"] + analysis["disk_hits"]),
+            ({"cache": "analysis", "result": "miss"}, analysis["misses"]),
+        ]),
+        ("analysis_gate_decisions_total", "counter", "LLM analysis pre-filter decisions.", [
+            ({"decision": "analyzed"}, gate["analyzed"]),
+            ({"decision": "skipped"}, gate["skipped"]),
+        ]),
+        ("analysis_queue_jobs", "gauge", "Background submissions by status.", [
+            ({"status": status}, count) for status, count in get_task_queue().stats()["jobs"].items()
+        ]),
+        ("emails_total", "counter", "Emails by outcome.", [
+            ({"result": "sent"}, email["sent"]),
+            ({"result": "failed"}, email["failed"]),
+            ({"result": "retried"}, email["retries"]),
+        ]),
+        ("buffered_resume_writes_total", "counter", "Buffered resume inserts by outcome.", [
+            ({"result": "written"}, writes["written"]),
+            ({"result": "dropped"}, writes["dropped"]),
+        ]),
+        ("email_queue_depth", "gauge", "Emails waiting to be sent.", [({}, email["queue_depth"])]),
+        ("gemini_circuit_open", "gauge", "1 while the Gemini circuit breaker is open.", [
+            ({}, 1 if get_gemini_client().stats()["circuit"] == "open" else 0),
+        ]),
+        ("ready", "gauge", "1 once startup warm-up has finished.", [({}, 1 if warm_up.ready else 0)]),
+    ]
+
+REGISTRY.register_collector(collect_service_metrics)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.get("request_start")
+    if start is not None:
+        # The route template, not the raw path, keeps ids out of the label values
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                             endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint: stage latencies, upstream errors, OCR fallbacks, cache hits."""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
 @app.route("/", methods=["GET"])
 def index():
     return jsonify({"status": "AI Agent Service is running"}), 200
 
+@app.route("/health/live", methods=["GET"])
+def liveness():
+    return jsonify({"status": "alive"}), 200
+
+@app.route("/health/ready", methods=["GET"])
+def readiness():
+    status = warm_up.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route("/models", methods=["GET"])
+def models():
+    return jsonify({
+        "models": model_registry.loaded_models(),
+        "job_embeddings": get_job_store().stats(),
+        "analysis_queue": get_task_queue().stats(),
+        "analysis_cache": get_analysis_cache().stats(),
+        "analysis_gate": resume_service.gate.stats(),
+        "gemini": get_gemini_client().stats(),
+        "email": get_email_dispatcher().stats()
+    }), 200
+
 @app.route("/submit", methods=["POST"])
 def submit_resume():
     if "resume" not in request.files and "resume_url" not in request.form:
@@ -27,11 +140,155 @@ def submit_resume():
     candidate_name = request.form.get("name", "Candidate")
     email = request.form.get("email", "")
 
+    # Callers may force either mode with the `async` form field
+    run_async = request.form.get("async", str(Config.ASYNC_SUBMISSIONS)).lower() == "true"
+
     try:
+        if run_async:
+            result = resume_service.submit_async(resume_file, resume_url, job_description, candidate_name, email)
+            return jsonify(result), 202
         result = resume_service.process_submission(resume_file, resume_url, job_description, candidate_name, email)
         return jsonify(result), 200
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/submit/<job_id>", methods=["GET"])
+def submission_status(job_id):
+    job = get_task_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job), 200
+
+@app.route("/submit/batch", methods=["POST"])
+def submit_batch():
+    """
+    Score many resumes against one job in a single pass.
+    Accepts multipart form data (`resumes` files and/or `resume_urls`, with optional
+    `names`/`emails` lists in the same order, files first) or a JSON body
+    {"job_description": ..., "candidates": [{"resume_url", "name", "email"}]}.
+    """
+    if request.is_json:
+        data = request.get_json()
+        job_description = data.get("job_description")
+        candidates = [
+            {"resume_url": c.get("resume_url"), "name": c.get("name"), "email": c.get("email")}
+            for c in data.get("candidates", [])
+        ]
+        store = data.get("store", True)
+    else:
+        job_description = request.form.get("job_description")
+        sources = [{"resume_file": f} for f in request.files.getlist("resumes")]
+        sources += [{"resume_url": url} for url in request.form.getlist("resume_urls")]
+        names = request.form.getlist("names")
+        emails = request.form.getlist("emails")
+        candidates = []
+        for i, source in enumerate(sources):
+            source["name"] = names[i] if i < len(names) else None
+            source["email"] = emails[i] if i < len(emails) else None
+            candidates.append(source)
+        store = request.form.get("store", "true").lower() == "true"
+
+    if not job_description:
+        return jsonify({"error": "Missing job_description"}), 400
+    if not candidates:
+        return jsonify({"error": "Missing resumes or resume_urls"}), 400
+    if len(candidates) > Config.MAX_BATCH_RESUMES:
+        return jsonify({"error": f"Batch exceeds {Config.MAX_BATCH_RESUMES} resumes"}), 413
+
+    try:
+        results = resume_service.process_batch(candidates, job_description, store=store)
+        return jsonify({"results": results, "count": len(results)}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _must_have(data):
+    """Canonical skills from a list or comma-separated `must_have` field."""
+    raw = data.get("must_have") or []
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    return normalize_skills([name for name in raw if str(name).strip()])
+
+@app.route("/candidates/search", methods=["POST"])
+def search_candidates():
+    """
+    Rank every stored candidate against a job description using the ANN index.
+    An optional `must_have` skill list restricts the ranking to candidates with all of them.
+    """
+    data = request.get_json(silent=True) or request.form
+    job_description = data.get("job_description")
+    if not job_description:
+        return jsonify({"error": "Missing job_description"}), 400
+    try:
+        k = max(1, min(int(data.get("k", 10)), 1000))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k must be an integer"}), 400
+
+    try:
+        must_have = _must_have(data)
+        allowed_ids = None
+        if must_have:
+            allowed_ids = [doc["id"] for doc in find_resumes_with_skills(must_have, limit=0, fields=("_id",))]
+        matches = get_candidate_index().search(get_job_embedding(job_description), k, allowed_ids=allowed_ids)
+        details = get_resumes_by_ids([rid for rid, _ in matches]) if matches else {}
+        candidates = [
+            {"id": rid, "score": score, **details.get(rid, {})}
+            for rid, score in matches
+        ]
+        return jsonify({"candidates": candidates, "count": len(candidates)}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/candidates/filter", methods=["POST"])
+def filter_candidates():
+    """Stored candidates having every `must_have` skill (optionally for one job), best score first."""
+    data = request.get_json(silent=True) or request.form
+    must_have = _must_have(data)
+    if not must_have:
+        return jsonify({"error": "Missing must_have"}), 400
+    try:
+        limit = max(1, min(int(data.get("limit", 50)), 1000))
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    candidates = find_resumes_with_skills(must_have, data.get("job_description"), limit)
+    return jsonify({"must_have": must_have, "candidates": candidates, "count": len(candidates)}), 200
+
+@app.route("/resumes/<resume_id>/analysis", methods=["POST"])
+def analyze_resume(resume_id):
+    """Run (or return) the Gemini analysis for a stored resume, e.g. one the pre-filter skipped."""
+    try:
+        result = resume_service.analyze_stored_resume(resume_id)
+    except DatabaseUnavailableError:
+        return jsonify({"error": "The resume database is temporarily unavailable"}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if result is None:
+        return jsonify({"error": "Resume not found"}), 404
+    if result["analysis"] is None:
+        return jsonify({**result, "error": "LLM analysis is temporarily unavailable"}), 503
+    return jsonify(result), 200
+
+@app.route("/resumes/<resume_id>", methods=["DELETE"])
+def remove_resume(resume_id):
+    deleted = delete_resume(resume_id)
+    indexed = get_candidate_index().remove(resume_id)
+    if not deleted and not indexed:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify({"id": resume_id, "status": "deleted"}), 200
+
+def drain():
+    """
+    Finish queued and running submissions, then flush what they produced (buffered
+    resume writes, index updates, outgoing mail). Called when a worker shuts down.
+    """
+    get_task_queue().shutdown(wait=True)
+    get_bulk_writer().flush()
+    get_candidate_index().flush()
+    get_email_dispatcher().stop()
+
 if __name__ == "__main__":
+    warm_up.start()
+    ensure_indexes_in_background()
     app.run(host='0.0.0.0', debug=True, port=5005)
@@ -0,0 +1,131 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config.config import Config
+
+
+def analysis_key(resume_text, job_description, prompt_version, model_name):
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, resume_text, job_description):
+        digest.update((part or "").encode("utf-8"))
+        # Separator so ("ab", "c") and ("a", "bc") never collide
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache for LLM analyses: an in-memory LRU with TTL, backed by an
+    optional SQLite file so workers and restarts share results.
+    """
+
+    def __init__(self, capacity=None, ttl_seconds=None, db_path=None, db_max_rows=None):
+        self.capacity = capacity or Config.ANALYSIS_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or Config.ANALYSIS_CACHE_TTL_SECONDS
+        self.db_path = Config.ANALYSIS_CACHE_DB if db_path is None else db_path
+        self.db_max_rows = db_max_rows or Config.ANALYSIS_CACHE_DB_MAX_ROWS
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.db_path:
+            self._open_db()
+
+    def _open_db(self):
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_expires_at ON analyses (expires_at)")
+        self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM analyses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, row[0], row[1])
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analyses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db_writes += 1
+                if self._db_writes % 100 == 0:
+                    self._evict_db()
+                self._db.commit()
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _evict_db(self):
+        self._db.execute("DELETE FROM analyses WHERE expires_at <= ?", (time.time(),))
+        # Keep the rows that expire last, i.e. the most recently written
+        self._db.execute(
+            "DELETE FROM analyses WHERE key NOT IN "
+            "(SELECT key FROM analyses ORDER BY expires_at DESC LIMIT ?)",
+            (self.db_max_rows,),
+        )
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "in_memory": len(self._memory),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache()
+    return _cache
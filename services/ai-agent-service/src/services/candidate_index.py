@@ -0,0 +1,189 @@
+import atexit
+import json
+import math
+import os
+import threading
+from pathlib import Path
+import numpy as np
+from config.config import Config
+
+
+def _normalize(vectors):
+    import faiss  # loaded on first use to keep service startup fast
+
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+class CandidateIndex:
+    """
+    Persistent FAISS index over every stored resume embedding, used to rank the
+    existing candidate pool against a new job. Vectors are L2-normalized so inner
+    product equals cosine similarity. Small pools use an exact flat index; once the
+    pool passes CANDIDATE_INDEX_IVF_THRESHOLD it is rebuilt as an IVF index.
+    FAISS ids are sequential integers mapped to Mongo resume ids in ids.json.
+    """
+
+    def __init__(self, directory=None, dim=None, ivf_threshold=None, nprobe=None, save_every=None):
+        self.directory = Path(directory or Config.CANDIDATE_INDEX_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim or Config.EMBEDDING_DIM
+        self.ivf_threshold = ivf_threshold or Config.CANDIDATE_INDEX_IVF_THRESHOLD
+        self.nprobe = nprobe or Config.CANDIDATE_INDEX_NPROBE
+        self.save_every = save_every or Config.CANDIDATE_INDEX_SAVE_EVERY
+
+        self._lock = threading.RLock()
+        self._pending_writes = 0
+        self._index_path = self.directory / "index.faiss"
+        self._ids_path = self.directory / "ids.json"
+        self._load()
+
+    def _load(self):
+        import faiss
+        if self._index_path.exists() and self._ids_path.exists():
+            self.index = faiss.read_index(str(self._index_path))
+            with open(self._ids_path) as f:
+                state = json.load(f)
+            self._to_resume = {int(k): v for k, v in state["ids"].items()}
+            self._next_id = state["next_id"]
+        else:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dim))
+            self._to_resume = {}
+            self._next_id = 0
+        self._to_faiss = {v: k for k, v in self._to_resume.items()}
+        self._apply_search_params()
+
+    def _apply_search_params(self):
+        import faiss
+        if isinstance(self.index, faiss.IndexIVF):
+            self.index.nprobe = self.nprobe
+
+    @property
+    def is_ivf(self):
+        import faiss
+        return isinstance(self.index, faiss.IndexIVF)
+
+    def __len__(self):
+        return self.index.ntotal
+
+    def __contains__(self, resume_id):
+        return resume_id in self._to_faiss
+
+    def ids(self):
+        with self._lock:
+            return list(self._to_faiss)
+
+    def add(self, resume_id, embedding):
+        self.add_many([resume_id], [embedding])
+
+    def add_many(self, resume_ids, embeddings):
+        if not resume_ids:
+            return
+        vectors = _normalize(embeddings)
+        with self._lock:
+            # Re-adding a resume replaces its previous vector
+            self._remove_locked([rid for rid in resume_ids if rid in self._to_faiss])
+            faiss_ids = np.arange(self._next_id, self._next_id + len(resume_ids), dtype=np.int64)
+            self._next_id += len(resume_ids)
+            self.index.add_with_ids(vectors, faiss_ids)
+            for fid, rid in zip(faiss_ids.tolist(), resume_ids):
+                self._to_resume[fid] = rid
+                self._to_faiss[rid] = fid
+
+            if not self.is_ivf and self.index.ntotal >= self.ivf_threshold:
+                self._upgrade_to_ivf()
+            self._mark_dirty(len(resume_ids))
+
+    def remove(self, resume_id):
+        with self._lock:
+            removed = self._remove_locked([resume_id])
+            if removed:
+                self._mark_dirty(removed)
+            return removed > 0
+
+    def _remove_locked(self, resume_ids):
+        faiss_ids = [self._to_faiss.pop(rid) for rid in resume_ids if rid in self._to_faiss]
+        if not faiss_ids:
+            return 0
+        for fid in faiss_ids:
+            self._to_resume.pop(fid, None)
+        return int(self.index.remove_ids(np.array(faiss_ids, dtype=np.int64)))
+
+    def search(self, embedding, k=10, allowed_ids=None):
+        """
+        Return up to k (resume_id, score) pairs, score as a 0-100 cosine percentage.
+        `allowed_ids` restricts the search to those resume ids (e.g. a must-have skills filter).
+        """
+        import faiss
+        query = _normalize(embedding)
+        with self._lock:
+            if self.index.ntotal == 0:
+                return []
+            params = None
+            if allowed_ids is not None:
+                faiss_ids = np.array([self._to_faiss[rid] for rid in allowed_ids if rid in self._to_faiss], dtype=np.int64)
+                if not len(faiss_ids):
+                    return []
+                selector = faiss.IDSelectorBatch(faiss_ids)
+                if self.is_ivf:
+                    params = faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+                else:
+                    params = faiss.SearchParameters(sel=selector)
+                k = min(k, len(faiss_ids))
+            scores, ids = self.index.search(query, min(k, self.index.ntotal), params=params)
+            return [
+                (self._to_resume[fid], float(score * 100))
+                for score, fid in zip(scores[0].tolist(), ids[0].tolist())
+                if fid != -1 and fid in self._to_resume
+            ]
+
+    def _upgrade_to_ivf(self):
+        import faiss
+        flat = faiss.downcast_index(self.index.index)
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        ids = faiss.vector_to_array(self.index.id_map).astype(np.int64)
+
+        nlist = max(1, int(4 * math.sqrt(len(ids))))
+        quantizer = faiss.IndexFlatIP(self.dim)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(vectors)
+        ivf.add_with_ids(vectors, ids)
+        self.index = ivf
+        self._apply_search_params()
+        print(f"[CandidateIndex] Rebuilt as IVF with {nlist} lists over {len(ids)} resumes")
+
+    def _mark_dirty(self, count):
+        self._pending_writes += count
+        if self._pending_writes >= self.save_every:
+            self.save()
+
+    def save(self):
+        import faiss
+        with self._lock:
+            tmp_index = self._index_path.with_suffix(".faiss.tmp")
+            tmp_ids = self._ids_path.with_suffix(".json.tmp")
+            faiss.write_index(self.index, str(tmp_index))
+            with open(tmp_ids, "w") as f:
+                json.dump({"ids": self._to_resume, "next_id": self._next_id}, f)
+            os.replace(tmp_index, self._index_path)
+            os.replace(tmp_ids, self._ids_path)
+            self._pending_writes = 0
+
+    def flush(self):
+        if self._pending_writes:
+            self.save()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CandidateIndex()
+                atexit.register(_index.flush)
+    return _index
@@ -0,0 +1,72 @@
+import re
+from config.config import Config
+
+# Heading words that start a resume section, mapped to the section they open
+SECTION_HEADINGS = {
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "technologies", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses", "training"],
+    "summary": ["summary", "profile", "professional summary", "about me", "objective", "career objective"],
+}
+
+# How much each section counts towards the weighted-mean part of the score
+SECTION_WEIGHTS = {
+    "skills": 1.3,
+    "experience": 1.2,
+    "projects": 1.0,
+    "summary": 1.0,
+    "certifications": 0.8,
+    "education": 0.7,
+    "other": 0.8,
+}
+
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+_HEADING_CLEAN_RE = re.compile(r"[^a-z ]+")
+
+
+def _heading_section(line):
+    """Section name if `line` looks like a heading ("EXPERIENCE", "Skills:"), else None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    normalized = " ".join(_HEADING_CLEAN_RE.sub(" ", stripped.lower()).split())
+    return _HEADING_LOOKUP.get(normalized)
+
+
+def split_sections(text):
+    """Split resume text into [(section, text)], using 'other' for content before any heading."""
+    sections = []
+    current, lines = "other", []
+    for line in (text or "").splitlines():
+        section = _heading_section(line)
+        if section:
+            if any(l.strip() for l in lines):
+                sections.append((current, "\n".join(lines)))
+            current, lines = section, []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((current, "\n".join(lines)))
+    return sections
+
+
+def chunk_resume(text, max_words=None, overlap=None, max_chunks=None):
+    """
+    Split a resume into [(section, chunk_text)] with chunks short enough for the
+    embedding model's context window. Long sections are windowed with overlap.
+    """
+    max_words = max_words or Config.CHUNK_MAX_WORDS
+    overlap = min(overlap if overlap is not None else Config.CHUNK_OVERLAP_WORDS, max_words - 1)
+    max_chunks = max_chunks or Config.MAX_RESUME_CHUNKS
+
+    chunks = []
+    for section, section_text in split_sections(text):
+        words = section_text.split()
+        step = max_words - overlap
+        for start in range(0, max(len(words) - overlap, 1), step):
+            chunks.append((section, " ".join(words[start:start + max_words])))
+            if len(chunks) >= max_chunks:
+                return chunks
+    return chunks or [("other", (text or "").strip())]
@@ -0,0 +1,120 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+from config.config import Config
+from services.resume_parser import extract_text
+from services.metrics import span
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ContentStore:
+    """
+    Content-addressed storage for resumes. Uploads are hashed while they are
+    streamed to disk and saved as <sha256><ext>, so duplicates share one file.
+    Parsed text and resume chunk embeddings are cached under the same digest,
+    letting a re-uploaded resume skip parsing, OCR and encoding entirely.
+    """
+
+    def __init__(self, upload_folder, cache_dir=None, model_name=None):
+        self.upload_folder = Path(upload_folder)
+        self.cache_dir = Path(cache_dir or Config.PARSED_CACHE_DIR)
+        self.model_name = model_name or Config.EMBEDDING_MODEL
+        self.upload_folder.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.text_hits = 0
+        self.text_misses = 0
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+
+    def save_stream(self, chunks, ext):
+        """Write an iterable of byte chunks to the store; returns (digest, path)."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.upload_folder, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > Config.MAX_RESUME_BYTES:
+                        raise ValueError(f"Resume exceeds the {Config.MAX_RESUME_BYTES} byte limit")
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            path = self.upload_folder / f"{digest.hexdigest()}{ext.lower()}"
+            if path.exists():
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+            return digest.hexdigest(), str(path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_upload(self, file_storage, ext):
+        stream = file_storage.stream
+        return self.save_stream(iter(lambda: stream.read(CHUNK_SIZE), b""), ext)
+
+    def _text_path(self, digest):
+        return self.cache_dir / f"{digest}.txt"
+
+    def _embedding_path(self, digest):
+        # Chunk vectors change with the model, the backend and the chunking settings
+        safe_model = self.model_name.replace("/", "_")
+        chunking = "document"
+        if Config.RESUME_SCORING == "chunked":
+            chunking = f"{Config.CHUNK_MAX_WORDS}-{Config.CHUNK_OVERLAP_WORDS}-{Config.MAX_RESUME_CHUNKS}"
+        return self.cache_dir / f"{digest}.{safe_model}.{Config.EMBEDDING_BACKEND}.{chunking}.chunks.npz"
+
+    def get_text(self, digest, resume_path):
+        """Parsed text for an upload, running the parser only the first time."""
+        text_path = self._text_path(digest)
+        if text_path.exists():
+            self.text_hits += 1
+            return text_path.read_text(encoding="utf-8")
+        self.text_misses += 1
+        with span("parse"):
+            text = extract_text(resume_path)
+        self._atomic_write(text_path, lambda f: f.write(text.encode("utf-8")))
+        return text
+
+    def get_embedding(self, digest):
+        """Cached chunk vectors for an upload as (vectors, sections), or None."""
+        path = self._embedding_path(digest)
+        if not path.exists():
+            self.embedding_misses += 1
+            return None
+        try:
+            with np.load(path) as data:
+                vectors, sections = data["vectors"], [str(s) for s in data["sections"]]
+        except (OSError, ValueError, KeyError):
+            self.embedding_misses += 1
+            return None
+        self.embedding_hits += 1
+        return vectors, sections
+
+    def put_embedding(self, digest, vectors, sections):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self._atomic_write(
+            self._embedding_path(digest),
+            lambda f: np.savez(f, vectors=vectors, sections=np.array(sections, dtype=str)),
+        )
+
+    def _atomic_write(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def stats(self):
+        return {
+            "text_hits": self.text_hits,
+            "text_misses": self.text_misses,
+            "embedding_hits": self.embedding_hits,
+            "embedding_misses": self.embedding_misses,
+        }
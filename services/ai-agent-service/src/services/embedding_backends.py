@@ -0,0 +1,168 @@
+"""
+Embedding inference backends. Every backend exposes the SentenceTransformer-style
+`encode(texts, batch_size=...)` returning L2-normalized float32 vectors, so the
+model registry and the scoring code do not care which runtime is underneath.
+
+Export an ONNX copy of the model (needs torch + transformers, e.g. at image build time):
+
+    python -m services.embedding_backends export all-MiniLM-L6-v2 --quantize
+"""
+import argparse
+import os
+from pathlib import Path
+import numpy as np
+from config.config import Config
+
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model_int8.onnx"
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class SentenceTransformerBackend:
+    name = "torch"
+
+    def __init__(self, model_name, threads=None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        threads = Config.EMBEDDING_THREADS if threads is None else threads
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+        self.model.eval()
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        vectors = self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def memory_bytes(self):
+        return int(sum(p.numel() * p.element_size() for p in self.model.parameters()))
+
+
+class OnnxBackend:
+    """
+    MiniLM-style sentence encoder on ONNX Runtime: tokenize, run the transformer,
+    mean-pool over the attention mask and normalize (what sentence-transformers does).
+    """
+
+    def __init__(self, model_name, quantized=False, model_dir=None, threads=None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        model_dir = Path(model_dir or Config.ONNX_MODEL_DIR / model_name.replace("/", "_"))
+        self.model_path = model_dir / (ONNX_INT8_FILE if quantized else ONNX_FILE)
+        if not self.model_path.exists():
+            raise FileNotFoundError(
+                f"{self.model_path} not found; run `python -m services.embedding_backends export {model_name}`"
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=Config.EMBEDDING_MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        threads = Config.EMBEDDING_THREADS if threads is None else threads
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(self.model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return _normalize(pooled)
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, Config.EMBEDDING_DIM), dtype=np.float32)
+        return np.concatenate([self._encode_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)])
+
+    def memory_bytes(self):
+        return os.path.getsize(self.model_path)
+
+
+def load_backend(model_name, backend=None):
+    backend = backend or Config.EMBEDDING_BACKEND
+    if backend == "torch":
+        return SentenceTransformerBackend(model_name)
+    if backend == "onnx":
+        return OnnxBackend(model_name)
+    if backend == "onnx-int8":
+        return OnnxBackend(model_name, quantized=True)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'")
+
+
+def export_onnx(model_name, out_dir=None, quantize=False):
+    """Export the sentence-transformers model (and tokenizer) to ONNX, optionally int8-quantized."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    out_dir = Path(out_dir or Config.ONNX_MODEL_DIR / model_name.replace("/", "_"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(hub_name)
+    model = AutoModel.from_pretrained(hub_name)
+    model.eval()
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class _Encoder(torch.nn.Module):
+        # Positional inputs -> token embeddings, independent of forward()'s signature
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(),
+            tuple(sample[name] for name in input_names),
+            str(out_dir / ONNX_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            # TorchScript exporter; the dynamo one needs onnxscript
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(out_dir / ONNX_FILE), str(out_dir / ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+    print(f"Exported {model_name} to {out_dir}")
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedding backend utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Export a sentence-transformers model to ONNX")
+    export.add_argument("model", nargs="?", default=Config.EMBEDDING_MODEL)
+    export.add_argument("--out-dir")
+    export.add_argument("--quantize", action="store_true", help="Also write an int8 dynamically quantized model")
+    args = parser.parse_args()
+    export_onnx(args.model, args.out_dir, args.quantize)
@@ -0,0 +1,157 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import Config
+from services.metrics import upstream_error
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """Gemini is unreachable or the circuit breaker is open; callers should degrade to score-only."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`. After that a single trial call is let through (half-open):
+    success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class GeminiClient:
+    """Thread-safe Gemini generateContent client sharing one pooled HTTP session."""
+
+    def __init__(self, api_base=None, model_name=None, api_key=None):
+        self.api_base = (api_base or Config.GEMINI_API_BASE).rstrip("/")
+        self.model_name = model_name or Config.MODEL_NAME
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.timeout = (Config.GEMINI_CONNECT_TIMEOUT, Config.GEMINI_READ_TIMEOUT)
+        self.max_retries = Config.GEMINI_MAX_RETRIES
+        self.backoff_base = Config.GEMINI_BACKOFF_BASE
+        self.backoff_max = Config.GEMINI_BACKOFF_MAX
+        self.breaker = CircuitBreaker(Config.GEMINI_CIRCUIT_FAILURES, Config.GEMINI_CIRCUIT_RESET_SECONDS)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.GEMINI_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+    @property
+    def url(self):
+        return f"{self.api_base}/models/{self.model_name}:generateContent"
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        # Full jitter so concurrent workers don't retry in lockstep
+        return random.uniform(0, delay)
+
+    def generate(self, prompt):
+        if not self.breaker.allow():
+            raise LLMUnavailableError("Gemini circuit breaker is open")
+
+        data = {"contents": [{"parts": [{"text": prompt}]}]}
+        last_error = None
+        answered = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    response = self.session.post(
+                        self.url, headers={"X-goog-api-key": self.api_key}, json=data, timeout=self.timeout
+                    )
+                except requests.RequestException as e:
+                    upstream_error("gemini")
+                    last_error = e
+                else:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        # Upstream answered; client errors (bad key, bad request) are not an outage
+                        answered = True
+                        response.raise_for_status()
+                        return self._parse(response)
+                    upstream_error("gemini")
+                    last_error = requests.HTTPError(f"{response.status_code} from Gemini", response=response)
+
+                if attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt, response))
+
+            raise LLMUnavailableError(f"Gemini request failed after {self.max_retries + 1} attempts: {last_error}")
+        finally:
+            # Settle the breaker however the call ends, so a half-open trial is never left in flight
+            if answered:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    @staticmethod
+    def _parse(response):
+        try:
+            return response.json()['candidates'][0]['content']['parts'][0]['text']
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            # e.g. a blocked prompt comes back without content parts
+            raise LLMUnavailableError(f"Unexpected Gemini response: {e!r}")
+
+    def stats(self):
+        return {"model": self.model_name, "circuit": self.breaker.state, "consecutive_failures": self.breaker.failures}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeminiClient()
+    return _client
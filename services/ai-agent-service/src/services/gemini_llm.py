@@ -0,0 +1,12 @@
+#from langchain.llms.base import LLM
+from langchain_core.language_models import LLM
+from services.gemini_client import get_gemini_client
+
+class GeminiLLM(LLM):
+    def _call(self, prompt, stop=None):
+        # Shared pooled session with timeouts, retry/backoff and a circuit breaker
+        return get_gemini_client().generate(prompt)
+
+    @property
+    def _llm_type(self):
+        return "gemini"
@@ -0,0 +1,48 @@
+from config.config import Config
+from services.candidate_index import get_candidate_index
+from services.content_store import ContentStore
+from services.rescoring import _encode_batch, lookup_embeddings, merge_embeddings
+from utils.database import get_db_connection
+
+
+def backfill_candidate_index(index=None, collection=None, store=None, batch_size=256, rebuild=False):
+    """
+    Bring the candidate index in line with the resumes stored in Mongo. Resumes the
+    index does not know (all of them with `rebuild`) are embedded in batches, reusing
+    the content store's cached chunk vectors where they exist, and added; ids whose
+    resume no longer exists are removed. Returns counts of what was done.
+    """
+    index = index if index is not None else get_candidate_index()
+    collection = collection if collection is not None else get_db_connection()["resumes"]
+    store = store if store is not None else ContentStore(Config.UPLOAD_FOLDER)
+    stats = {"stored": 0, "added": 0, "cached": 0, "removed": 0}
+
+    def add(documents):
+        keys, cached, misses = lookup_embeddings(store, documents)
+        embeddings = merge_embeddings(store, keys, cached, _encode_batch(misses) if misses else [])
+        index.add_many([str(d["_id"]) for d in documents], [e.centroid() for e in embeddings])
+        stats["added"] += len(documents)
+        stats["cached"] += sum(hit is not None for hit in cached)
+        print(f"[CandidateIndex] Backfilled {stats['added']} resumes ({stats['cached']} from cached vectors)")
+
+    stored_ids = set()
+    batch = []
+    cursor = collection.find({}, {"text": 1, "digest": 1}).sort("_id", 1).batch_size(batch_size)
+    for document in cursor:
+        resume_id = str(document["_id"])
+        stored_ids.add(resume_id)
+        if not document.get("text") or (resume_id in index and not rebuild):
+            continue
+        batch.append(document)
+        if len(batch) == batch_size:
+            add(batch)
+            batch = []
+    if batch:
+        add(batch)
+    stats["stored"] = len(stored_ids)
+
+    for resume_id in index.ids():
+        if resume_id not in stored_ids and index.remove(resume_id):
+            stats["removed"] += 1
+    index.save()
+    return stats
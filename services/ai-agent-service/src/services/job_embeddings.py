@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from config.config import Config
+from services.model_registry import get_model
+
+
+def normalize_job_text(text):
+    """Collapse whitespace so cosmetic edits to a posting map to the same key."""
+    return " ".join((text or "").split())
+
+
+def job_key(text, model_name=None, backend=None):
+    # The ONNX int8 backend produces slightly different vectors than torch for the same model
+    model_name = model_name or Config.EMBEDDING_MODEL
+    backend = backend or Config.EMBEDDING_BACKEND
+    normalized = normalize_job_text(text)
+    return hashlib.sha256(f"{model_name}\n{backend}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class JobEmbeddingStore:
+    """
+    Job-description embeddings keyed by a hash of the normalized text.
+    Hot vectors live in an in-memory LRU; every vector is also written to disk
+    so it is computed exactly once and survives restarts.
+    """
+
+    def __init__(self, directory=None, capacity=None, model_name=None):
+        self.directory = Path(directory or Config.JOB_EMBEDDING_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity or Config.JOB_EMBEDDING_CACHE_SIZE
+        self.model_name = model_name or Config.EMBEDDING_MODEL
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def _remember(self, key, vector):
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def get(self, job_description):
+        key = job_key(job_description, self.model_name)
+
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        path = self._path(key)
+        if path.exists():
+            try:
+                vector = np.load(path)
+                self.disk_hits += 1
+                self._remember(key, vector)
+                return vector
+            except (OSError, ValueError) as e:
+                print(f"[JobEmbeddingStore] Ignoring unreadable vector {path.name}: {e}")
+
+        self.misses += 1
+        vector = np.asarray(
+            get_model(self.model_name).encode([normalize_job_text(job_description)])[0],
+            dtype=np.float32,
+        )
+        self._persist(path, vector)
+        self._remember(key, vector)
+        return vector
+
+    def _persist(self, path, vector):
+        # Write to a temp file first so a crash never leaves a truncated vector behind
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, vector)
+        os.replace(tmp_path, path)
+
+    def stats(self):
+        return {
+            "in_memory": len(self._cache),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobEmbeddingStore()
+    return _store
+
+
+def get_job_embedding(job_description):
+    return get_job_store().get(job_description)
@@ -0,0 +1,24 @@
+import os
+import sys
+
+try:
+    from prometheus_text import MetricsRegistry, StageMetrics
+except ImportError:
+    # Images copy it next to the app; in a checkout it lives in the repo's shared/python
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "shared", "python"))
+    from prometheus_text import MetricsRegistry, StageMetrics
+
+
+REGISTRY = MetricsRegistry()
+
+STAGES = StageMetrics(REGISTRY, "resume", "screening", ("gemini", "smtp", "mongodb", "download"))
+STAGE_SECONDS, STAGE_ERRORS, UPSTREAM_ERRORS = STAGES.seconds, STAGES.errors, STAGES.upstream_errors
+OCR_FALLBACKS = REGISTRY.counter(
+    "ocr_fallbacks_total", "Resumes or PDF pages that had to be OCR'd.", ["kind"]
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ["method", "endpoint", "status"]
+)
+
+span = STAGES.span
+upstream_error = STAGES.upstream_error
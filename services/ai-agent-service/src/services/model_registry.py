@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from config.config import Config
+
+
+class _ModelEntry:
+    """A loaded embedding model plus the bookkeeping we expose via /models."""
+
+    def __init__(self, name, model, load_seconds, memory_bytes, max_concurrency):
+        self.name = name
+        self.model = model
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.loaded_at = time.time()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def encode(self, texts, **kwargs):
+        # Inference is read-only so the model can be shared across threads;
+        # the semaphore only caps how many encodes compete for the CPU at once.
+        with self._slots:
+            return self.model.encode(texts, **kwargs)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "backend": getattr(self.model, "name", type(self.model).__name__),
+            "load_seconds": round(self.load_seconds, 3),
+            "memory_bytes": self.memory_bytes,
+            "memory_mb": round(self.memory_bytes / (1024 * 1024), 1) if self.memory_bytes else None,
+            "loaded_at": self.loaded_at,
+        }
+
+
+_models = {}
+_load_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """Current resident set size, or None where it cannot be read (no psutil, no /proc)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def _model_memory_bytes(model, rss_before=None, rss_after=None):
+    """Prefer the backend's exact weight footprint; fall back to the RSS growth seen while loading."""
+    try:
+        return int(model.memory_bytes())
+    except Exception:
+        if rss_before is None or rss_after is None:
+            return None
+        return max(rss_after - rss_before, 0)
+
+
+def _load_backend(name):
+    # Torch or ONNX Runtime, per Config.EMBEDDING_BACKEND
+    from services.embedding_backends import load_backend
+    return load_backend(name)
+
+
+def _lock_for(name):
+    with _registry_lock:
+        return _load_locks.setdefault(name, threading.Lock())
+
+
+def get_model(name=None):
+    """Return the process-wide model entry for `name`, loading it on first use."""
+    name = name or Config.EMBEDDING_MODEL
+    entry = _models.get(name)
+    if entry is not None:
+        return entry
+
+    with _lock_for(name):
+        # Another thread may have finished loading while we waited
+        entry = _models.get(name)
+        if entry is not None:
+            return entry
+
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        model = _load_backend(name)
+        load_seconds = time.perf_counter() - start
+        memory_bytes = _model_memory_bytes(model, rss_before, _rss_bytes())
+
+        entry = _ModelEntry(name, model, load_seconds, memory_bytes, Config.EMBEDDING_MAX_CONCURRENCY)
+        _models[name] = entry
+        print(f"[ModelRegistry] Loaded {name} in {load_seconds:.2f}s ({entry.stats()['memory_mb']} MB)")
+        return entry
+
+
+def register_model(name, model, load_seconds=0.0):
+    """Install an already constructed model (used by tests and custom warm-up code)."""
+    entry = _ModelEntry(name, model, load_seconds, _model_memory_bytes(model), Config.EMBEDDING_MAX_CONCURRENCY)
+    _models[name] = entry
+    return entry
+
+
+def warm_up(names=None):
+    """Load the given models (default: the configured embedding model) and run one encode."""
+    for name in names or [Config.EMBEDDING_MODEL]:
+        entry = get_model(name)
+        entry.encode(["warm-up"])
+
+
+def loaded_models():
+    return [entry.stats() for entry in _models.values()]
+
+
+def clear():
+    with _registry_lock:
+        _models.clear()
+        _load_locks.clear()
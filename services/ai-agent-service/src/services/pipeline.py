@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from config.config import Config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.PIPELINE_WORKERS, thread_name_prefix="pipeline")
+    return _executor
+
+
+class PipelineError(Exception):
+    def __init__(self, stage, error):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class PipelineResult:
+    def __init__(self):
+        self.results = {}
+        self.timings = {}
+        self.errors = {}
+        self.skipped = []
+
+    def raise_for_errors(self):
+        for stage, error in self.errors.items():
+            raise PipelineError(stage, error) from error
+
+
+class Pipeline:
+    """
+    Minimal DAG executor. Each stage runs as soon as all of its dependencies have
+    finished, receiving their results as positional arguments, so independent I/O
+    overlaps and total latency tends towards the slowest path rather than the sum.
+    A failed stage does not stop unrelated stages; its dependents are skipped.
+    """
+
+    def __init__(self, executor=None):
+        self._executor = executor
+        self._stages = {}
+
+    def add(self, name, fn, deps=()):
+        unknown = [dep for dep in deps if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {unknown}")
+        self._stages[name] = (fn, tuple(deps))
+        return self
+
+    def run(self):
+        executor = self._executor or _get_executor()
+        result = PipelineResult()
+        pending = dict(self._stages)
+        running = {}
+
+        def launch_ready():
+            # Stages are stored in insertion order and deps must already exist,
+            # so one pass also cascades skips down the graph
+            for name, (fn, deps) in list(pending.items()):
+                if any(dep in result.errors or dep in result.skipped for dep in deps):
+                    result.skipped.append(name)
+                    del pending[name]
+                elif all(dep in result.results for dep in deps):
+                    args = [result.results[dep] for dep in deps]
+                    running[executor.submit(_run_stage, fn, args)] = name
+                    del pending[name]
+
+        launch_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                value, elapsed, error = future.result()
+                result.timings[name] = round(elapsed * 1000, 2)
+                if error is None:
+                    result.results[name] = value
+                else:
+                    print(f"[Pipeline] Stage {name} failed: {error}")
+                    result.errors[name] = error
+            launch_ready()
+        return result
+
+
+def _run_stage(fn, args):
+    start = time.perf_counter()
+    try:
+        return fn(*args), time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, e
@@ -0,0 +1,67 @@
+import re
+import threading
+from config.config import Config
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "of", "on", "or", "our", "the", "to", "we", "will", "with", "you", "your", "who", "this", "that",
+    "experience", "years", "work", "team", "role", "job", "candidate", "strong", "ability", "skills",
+    "looking", "required", "requirements", "preferred", "plus", "including", "etc",
+}
+
+
+def keywords(text):
+    return {w for w in _WORD_RE.findall((text or "").lower()) if len(w) > 2 and w not in _STOPWORDS}
+
+
+def keyword_coverage(resume_text, job_description):
+    """Share (0-1) of the job description's keywords that also appear in the resume."""
+    job_words = keywords(job_description)
+    if not job_words:
+        return 0.0
+    return len(job_words & keywords(resume_text)) / len(job_words)
+
+
+class AnalysisGate:
+    """
+    Decides whether a screened resume is worth a Gemini analysis. The embedding
+    score is already computed, so this only adds a keyword check for resumes just
+    below the band; clearly irrelevant ones are stored without an LLM call.
+    """
+
+    def __init__(self, min_score=None, max_score=None, keyword_rescue=None):
+        self.min_score = Config.LLM_ANALYSIS_MIN_SCORE if min_score is None else min_score
+        self.max_score = Config.LLM_ANALYSIS_MAX_SCORE if max_score is None else max_score
+        self.keyword_rescue = Config.LLM_KEYWORD_RESCUE if keyword_rescue is None else keyword_rescue
+        self._lock = threading.Lock()
+        self.analyzed = 0
+        self.skipped = 0
+
+    def decide(self, score, resume_text, job_description):
+        """Returns (analyze, reason)."""
+        if score > self.max_score:
+            analyze, reason = False, "above_band"
+        elif score >= self.min_score:
+            analyze, reason = True, "in_band"
+        elif keyword_coverage(resume_text, job_description) >= self.keyword_rescue:
+            analyze, reason = True, "keyword_match"
+        else:
+            analyze, reason = False, "below_band"
+
+        with self._lock:
+            if analyze:
+                self.analyzed += 1
+            else:
+                self.skipped += 1
+        return analyze, reason
+
+    def stats(self):
+        decided = self.analyzed + self.skipped
+        return {
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "analyzed": self.analyzed,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / decided, 3) if decided else None,
+        }
@@ -1,60 +1,152 @@
-#from langchain.llms.base import LLM
-from langchain_core.language_models import LLM
-#from langchain.prompts import PromptTemplate
-from langchain_core.prompts import PromptTemplate
-import requests
-import json
-from sentence_transformers import SentenceTransformer
-import faiss
 import numpy as np
 from dotenv import load_dotenv
-import os
+import threading
+from config.config import Config
+from services.model_registry import get_model
+from services.job_embeddings import get_job_embedding
+from services.chunking import chunk_resume, SECTION_WEIGHTS
+from services.gemini_client import LLMUnavailableError
+from services.analysis_cache import analysis_key, get_analysis_cache
+from services.metrics import span
 
 load_dotenv()
 
-class GeminiLLM(LLM):
-    def _call(self, prompt, stop=None):
-        headers = {
-            "Content-Type": "application/json",
-            "X-goog-api-key": os.getenv("GEMINI_API_KEY")
-        }
-        data = {
-            "contents": [{"parts": [{"text": prompt}]}]
-        }
-        response = requests.post(
-            "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent",
-            headers=headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()['candidates'][0]['content']['parts'][0]['text']
+def cosine_score(resume_embedding, job_embedding):
+    """Cosine similarity of two embeddings as a 0-100 percentage."""
+    resume_embedding = np.asarray(resume_embedding, dtype=np.float32)
+    job_embedding = np.asarray(job_embedding, dtype=np.float32)
+    denom = float(np.linalg.norm(resume_embedding) * np.linalg.norm(job_embedding)) or 1.0
+    return float(np.dot(resume_embedding, job_embedding) / denom * 100)
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class ResumeEmbedding:
+    """Normalized chunk vectors of one resume plus the section each chunk came from."""
+
+    def __init__(self, vectors, sections):
+        self.vectors = _normalize_rows(np.atleast_2d(vectors))
+        self.sections = list(sections)
 
     @property
-    def _llm_type(self):
-        return "gemini"
+    def weights(self):
+        return np.array([SECTION_WEIGHTS.get(s, SECTION_WEIGHTS["other"]) for s in self.sections], dtype=np.float32)
+
+    def centroid(self):
+        """Single vector for the whole resume (used by the candidate ANN index)."""
+        return _normalize_rows(self.vectors.mean(axis=0))
+
+def encode_texts(texts):
+    """Encode texts in one batched call; returns a (n, dim) float32 array."""
+    with span("embed"):
+        return np.asarray(
+            get_model().encode(list(texts), batch_size=Config.EMBEDDING_BATCH_SIZE),
+            dtype=np.float32,
+        )
+
+def _resume_chunks(text):
+    if Config.RESUME_SCORING == "chunked":
+        return chunk_resume(text)
+    # A single chunk scores as the plain cosine of the whole document
+    return [("other", text or "")]
+
+def encode_resumes(resume_texts):
+    """
+    Split every resume into section-aware chunks (or keep it whole, per RESUME_SCORING)
+    and encode all chunks of all resumes in a single batched call. Returns one
+    ResumeEmbedding per resume.
+    """
+    chunked = [_resume_chunks(text) for text in resume_texts]
+    flat = [chunk for chunks in chunked for _, chunk in chunks]
+    if not flat:
+        return []
+    vectors = encode_texts(flat)
+    embeddings, offset = [], 0
+    for chunks in chunked:
+        embeddings.append(ResumeEmbedding(vectors[offset:offset + len(chunks)], [section for section, _ in chunks]))
+        offset += len(chunks)
+    return embeddings
+
+def score_embeddings(resume_embeddings, job_description):
+    """
+    Scores (0-100) of precomputed resume embeddings against one job. All chunks of
+    all resumes are compared with one matrix-vector product, then reduced per resume
+    to MAX_SIM_WEIGHT * best chunk + (1 - MAX_SIM_WEIGHT) * section-weighted mean.
+    """
+    if not resume_embeddings:
+        return []
+    job_embedding = _normalize_rows(get_job_embedding(job_description))
+    with span("similarity"):
+        all_vectors = np.concatenate([e.vectors for e in resume_embeddings])
+        all_weights = np.concatenate([e.weights for e in resume_embeddings])
+        offsets = np.cumsum([0] + [len(e.vectors) for e in resume_embeddings[:-1]])
+
+        sims = all_vectors @ job_embedding
+        best = np.maximum.reduceat(sims, offsets)
+        weighted_mean = np.add.reduceat(sims * all_weights, offsets) / np.add.reduceat(all_weights, offsets)
+        scores = (Config.MAX_SIM_WEIGHT * best + (1 - Config.MAX_SIM_WEIGHT) * weighted_mean) * 100
+    return [float(s) for s in scores]
+
+def score_resumes(resume_texts, job_description):
+    """
+    Score many resumes against one job: a single batched encode for all resume chunks
+    and one matrix-vector product for every similarity.
+    Returns (scores, resume_embeddings).
+    """
+    if not resume_texts:
+        return [], []
+    resume_embeddings = encode_resumes(resume_texts)
+    return score_embeddings(resume_embeddings, job_description), resume_embeddings
+
+def compute_match_scores(resume_texts, job_description):
+    return score_resumes(resume_texts, job_description)[0]
+
+def score_resume(resume_text, job_description):
+    """Embedding score for one resume. Returns (score, ResumeEmbedding)."""
+    # Job vectors are computed once and persisted; only the resume chunks are encoded here
+    scores, embeddings = score_resumes([resume_text], job_description)
+    return scores[0], embeddings[0]
+
+# Bump PROMPT_VERSION whenever MATCH_TEMPLATE changes so cached analyses are not reused
+PROMPT_VERSION = "1"
+MATCH_TEMPLATE = "Analyze the resume and job description. Extract key skills, experience, and qualifications. Provide a brief summary of the match quality.\nResume: {resume}\nJob Description: {job}"
+
+_match_chain = None
+_match_chain_lock = threading.Lock()
+
+def get_match_chain():
+    """(GeminiLLM, PromptTemplate), built on first use since langchain_core is slow to import."""
+    global _match_chain
+    if _match_chain is None:
+        with _match_chain_lock:
+            if _match_chain is None:
+                #from langchain.prompts import PromptTemplate
+                from langchain_core.prompts import PromptTemplate
+                from services.gemini_llm import GeminiLLM
+                prompt = PromptTemplate(input_variables=["resume", "job"], template=MATCH_TEMPLATE)
+                _match_chain = (GeminiLLM(), prompt)
+    return _match_chain
+
+def analyze_match(resume_text, job_description):
+    # Identical resume/job pairs reuse the cached analysis instead of calling Gemini again
+    key = analysis_key(resume_text, job_description, PROMPT_VERSION, Config.MODEL_NAME)
+
+    def run_llm():
+        # Use Gemini for detailed analysis
+        llm, prompt = get_match_chain()
+        with span("llm"):
+            return llm.invoke(prompt.format(resume=resume_text, job=job_description))
+
+    try:
+        return get_analysis_cache().get_or_compute(key, run_llm)
+    except LLMUnavailableError as e:
+        # Degrade to a score-only result rather than failing the submission
+        print(f"[RAG] Skipping LLM analysis: {e}")
+        return None
 
 def compute_match_score(resume_text, job_description):
-    # Initialize Sentence Transformer and FAISS
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    index = faiss.IndexFlatL2(384)  # Dimension of MiniLM embeddings
-
-    # Encode job description
-    job_embedding = model.encode([job_description])[0]
-    index.add(np.array([job_embedding]))
-
-    # Encode resume
-    resume_embedding = model.encode([resume_text])[0]
-
-    # Compute cosine similarity
-    D, I = index.search(np.array([resume_embedding]), 1)
-    score = 1 - (D[0][0] / 2)  # Normalize to 0-1
-    score = float(score * 100)  # Convert to percentage and cast to native float
-
-    # Use Gemini for detailed analysis
-    llm = GeminiLLM()
-    prompt = PromptTemplate(
-        input_variables=["resume", "job"],
-        template="Analyze the resume and job description. Extract key skills, experience, and qualifications. Provide a brief summary of the match quality.\nResume: {resume}\nJob Description: {job}"
-    )
-    analysis = llm.invoke(prompt.format(resume=resume_text, job=job_description))
-    return score, analysis
\ No newline at end of file
+    score, _ = score_resume(resume_text, job_description)
+    return score, analyze_match(resume_text, job_description)
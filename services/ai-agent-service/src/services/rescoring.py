@@ -0,0 +1,204 @@
+import datetime
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from bson import ObjectId
+from config.config import Config
+from services.content_store import ContentStore
+from services.rag_pipeline import ResumeEmbedding, encode_resumes, score_embeddings
+from services.resume_service import ResumeService
+from utils.database import get_db_connection, job_hash
+
+
+def _init_worker():
+    # Load the model once per worker process instead of on its first batch
+    from services.model_registry import get_model
+    get_model()
+
+
+def _encode_batch(texts):
+    """Worker entry point: chunk vectors and sections per resume (plain arrays pickle cheaply)."""
+    return [(embedding.vectors, embedding.sections) for embedding in encode_resumes(texts)]
+
+
+def cache_key(document):
+    """Chunk-vector cache key of a stored resume: its upload digest, or a hash of its text."""
+    if document.get("digest"):
+        return document["digest"]
+    return "text-" + hashlib.sha256((document.get("text") or "").encode("utf-8")).hexdigest()
+
+
+def lookup_embeddings(store, documents):
+    """Cache keys, cached (vectors, sections) or None per document, and the texts to encode."""
+    keys = [cache_key(d) for d in documents]
+    cached = [store.get_embedding(key) for key in keys]
+    misses = [d.get("text") or "" for d, hit in zip(documents, cached) if hit is None]
+    return keys, cached, misses
+
+
+def merge_embeddings(store, keys, cached, encoded):
+    """ResumeEmbedding per document from the cache hits and, in order, the encoded misses (which get cached)."""
+    encoded = iter(encoded)
+    embeddings = []
+    for key, hit in zip(keys, cached):
+        if hit is None:
+            hit = next(encoded)
+            store.put_embedding(key, *hit)
+        embeddings.append(ResumeEmbedding(*hit))
+    return embeddings
+
+
+class Rescorer:
+    """
+    Re-scores stored resumes against a new job description. Resume texts are streamed
+    from Mongo in _id order and their chunk vectors are taken from the content store's
+    cache, keyed by the upload digest stored on the resume (or, for resumes stored
+    without one, by a hash of the text). Only cache misses are encoded, in large
+    batches (across a process pool when `workers` > 0), and cached for the next run.
+    Each batch is scored against the job with one matrix product and written back with
+    one unordered bulk_write. The last written _id is checkpointed after every batch,
+    so an interrupted run continues where it stopped.
+    """
+
+    def __init__(self, job_description, query=None, batch_size=256, workers=0,
+                 checkpoint_path=None, dry_run=False, collection=None, store=None):
+        self.job_description = job_description
+        self.job_hash = job_hash(job_description)
+        # Resumes already scored against this job are left alone, so reruns are idempotent
+        self.query = {"$and": [query or {}, {"job_hash": {"$ne": self.job_hash}}]}
+        self.batch_size = batch_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path or f"rescore-{self.job_hash[:12]}.json"
+        self.dry_run = dry_run
+        self.collection = collection if collection is not None else get_db_connection()["resumes"]
+        self.store = store if store is not None else ContentStore(Config.UPLOAD_FOLDER)
+        self.stats = {"processed": 0, "updated": 0, "cached": 0, "categories": {}}
+        self._last_id = None
+
+    def load_checkpoint(self):
+        """The last rescored _id from a previous run of the same job and selection, or None."""
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("job_hash") != self.job_hash or checkpoint.get("query") != repr(self.query):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to a different job or selection; "
+                "pass another checkpoint path or restart"
+            )
+        self.stats = checkpoint["stats"]
+        return ObjectId(checkpoint["last_id"]) if checkpoint.get("last_id") else None
+
+    def _save_checkpoint(self, last_id, done=False):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "job_hash": self.job_hash,
+                "query": repr(self.query),
+                "last_id": str(last_id) if last_id else None,
+                "done": done,
+                "stats": self.stats,
+            }, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _batches(self, after_id):
+        query = self.query if after_id is None else {"$and": [self.query, {"_id": {"$gt": after_id}}]}
+        cursor = self.collection.find(query, {"text": 1, "digest": 1}).sort("_id", 1).batch_size(self.batch_size)
+        batch = []
+        for document in cursor:
+            batch.append(document)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _write(self, documents, scores):
+        from pymongo import UpdateOne
+        now = datetime.datetime.utcnow()
+        operations = []
+        for document, score in zip(documents, scores):
+            category = ResumeService._categorize(score)
+            self.stats["categories"][category] = self.stats["categories"].get(category, 0) + 1
+            operations.append(UpdateOne({"_id": document["_id"]}, {"$set": {
+                "score": score,
+                "category": category,
+                "job_description": self.job_description,
+                "job_hash": self.job_hash,
+                # The stored analysis was written for the old job; POST /resumes/<id>/analysis redoes it
+                "analysis": None,
+                "analysis_status": "stale",
+                "rescored_at": now,
+            }}))
+        if self.dry_run:
+            return 0
+        return self.collection.bulk_write(operations, ordered=False).modified_count
+
+    def _finish(self, documents, keys, cached, encoded):
+        embeddings = merge_embeddings(self.store, keys, cached, encoded)
+        scores = score_embeddings(embeddings, self.job_description)
+        self.stats["updated"] += self._write(documents, scores)
+        self.stats["processed"] += len(documents)
+        # Checkpoints written before vectors were reused have no "cached" count
+        self.stats["cached"] = self.stats.get("cached", 0) + sum(hit is not None for hit in cached)
+        self._last_id = documents[-1]["_id"]
+        if not self.dry_run:
+            self._save_checkpoint(self._last_id)
+
+    def run(self, restart=False, max_batches=None):
+        after_id = None if restart else self.load_checkpoint()
+        self._last_id = after_id
+        if after_id is not None:
+            print(f"[Rescore] Resuming after {after_id} ({self.stats['processed']} resumes already done)")
+        start = time.perf_counter()
+        processed_before = self.stats["processed"]
+        batches = self._batches(after_id)
+        if max_batches is not None:
+            batches = itertools.islice(batches, max_batches)
+
+        if self.workers < 1:
+            for documents in batches:
+                keys, cached, misses = lookup_embeddings(self.store, documents)
+                self._finish(documents, keys, cached, _encode_batch(misses) if misses else [])
+                self._progress(start, processed_before)
+        else:
+            # Workers share the cores rather than each starting one torch thread per core
+            os.environ.setdefault("EMBEDDING_THREADS", str(max(1, (os.cpu_count() or 1) // self.workers)))
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            in_flight = deque()
+            try:
+                for documents in batches:
+                    keys, cached, misses = lookup_embeddings(self.store, documents)
+                    future = pool.submit(_encode_batch, misses) if misses else None
+                    in_flight.append((documents, keys, cached, future))
+                    # Keep every worker busy while batches are written back in _id order
+                    if len(in_flight) > 2 * self.workers:
+                        self._finish_next(in_flight)
+                        self._progress(start, processed_before)
+                while in_flight:
+                    self._finish_next(in_flight)
+                    self._progress(start, processed_before)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        if not self.dry_run and max_batches is None:
+            self._save_checkpoint(self._last_id, done=True)
+        return self.stats
+
+    def _finish_next(self, in_flight):
+        documents, keys, cached, future = in_flight.popleft()
+        self._finish(documents, keys, cached, future.result() if future is not None else [])
+
+    def _progress(self, start, processed_before):
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        done = self.stats["processed"] - processed_before
+        print(f"[Rescore] {self.stats['processed']} resumes rescored ({done / elapsed:.0f}/s)")
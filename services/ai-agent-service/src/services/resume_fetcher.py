@@ -0,0 +1,162 @@
+import itertools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import Config
+from services.metrics import span
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of the formats extract_text understands
+_SIGNATURES = [
+    (b"%PDF", ".pdf"),
+    (b"PK\x03\x04", ".docx"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+]
+
+_DRIVE_FILE_RE = re.compile(r'/file/d/([a-zA-Z0-9_-]+)')
+_CONFIRM_RE = re.compile(r'(?:name="confirm"\s+value="|[?&]confirm=)([0-9A-Za-z_-]+)')
+_UUID_RE = re.compile(r'name="uuid"\s+value="([0-9A-Za-z_-]+)"')
+
+
+class FetchError(ValueError):
+    pass
+
+
+def sniff_extension(head):
+    """File extension for the first bytes of a download, or None for unknown content."""
+    for signature, ext in _SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def _looks_like_html(head):
+    start = head.lstrip()[:512].lower()
+    return start.startswith(b"<!doctype html") or start.startswith(b"<html") or b"<html" in start
+
+
+def normalize_url(url):
+    """Rewrite Google Drive share links to their direct-download form."""
+    match = _DRIVE_FILE_RE.search(url)
+    if match and "drive.google.com" in url:
+        return f"https://drive.google.com/uc?id={match.group(1)}&export=download"
+    return url
+
+
+def _with_params(url, **params):
+    parts = urlparse(url)
+    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    query.update(params)
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+class ResumeFetcher:
+    """
+    Downloads resumes over a pooled session with timeouts and a byte cap.
+    The first bytes are sniffed so HTML pages (e.g. Google Drive's virus-scan
+    interstitial) are caught before they reach the parser; Drive's confirm-token
+    flow is followed once. prefetch() downloads many URLs concurrently.
+    """
+
+    def __init__(self, max_bytes=None, concurrency=None):
+        self.max_bytes = max_bytes or Config.MAX_RESUME_BYTES
+        self.timeout = (Config.FETCH_CONNECT_TIMEOUT, Config.FETCH_READ_TIMEOUT)
+        self.concurrency = concurrency or Config.FETCH_CONCURRENCY
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _open(self, url):
+        response = self.session.get(url, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            response.close()
+            raise FetchError(f"Resume is {length} bytes, exceeding the {self.max_bytes} byte limit")
+        return response
+
+    def _drive_confirm_url(self, url, response, head):
+        token = next((v for k, v in response.cookies.items() if k.startswith("download_warning")), None)
+        match = _CONFIRM_RE.search(head.decode("utf-8", errors="ignore"))
+        token = token or (match.group(1) if match else None)
+        if not token:
+            return None
+        params = {"confirm": token}
+        uuid_match = _UUID_RE.search(head.decode("utf-8", errors="ignore"))
+        if uuid_match:
+            params["uuid"] = uuid_match.group(1)
+        return _with_params(url, **params)
+
+    def fetch(self, url, store):
+        """Download `url` into the content store; returns (digest, resume_path)."""
+        with span("download", upstream="download"):
+            return self._fetch(url, store)
+
+    def _fetch(self, url, store):
+        download_url = normalize_url(url)
+        print(f"Downloading resume from: {download_url}")
+        response = self._open(download_url)
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+        head = next(chunks, b"")
+
+        if _looks_like_html(head):
+            confirm_url = self._drive_confirm_url(download_url, response, head)
+            response.close()
+            if not confirm_url:
+                raise FetchError("URL returned an HTML page instead of a resume file (is the link public?)")
+            response = self._open(confirm_url)
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+            head = next(chunks, b"")
+            if _looks_like_html(head):
+                response.close()
+                raise FetchError("URL still returned an HTML page after confirming the download")
+
+        ext = sniff_extension(head)
+        if ext is None:
+            response.close()
+            raise FetchError("Downloaded file is not a PDF, DOCX or image")
+
+        with response:
+            digest, resume_path = store.save_stream(itertools.chain([head], chunks), ext)
+        print(f"Downloaded resume to {resume_path}")
+        return digest, resume_path
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fetch")
+        return self._executor
+
+    def prefetch(self, urls, store):
+        """Download many URLs concurrently. Returns {url: (digest, path) or Exception}."""
+        unique = list(dict.fromkeys(urls))
+        futures = {url: self._get_executor().submit(self.fetch, url, store) for url in unique}
+        results = {}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = e
+        return results
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_resume_fetcher():
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = ResumeFetcher()
+    return _fetcher
@@ -1,30 +1,150 @@
-import fitz  # PyMuPDF
-from docx import Document
-try:
-    import pytesseract
-    from PIL import Image
-    HAS_OCR = True
-except ImportError:
-    HAS_OCR = False
+import io
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from config.config import Config
+from services.metrics import OCR_FALLBACKS
+
+# PyMuPDF, python-docx and the OCR stack are imported on first use so that
+# importing the service (and answering health checks) does not wait on them.
+_ocr = None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _ocr_modules():
+    """(pytesseract, PIL.Image), or None when OCR is not installed."""
+    global _ocr
+    if _ocr is None:
+        try:
+            import pytesseract
+            from PIL import Image
+            _ocr = (pytesseract, Image)
+        except ImportError:
+            _ocr = False
+    return _ocr or None
+
+
+def has_ocr():
+    return _ocr_modules() is not None
+
+
+def preload():
+    """Import the parsing libraries now (called from the startup warm-up)."""
+    import fitz  # noqa: F401
+    import docx  # noqa: F401
+    _ocr_modules()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a threaded Flask worker can deadlock on inherited locks
+                _pool = ProcessPoolExecutor(
+                    max_workers=Config.PARSER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _ocr_page(page, dpi):
+    pytesseract, Image = _ocr_modules()
+    pix = page.get_pixmap(dpi=dpi)
+    image = Image.open(io.BytesIO(pix.tobytes("png")))
+    return pytesseract.image_to_string(image)
+
+
+def _page_text(page, ocr_min_chars, ocr_dpi):
+    """(text, whether OCR was tried) for one PDF page."""
+    text = page.get_text()
+    # Only pages without a usable text layer pay for OCR
+    if len(text.strip()) < ocr_min_chars and has_ocr():
+        try:
+            return _ocr_page(page, ocr_dpi), True
+        except Exception as e:
+            print(f"OCR failed on page {page.number}: {e}")
+        return text, True
+    return text, False
+
+
+def _extract_pdf_range(file_path, start, stop, ocr_min_chars, ocr_dpi):
+    """
+    Worker entry point: [(text, OCR tried), ...] for pages [start, stop) of one PDF.
+    Metrics incremented in a spawned worker would never reach /metrics, so the parent counts.
+    """
+    import fitz  # PyMuPDF
+    with fitz.open(file_path) as doc:
+        return [_page_text(doc[i], ocr_min_chars, ocr_dpi) for i in range(start, stop)]
+
+
+def _counted(pages):
+    for text, ocr_used in pages:
+        if ocr_used:
+            OCR_FALLBACKS.inc(kind="pdf_page")
+        yield text
+
+
+def _check_size(file_path):
+    size = os.path.getsize(file_path)
+    if size > Config.MAX_RESUME_BYTES:
+        raise ValueError(f"File is {size} bytes, exceeding the {Config.MAX_RESUME_BYTES} byte limit")
+
+
+def _iter_pdf_pages(file_path):
+    import fitz  # PyMuPDF
+    with fitz.open(file_path) as doc:
+        page_count = doc.page_count
+        if page_count > Config.MAX_RESUME_PAGES:
+            print(f"Resume has {page_count} pages; only the first {Config.MAX_RESUME_PAGES} are parsed")
+            page_count = Config.MAX_RESUME_PAGES
+
+        if page_count < Config.PARALLEL_PDF_MIN_PAGES or Config.PARSER_WORKERS < 2:
+            pages = (_page_text(doc[i], Config.OCR_MIN_PAGE_CHARS, Config.OCR_DPI) for i in range(page_count))
+            yield from _counted(pages)
+            return
+
+    # Large documents: split the page range across the process pool and yield in order
+    step = -(-page_count // Config.PARSER_WORKERS)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    futures = [
+        _get_pool().submit(_extract_pdf_range, file_path, start, stop, Config.OCR_MIN_PAGE_CHARS, Config.OCR_DPI)
+        for start, stop in ranges
+    ]
+    for future in futures:
+        yield from _counted(future.result())
+
+
+def iter_text(file_path):
+    """Lazily yield the text of a resume one page (PDF) or paragraph (DOCX) at a time."""
+    ext = os.path.splitext(file_path)[1].lower()
+    _check_size(file_path)
+    if ext == '.pdf':
+        yield from _iter_pdf_pages(file_path)
+    elif ext == '.docx':
+        from docx import Document
+        doc = Document(file_path)
+        for para in doc.paragraphs:
+            yield para.text
+    elif ext in ['.png', '.jpg', '.jpeg']:
+        ocr = _ocr_modules()
+        if ocr is None:
+            raise ValueError("OCR is not available for image resumes")
+        pytesseract, Image = ocr
+        OCR_FALLBACKS.inc(kind="image")
+        with Image.open(file_path) as image:
+            yield pytesseract.image_to_string(image)
+    else:
+        raise ValueError("Unsupported file format")
+
 
 def extract_text(file_path):
     ext = os.path.splitext(file_path)[1].lower()
     try:
-        if ext == '.pdf':
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
-        elif ext == '.docx':
-            doc = Document(file_path)
-            return "\n".join([para.text for para in doc.paragraphs])
-        elif ext in ['.png', '.jpg', '.jpeg']:
-            image = Image.open(file_path)
-            return pytesseract.image_to_string(image)
-        else:
-            raise ValueError("Unsupported file format")
+        separator = "\n" if ext == '.docx' else ""
+        return separator.join(iter_text(file_path))
     except Exception as e:
-        raise Exception(f"Error parsing file: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Error parsing file: {str(e)}")
@@ -1,81 +1,283 @@
 import os
-import requests
-import re
+from urllib.parse import urlparse
 from werkzeug.utils import secure_filename
-from services.resume_parser import extract_text
-from services.rag_pipeline import compute_match_score
+from config.config import Config
+from services.content_store import ContentStore
+from services.resume_fetcher import get_resume_fetcher
+from services.rag_pipeline import ResumeEmbedding, encode_resumes, score_embeddings, analyze_match
+from services.candidate_index import get_candidate_index
+from services.task_queue import get_task_queue
+from services.pipeline import Pipeline, PipelineError
+from services.prefilter import AnalysisGate
+from services.skill_matcher import get_skill_matcher
 from utils.email_service import send_acknowledgment_email, send_congratulatory_email, send_rejection_email
-from utils.database import store_resume
+from utils.database import store_resume, store_resumes, update_resume, build_resume_document, get_resume
 
 class ResumeService:
     def __init__(self, upload_folder):
         self.upload_folder = upload_folder
         os.makedirs(self.upload_folder, exist_ok=True)
+        self.store = ContentStore(self.upload_folder)
+        self.gate = AnalysisGate()
 
-    def process_submission(self, resume_file, resume_url, job_description, candidate_name, email):
+    def _save_resume(self, resume_file, resume_url, candidate_name, email):
+        """
+        Stream the resume into the content store; returns (digest, resume_path, resume_name).
+        Stored files are named after their digest, so resume_name keeps the name the
+        candidate's file had for use as the email attachment name.
+        """
         if resume_file:
             filename = secure_filename(resume_file.filename)
-            resume_path = os.path.join(self.upload_folder, filename)
-            resume_file.save(resume_path)
+            digest, resume_path = self.store.save_upload(resume_file, os.path.splitext(filename)[1])
         elif resume_url:
-            # Generate a filename from the URL or timestamp
-            filename = f"resume_{secure_filename(candidate_name)}_{secure_filename(email)}.pdf"
-            resume_path = os.path.join(self.upload_folder, filename)
-            
-            # Handle Google Drive Links
-            download_url = resume_url
-            gdrive_match = re.search(r'/file/d/([a-zA-Z0-9_-]+)', resume_url)
-            if gdrive_match:
-                file_id = gdrive_match.group(1)
-                download_url = f"https://drive.google.com/uc?id={file_id}&export=download"
-                print(f"Converted Google Drive Link to: {download_url}")
-
-            # Download the file
             try:
-                print(f"Downloading resume from: {download_url}")
-                response = requests.get(download_url, stream=True)
-                response.raise_for_status()
-                with open(resume_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                print(f"Downloaded resume to {resume_path}")
+                digest, resume_path = get_resume_fetcher().fetch(resume_url, self.store)
             except Exception as e:
                 print(f"Failed to download resume: {e}")
                 raise ValueError(f"Failed to download resume from URL provided: {e}")
+            filename = secure_filename(os.path.basename(urlparse(resume_url).path))
         else:
              raise ValueError("No resume file or URL provided")
+        ext = os.path.splitext(resume_path)[1]
+        if not filename or os.path.splitext(filename)[1].lower() != ext.lower():
+            # Links often end in an id rather than a file name
+            filename = f"{secure_filename(candidate_name or '') or 'candidate'}_resume{ext}"
+        return digest, resume_path, filename
+
+    def _embed(self, digests, texts):
+        """Resume chunk embeddings, reusing cached vectors and encoding the rest in one batch."""
+        embeddings = []
+        for digest in digests:
+            cached = self.store.get_embedding(digest)
+            embeddings.append(ResumeEmbedding(*cached) if cached else None)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = encode_resumes([texts[i] for i in missing])
+            for i, embedding in zip(missing, encoded):
+                self.store.put_embedding(digests[i], embedding.vectors, embedding.sections)
+                embeddings[i] = embedding
+        return embeddings
+
+    def process_submission(self, resume_file, resume_url, job_description, candidate_name, email):
+        screening = self.screen_submission(resume_file, resume_url, job_description, candidate_name, email)
+        return self.complete_submission(screening, job_description, candidate_name, email)
+
+    def submit_async(self, resume_file, resume_url, job_description, candidate_name, email):
+        """
+        Run the cheap part (save, parse, embedding score) inline and hand the LLM
+        analysis, emails and DB write to the background queue.
+        Returns the job id with the preliminary score.
+        """
+        screening = self.screen_submission(resume_file, resume_url, job_description, candidate_name, email)
+        job_id = get_task_queue().submit(self.complete_submission, screening, job_description, candidate_name, email)
+        return {
+            "job_id": job_id,
+            "score": screening["score"],
+            "category": self._categorize(screening["score"]),
+            "status": "queued"
+        }
+
+    def screen_submission(self, resume_file, resume_url, job_description, candidate_name, email):
+        digest, resume_path, resume_name = self._save_resume(resume_file, resume_url, candidate_name, email)
 
         try:
-            # Parse resume
-            resume_text = extract_text(resume_path)
+            # Parse resume (cached by file digest)
+            resume_text = self.store.get_text(digest, resume_path)
 
             # Compute match score
-            score, analysis = compute_match_score(resume_text, job_description)
+            resume_embedding = self._embed([digest], [resume_text])[0]
+            score = score_embeddings([resume_embedding], job_description)[0]
 
-            # Categorize and notify
-            category = self._categorize_and_notify(score, email, candidate_name, resume_path)
+            # Structured skills for must-have filtering (one linear pass over the text)
+            skills = get_skill_matcher().extract(resume_text)
+        except Exception as e:
+            print(f"Error in ResumeService: {e}")
+            raise e
+
+        return {
+            "digest": digest,
+            "resume_path": resume_path,
+            "resume_name": resume_name,
+            "resume_text": resume_text,
+            "score": score,
+            "skills": skills,
+            "resume_embedding": resume_embedding
+        }
+
+    def complete_submission(self, screening, job_description, candidate_name, email):
+        """
+        Run the post-score stages as a DAG so independent I/O overlaps:
+        the LLM analysis, candidate emails and the raw DB write start together; the
+        analysis is attached to the stored record once both finish. Resumes outside the
+        analysis band skip the LLM and are stored as "skipped".
+        Only a failed DB write fails the submission. By the time the analysis or the
+        index could fail, the resume is stored and the candidate emailed, and a retry
+        would duplicate both, so those failures are logged and the resume is marked
+        "failed" for POST /resumes/<id>/analysis to redo.
+        """
+        resume_path = screening["resume_path"]
+        resume_name = screening.get("resume_name")
+        resume_text = screening["resume_text"]
+        score = screening["score"]
+        skills = screening.get("skills", [])
+        category = self._categorize(score)
+        analyze, _ = self.gate.decide(score, resume_text, job_description)
 
-            # Store in Database
-            inserted_id = store_resume(candidate_name, email, resume_text, job_description, score, category, analysis)
+        def run_analysis():
+            try:
+                return analyze_match(resume_text, job_description)
+            except Exception as e:
+                print(f"Error analyzing resume for {candidate_name}: {e}")
+                return None
 
-            # Trigger business logic (Recruitment Flow) if it's a match
-            if score > 70:
-                self._trigger_recruitment_flow(email, candidate_name, score)
+        def store_raw():
+            return store_resume(candidate_name, email, resume_text, job_description, score, category, None,
+                                "pending" if analyze else "skipped", skills, screening.get("digest"))
 
-            # Send acknowledgment
-            send_acknowledgment_email(email, candidate_name)
+        def index_resume(inserted_id):
+            if not inserted_id:
+                return
+            try:
+                get_candidate_index().add(inserted_id, screening["resume_embedding"].centroid())
+            except Exception as e:
+                print(f"Error indexing resume {inserted_id}: {e}")
 
-            return {
+        def save_analysis(inserted_id, analysis):
+            if not inserted_id:
+                return
+            if analysis is None:
+                update_resume(inserted_id, {"analysis_status": "failed"})
+            else:
+                update_resume(inserted_id, {"analysis": analysis, "analysis_status": "done"})
+
+        pipeline = Pipeline()
+        if analyze:
+            pipeline.add("analysis", run_analysis)
+        pipeline.add("store", store_raw)
+        pipeline.add("index", index_resume, deps=["store"])
+        if analyze:
+            pipeline.add("save_analysis", save_analysis, deps=["store", "analysis"])
+        # Acknowledge first so the candidate never gets the decision before the receipt
+        pipeline.add("acknowledgment", lambda: send_acknowledgment_email(email, candidate_name))
+        pipeline.add("notify", lambda _: self._categorize_and_notify(score, email, candidate_name, resume_path, resume_name),
+                     deps=["acknowledgment"])
+        # Trigger business logic (Recruitment Flow) if it's a match
+        if score > Config.MATCH_THRESHOLD:
+            pipeline.add("recruitment_flow", lambda: self._trigger_recruitment_flow(email, candidate_name, score))
+
+        outcome = pipeline.run()
+        if "store" in outcome.errors:
+            error = outcome.errors["store"]
+            print(f"Error in ResumeService: {error}")
+            raise PipelineError("store", error) from error
+        for stage, error in outcome.errors.items():
+            print(f"Error in ResumeService ({stage}): {error}")
+
+        analysis = outcome.results.get("analysis")
+        if analysis is not None:
+            analysis_status = "done"
+        else:
+            analysis_status = "failed" if analyze else "skipped"
+        return {
+            "id": outcome.results["store"],
+            "score": score,
+            "category": category,
+            "skills": skills,
+            "missing_skills": sorted(set(get_skill_matcher().extract(job_description)) - set(skills)),
+            "analysis": analysis,
+            "analysis_status": analysis_status,
+            "timings_ms": outcome.timings,
+            "status": "success"
+        }
+
+    def analyze_stored_resume(self, resume_id):
+        """
+        On-demand LLM analysis for a stored resume (e.g. one the pre-filter skipped).
+        Returns None if the resume does not exist; analysis is None if Gemini is unavailable.
+        Raises DatabaseUnavailableError if the resume could not be looked up.
+        """
+        document = get_resume(resume_id, ("text", "job_description", "analysis"))
+        if document is None:
+            return None
+        analysis = document.get("analysis")
+        if analysis is None:
+            analysis = analyze_match(document.get("text", ""), document.get("job_description", ""))
+            if analysis is not None:
+                update_resume(resume_id, {"analysis": analysis, "analysis_status": "done"})
+        return {
+            "id": resume_id,
+            "analysis": analysis,
+            "analysis_status": "done" if analysis is not None else "pending"
+        }
+
+    def process_batch(self, candidates, job_description, store=True):
+        """
+        Screen many resumes against one job description.
+        `candidates` is a list of dicts with `resume_file` or `resume_url`, plus `name` and `email`.
+        Resumes are parsed one by one (or served from the content store), then the
+        uncached ones are encoded together in a single batched call;
+        no LLM analysis or candidate emails are sent, so bulk re-screening stays cheap.
+        """
+        results = [None] * len(candidates)
+        texts, digests, parsed = [], [], []
+
+        # Download every linked resume concurrently before parsing
+        urls = [c["resume_url"] for c in candidates if not c.get("resume_file") and c.get("resume_url")]
+        downloads = get_resume_fetcher().prefetch(urls, self.store) if urls else {}
+
+        for i, candidate in enumerate(candidates):
+            name = candidate.get("name") or "Candidate"
+            email = candidate.get("email") or ""
+            try:
+                download = downloads.get(candidate.get("resume_url")) if not candidate.get("resume_file") else None
+                if isinstance(download, Exception):
+                    raise ValueError(f"Failed to download resume from URL provided: {download}")
+                if download:
+                    digest, resume_path = download
+                else:
+                    digest, resume_path, _ = self._save_resume(candidate.get("resume_file"), candidate.get("resume_url"), name, email)
+                texts.append(self.store.get_text(digest, resume_path))
+                digests.append(digest)
+                parsed.append((i, name, email))
+            except Exception as e:
+                print(f"Error parsing batch resume for {name}: {e}")
+                results[i] = {"name": name, "email": email, "status": "error", "error": str(e)}
+
+        embeddings = self._embed(digests, texts)
+        scores = score_embeddings(embeddings, job_description)
+        documents, vectors = [], []
+
+        matcher = get_skill_matcher()
+        for (i, name, email), resume_text, digest, score, embedding in zip(parsed, texts, digests, scores, embeddings):
+            category = self._categorize(score)
+            skills = matcher.extract(resume_text)
+            inserted_id = None
+            if store:
+                document = build_resume_document(name, email, resume_text, job_description, score, category, None,
+                                                 skills=skills, digest=digest)
+                documents.append(document)
+                vectors.append(embedding.centroid())
+                inserted_id = str(document["_id"])
+            results[i] = {
                 "id": inserted_id,
+                "name": name,
+                "email": email,
                 "score": score,
                 "category": category,
-                "analysis": analysis,
+                "skills": skills,
                 "status": "success"
             }
 
-        except Exception as e:
-            print(f"Error in ResumeService: {e}")
-            raise e
+        if documents:
+            # One insert_many for the whole batch, then index only what was written
+            written = set(store_resumes(documents))
+            indexed = [(str(doc["_id"]), vector) for doc, vector in zip(documents, vectors) if str(doc["_id"]) in written]
+            for result in results:
+                if result.get("id") and result["id"] not in written:
+                    result["id"] = None
+            if indexed:
+                get_candidate_index().add_many([rid for rid, _ in indexed], [vector for _, vector in indexed])
+        return results
 
     def _trigger_recruitment_flow(self, email, name, score):
         """
@@ -100,17 +302,24 @@ class ResumeService:
         except Exception as e:
             print(f"[AI Agent] Failed to trigger recruitment flow: {e}")
 
-    def _categorize_and_notify(self, score, email, candidate_name, resume_path):
-        if score > 70:
-            category = "Match"
-            send_congratulatory_email(email, candidate_name, resume_path)
-        elif score > 50:
-            category = "Partial Match"
+    @staticmethod
+    def _categorize(score):
+        if score > Config.MATCH_THRESHOLD:
+            return "Match"
+        elif score > Config.PARTIAL_MATCH_THRESHOLD:
+            return "Partial Match"
+        elif score > Config.SKILLS_GAP_THRESHOLD:
+            return "Skills Gap"
+        return "Irrelevant"
+
+    def _categorize_and_notify(self, score, email, candidate_name, resume_path, resume_name=None):
+        category = self._categorize(score)
+        if category == "Match":
+            send_congratulatory_email(email, candidate_name, resume_path, resume_name)
+        elif category == "Partial Match":
             send_rejection_email(email, candidate_name, "insufficient match with job requirements")
-        elif score > 30:
-            category = "Skills Gap"
+        elif category == "Skills Gap":
             send_rejection_email(email, candidate_name, "missing key skills")
         else:
-            category = "Irrelevant"
             send_rejection_email(email, candidate_name, "no relevant qualifications")
         return category
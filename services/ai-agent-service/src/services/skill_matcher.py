@@ -0,0 +1,131 @@
+import json
+import re
+import threading
+from collections import deque
+from config.config import Config
+from services.skill_taxonomy import SKILL_TAXONOMY
+
+# Tokens keep the punctuation that is part of skill names: c++, c#, .net, node.js, ci/cd, t-sql
+_TOKEN_RE = re.compile(r"\.?[a-z0-9+#](?:[a-z0-9+#./\-]*[a-z0-9+#])?")
+_SPLIT_RE = re.compile(r"[./\-]+")
+# List and sentence punctuation ends a phrase, so "spring, boot" is not "spring boot"
+_BREAK_RE = re.compile(r"[,;:()|\u2022\n]|\.(?:\s|$)")
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over word tokens, compiled from a skills dictionary.
+    `extract` finds every alias in one linear pass over the text, however many
+    skills the dictionary holds, and returns the canonical skill names. Matching on
+    whole tokens means "java" does not fire inside "javascript".
+    """
+
+    def __init__(self, taxonomy):
+        self.categories = {}
+        aliases = []
+        for category, skills in taxonomy.items():
+            for skill, names in skills.items():
+                self.categories[skill] = category
+                aliases.extend((name.lower(), skill) for name in names)
+
+        # Tokens that appear in some alias are kept whole; anything else like
+        # "python/django" is split on . / - before matching
+        self._vocab = {token for name, _ in aliases for token in _TOKEN_RE.findall(name)}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for name, skill in aliases:
+            self._add(_TOKEN_RE.findall(name), skill)
+        self._link()
+
+    def _add(self, tokens, skill):
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = nxt
+        self._out[state].add(skill)
+
+    def _link(self):
+        # Breadth-first so every state's failure target is final before its children use it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] |= self._out[self._fail[child]]
+
+    def _tokens(self, text):
+        # None marks a phrase break
+        for phrase in _BREAK_RE.split((text or "").lower()):
+            for token in _TOKEN_RE.findall(phrase):
+                if token in self._vocab:
+                    yield token
+                else:
+                    yield from (part for part in _SPLIT_RE.split(token) if part)
+            yield None
+
+    def extract(self, text):
+        """Sorted canonical skills mentioned in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state, found = 0, set()
+        for token in self._tokens(text):
+            if token is None:
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                found |= out[state]
+        return sorted(found)
+
+    def by_category(self, skills):
+        grouped = {}
+        for skill in skills:
+            grouped.setdefault(self.categories.get(skill, "other"), []).append(skill)
+        return grouped
+
+
+def normalize_skills(names, matcher=None):
+    """Map user-supplied skill names ("Node", "k8s") to canonical skills; unknown names pass through lowercased."""
+    matcher = matcher or get_skill_matcher()
+    canonical = []
+    for name in names:
+        found = matcher.extract(name)
+        for skill in found or [name.strip().lower()]:
+            if skill and skill not in canonical:
+                canonical.append(skill)
+    return canonical
+
+
+def _load_taxonomy():
+    taxonomy = {category: dict(skills) for category, skills in SKILL_TAXONOMY.items()}
+    if Config.SKILLS_TAXONOMY_FILE:
+        with open(Config.SKILLS_TAXONOMY_FILE, encoding="utf-8") as f:
+            for category, skills in json.load(f).items():
+                taxonomy.setdefault(category, {}).update(skills)
+    return taxonomy
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(_load_taxonomy())
+    return _matcher
@@ -0,0 +1,113 @@
+# Skills dictionary: category -> canonical skill -> aliases (matched as whole words,
+# case-insensitively). Override or extend it with SKILLS_TAXONOMY_FILE (same shape, JSON).
+SKILL_TAXONOMY = {
+    "languages": {
+        "python": ["python", "python3"],
+        "java": ["java"],
+        "javascript": ["javascript", "js", "ecmascript"],
+        "typescript": ["typescript", "ts"],
+        "c": ["c language", "ansi c"],
+        "c++": ["c++", "cpp"],
+        "c#": ["c#", "csharp", "c sharp"],
+        "go": ["golang", "go lang"],
+        "rust": ["rust"],
+        "kotlin": ["kotlin"],
+        "swift": ["swift"],
+        "php": ["php"],
+        "ruby": ["ruby"],
+        "scala": ["scala"],
+        "r": ["r programming", "r language", "rstudio"],
+        "sql": ["sql", "t-sql", "pl/sql", "plsql"],
+        "bash": ["bash", "shell scripting", "shell script"],
+        "matlab": ["matlab"],
+    },
+    "web": {
+        "react": ["react", "react.js", "reactjs"],
+        "angular": ["angular", "angularjs"],
+        "vue": ["vue", "vue.js", "vuejs"],
+        "node.js": ["node.js", "nodejs", "node"],
+        "express": ["express", "express.js", "expressjs"],
+        "django": ["django"],
+        "flask": ["flask"],
+        "fastapi": ["fastapi"],
+        "spring boot": ["spring boot", "springboot"],
+        "spring": ["spring framework", "spring mvc"],
+        ".net": [".net", "dotnet", "asp.net"],
+        "html": ["html", "html5"],
+        "css": ["css", "css3", "sass", "scss"],
+        "graphql": ["graphql"],
+        "rest api": ["restful", "rest api", "restful api", "rest apis"],
+    },
+    "data": {
+        "mongodb": ["mongodb", "mongo"],
+        "postgresql": ["postgresql", "postgres"],
+        "mysql": ["mysql"],
+        "redis": ["redis"],
+        "elasticsearch": ["elasticsearch", "elastic search"],
+        "kafka": ["kafka", "apache kafka"],
+        "spark": ["spark", "apache spark", "pyspark"],
+        "hadoop": ["hadoop"],
+        "airflow": ["airflow", "apache airflow"],
+        "pandas": ["pandas"],
+        "numpy": ["numpy"],
+        "excel": ["excel", "ms excel", "microsoft excel"],
+        "power bi": ["power bi", "powerbi"],
+        "tableau": ["tableau"],
+        "etl": ["etl", "data pipelines", "data pipeline"],
+        "data analysis": ["data analysis", "data analytics"],
+    },
+    "ml": {
+        "machine learning": ["machine learning", "ml"],
+        "deep learning": ["deep learning"],
+        "nlp": ["nlp", "natural language processing"],
+        "computer vision": ["computer vision"],
+        "tensorflow": ["tensorflow"],
+        "pytorch": ["pytorch", "torch"],
+        "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+        "llm": ["llm", "llms", "large language models", "large language model"],
+        "langchain": ["langchain"],
+        "statistics": ["statistics", "statistical analysis"],
+    },
+    "cloud_devops": {
+        "aws": ["aws", "amazon web services"],
+        "azure": ["azure", "microsoft azure"],
+        "gcp": ["gcp", "google cloud", "google cloud platform"],
+        "docker": ["docker", "containerization"],
+        "kubernetes": ["kubernetes", "k8s"],
+        "terraform": ["terraform"],
+        "ansible": ["ansible"],
+        "ci/cd": ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+        "jenkins": ["jenkins"],
+        "github actions": ["github actions"],
+        "git": ["git", "github", "gitlab", "bitbucket"],
+        "linux": ["linux", "unix", "ubuntu"],
+        "microservices": ["microservices", "microservice", "micro-services"],
+    },
+    "hr_business": {
+        "recruitment": ["recruitment", "recruiting", "talent acquisition"],
+        "payroll": ["payroll"],
+        "onboarding": ["onboarding"],
+        "performance management": ["performance management", "performance reviews"],
+        "employee relations": ["employee relations"],
+        "project management": ["project management"],
+        "agile": ["agile", "scrum", "kanban"],
+        "stakeholder management": ["stakeholder management"],
+        "accounting": ["accounting", "bookkeeping"],
+        "sales": ["sales", "business development"],
+        "customer service": ["customer service", "customer support"],
+        "marketing": ["marketing", "digital marketing", "seo"],
+    },
+    "healthcare": {
+        "patient care": ["patient care"],
+        "nursing": ["nursing", "registered nurse", "rn"],
+        "icu": ["icu", "intensive care"],
+        "bls": ["bls", "basic life support"],
+        "acls": ["acls", "advanced cardiac life support"],
+    },
+    "soft": {
+        "communication": ["communication", "communication skills"],
+        "leadership": ["leadership", "team lead", "team leadership"],
+        "problem solving": ["problem solving", "problem-solving"],
+        "teamwork": ["teamwork", "collaboration"],
+    },
+}
@@ -0,0 +1,116 @@
+import atexit
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config.config import Config
+
+
+class QueueFullError(Exception):
+    """Raised when the background queue already holds ANALYSIS_QUEUE_SIZE jobs."""
+
+
+class TaskQueue:
+    """
+    Bounded in-process job queue backed by a thread pool.
+    Each job gets an id whose status (queued/running/done/failed) and result can be
+    polled until JOB_RESULT_TTL_SECONDS after it finishes. The executor is created
+    lazily so the queue can be constructed before a server forks its workers.
+    """
+
+    def __init__(self, workers=None, max_pending=None, result_ttl=None):
+        self.workers = workers or Config.ANALYSIS_WORKERS
+        self.max_pending = max_pending or Config.ANALYSIS_QUEUE_SIZE
+        self.result_ttl = result_ttl or Config.JOB_RESULT_TTL_SECONDS
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._closed = False
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        return self._executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) and return its job id."""
+        if self._closed:
+            raise QueueFullError("Queue is shutting down")
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"Analysis queue is full ({self.max_pending} pending jobs)")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            self._jobs[job_id] = {"job_id": job_id, "status": "queued", "created_at": now, "updated_at": now}
+            executor = self._get_executor()
+
+        try:
+            executor.submit(self._run, job_id, fn, args, kwargs)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            raise
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._update(job_id, status="running")
+        try:
+            result = fn(*args, **kwargs)
+            self._update(job_id, status="done", result=result)
+        except Exception as e:
+            print(f"[TaskQueue] Job {job_id} failed: {e}")
+            traceback.print_exc()
+            self._update(job_id, status="failed", error=str(e))
+        finally:
+            self._slots.release()
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updated_at=time.time())
+
+    def _prune(self, now):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in ("done", "failed") and now - job["updated_at"] > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.workers, "max_pending": self.max_pending, "jobs": counts}
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and (by default) drain everything already queued."""
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_task_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = TaskQueue()
+                atexit.register(_queue.shutdown)
+    return _queue
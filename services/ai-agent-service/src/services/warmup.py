@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class WarmUp:
+    """
+    Runs the slow startup work (model load, heavy imports, index load) in a
+    background thread so the server can bind and answer liveness checks at once.
+    The service reports ready once every step has finished successfully.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.started_at = None
+        self.finished_at = None
+        self._status = {name: {"status": "pending"} for name, _ in self.steps}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="warm-up", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for name, fn in self.steps:
+            self._set(name, status="running")
+            start = time.perf_counter()
+            try:
+                fn()
+                self._set(name, status="done", seconds=round(time.perf_counter() - start, 3))
+            except Exception as e:
+                print(f"[WarmUp] {name} failed: {e}")
+                self._set(name, status="failed", seconds=round(time.perf_counter() - start, 3), error=str(e))
+        self.finished_at = time.time()
+        if self.steps:
+            print(f"[WarmUp] Finished in {self.finished_at - self.started_at:.2f}s; ready={self.ready}")
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._status[name] = fields
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self):
+        with self._lock:
+            return all(step["status"] == "done" for step in self._status.values())
+
+    def status(self):
+        with self._lock:
+            steps = {name: dict(step) for name, step in self._status.items()}
+        return {
+            "ready": all(step["status"] == "done" for step in steps.values()),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": steps,
+        }
+
+
+def default_steps():
+    """Everything the first request would otherwise pay for, slowest first."""
+    from services import model_registry, resume_parser, rag_pipeline
+    from services.candidate_index import get_candidate_index
+
+    return [
+        ("embedding_model", model_registry.warm_up),
+        ("parsers", resume_parser.preload),
+        ("llm", rag_pipeline.get_match_chain),
+        ("candidate_index", get_candidate_index),
+    ]
@@ -1,38 +1,341 @@
-import pymongo
 import os
+import datetime
+import hashlib
+import threading
+from bson import ObjectId
 from dotenv import load_dotenv
+from services.metrics import span, upstream_error
 
 load_dotenv()
 
+class DatabaseUnavailableError(Exception):
+    """A read failed, so the caller cannot tell whether the record exists."""
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Process-wide MongoClient; pymongo pools connections internally and is thread-safe."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import pymongo  # deferred so importing the service stays fast
+                uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
+                _client = pymongo.MongoClient(
+                    uri,
+                    maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+                    minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+                    serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+                )
+    return _client
+
+def reset_client():
+    """Drop the shared client, e.g. in a freshly forked worker (MongoClient is not fork-safe)."""
+    global _client
+    with _client_lock:
+        _client = None
+
 def get_db_connection():
-    uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
-    client = pymongo.MongoClient(uri)
     db_name = os.getenv("MONGODB_DB_NAME", "resume_scanner")
-    return client[db_name]
+    return get_client()[db_name]
 
-def store_resume(name, email, text, job_description, score, category, analysis):
-    db = get_db_connection()
-    collection = db["resumes"]
-    
-    resume_data = {
+def job_hash(job_description):
+    """Stable key for a job description, so resumes can be indexed and queried by job."""
+    return hashlib.sha256(" ".join((job_description or "").split()).encode("utf-8")).hexdigest()
+
+def job_query(job_description):
+    """
+    Filter for the resumes screened against `job_description`. Documents stored before
+    job_hash existed only carry the description itself, so those are matched on it.
+    """
+    return {"$or": [
+        {"job_hash": job_hash(job_description)},
+        {"job_hash": {"$exists": False},
+         "job_description": {"$in": list(dict.fromkeys([job_description, (job_description or "").strip()]))}},
+    ]}
+
+def ensure_indexes():
+    """Create the indexes used by lookups, per-job ranking and the rescoring tools."""
+    import pymongo
+    try:
+        collection = get_db_connection()["resumes"]
+        collection.create_index([("email", pymongo.ASCENDING)])
+        collection.create_index([("job_hash", pymongo.ASCENDING), ("score", pymongo.DESCENDING)])
+        collection.create_index([("score", pymongo.DESCENDING)])
+        collection.create_index([("timestamp", pymongo.DESCENDING)])
+        # Multikey index: {"skills": {"$all": [...]}} filters without scanning the pool
+        collection.create_index([("skills", pymongo.ASCENDING), ("score", pymongo.DESCENDING)])
+        print("Resume indexes ensured")
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error creating indexes: {e}")
+
+def build_resume_document(name, email, text, job_description, score, category, analysis, analysis_status=None, skills=None,
+                          digest=None):
+    # analysis_status: "done", "pending" (LLM running), "failed" (Gemini unavailable or errored),
+    # "skipped" (not worth an LLM call) or, once re-scored for an edited job, "stale"
+    if analysis_status is None:
+        analysis_status = "skipped" if analysis is None else "done"
+    return {
+        "_id": ObjectId(),
         "name": name,
         "email": email,
         "text": text,
         "job_description": job_description,
+        "job_hash": job_hash(job_description),
         "score": score,
         "category": category,
         "analysis": analysis,
-        "timestamp": os.getenv("TIMESTAMP") # You might want to use datetime.datetime.now() usually, but simpler for now
+        "analysis_status": analysis_status,
+        # Canonical skill names from the skills matcher, for must-have filtering
+        "skills": list(skills or []),
+        # sha256 of the uploaded file, which keys its cached parsed text and chunk vectors
+        "digest": digest,
+        "timestamp": datetime.datetime.utcnow()
     }
-    
-    # Add timestamp properly
-    import datetime
-    resume_data["timestamp"] = datetime.datetime.utcnow()
-    
+
+class BulkResumeWriter:
+    """
+    Buffers resume documents and writes them with insert_many once `batch_size`
+    documents are pending or `interval` seconds have passed, whichever comes first.
+    Ids are assigned client-side so callers get them before the flush.
+    Documents whose insert fails are requeued for the next flush, up to
+    `max_attempts` writes, then dropped and counted; `on_drop(resume_id)` then lets
+    callers forget the id they were handed (e.g. remove it from the candidate index).
+    """
+
+    def __init__(self, batch_size=None, interval=None, max_attempts=None, on_drop=None):
+        self.batch_size = batch_size or int(os.getenv("MONGODB_BULK_SIZE", "100"))
+        self.interval = interval or float(os.getenv("MONGODB_BULK_INTERVAL", "2"))
+        self.max_attempts = max_attempts or int(os.getenv("MONGODB_BULK_MAX_ATTEMPTS", "3"))
+        self.on_drop = on_drop
+        self._buffer = []
+        # id -> fields updated while that document's insert_many was running
+        self._in_flight = {}
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self.written = 0
+        self.dropped = 0
+
+    def _schedule_flush(self):
+        # Caller holds the lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def add(self, document):
+        with self._lock:
+            self._buffer.append(document)
+            full = len(self._buffer) >= self.batch_size
+            if not full:
+                self._schedule_flush()
+        if full:
+            self.flush()
+        return str(document["_id"])
+
+    def flush(self):
+        with self._lock:
+            documents, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for document in documents:
+                self._in_flight[str(document["_id"])] = {}
+        if not documents:
+            return
+
+        written = set(store_resumes(documents))
+
+        late_updates = {}
+        dropped = []
+        with self._lock:
+            failed = []
+            for document in documents:
+                resume_id = str(document["_id"])
+                fields = self._in_flight.pop(resume_id, {})
+                if resume_id in written:
+                    self._attempts.pop(resume_id, None)
+                    if fields:
+                        late_updates[resume_id] = fields
+                    continue
+                document.update(fields)
+                attempts = self._attempts.get(resume_id, 0) + 1
+                if attempts < self.max_attempts:
+                    self._attempts[resume_id] = attempts
+                    failed.append(document)
+                else:
+                    self._attempts.pop(resume_id, None)
+                    self.dropped += 1
+                    dropped.append(resume_id)
+                    print(f"Dropping resume {resume_id} after {attempts} failed writes")
+            self.written += len(written)
+            if failed:
+                self._buffer[:0] = failed
+                self._schedule_flush()
+
+        # Updates that arrived while the insert was running were not in the written document
+        for resume_id, fields in late_updates.items():
+            _update_stored_resume(resume_id, fields)
+        if self.on_drop is not None:
+            for resume_id in dropped:
+                try:
+                    self.on_drop(resume_id)
+                except Exception as e:
+                    print(f"Error forgetting dropped resume {resume_id}: {e}")
+
+    def update_pending(self, resume_id, fields):
+        """Apply `fields` to a document that has not been written yet; returns True if found."""
+        with self._lock:
+            for document in self._buffer:
+                if str(document["_id"]) == resume_id:
+                    document.update(fields)
+                    return True
+            if resume_id in self._in_flight:
+                self._in_flight[resume_id].update(fields)
+                return True
+        return False
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer) + len(self._in_flight)
+
+    def stats(self):
+        return {"pending": self.pending(), "written": self.written, "dropped": self.dropped}
+
+def _unindex_resume(resume_id):
+    # The submission indexed the id as soon as it was handed out; a dropped write leaves nothing behind it
+    from services.candidate_index import get_candidate_index
+    get_candidate_index().remove(resume_id)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_bulk_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                import atexit
+                _writer = BulkResumeWriter(on_drop=_unindex_resume)
+                atexit.register(_writer.flush)
+    return _writer
+
+def store_resume(name, email, text, job_description, score, category, analysis, analysis_status=None, skills=None,
+                 digest=None):
+    resume_data = build_resume_document(name, email, text, job_description, score, category, analysis, analysis_status,
+                                        skills, digest)
+
+    if os.getenv("MONGODB_BUFFERED_WRITES", "false").lower() == "true":
+        return get_bulk_writer().add(resume_data)
+
+    db = get_db_connection()
+    collection = db["resumes"]
     try:
-        result = collection.insert_one(resume_data)
+        with span("db"):
+            result = collection.insert_one(resume_data)
         print(f"Resume stored with ID: {result.inserted_id}")
         return str(result.inserted_id)
     except Exception as e:
+        upstream_error("mongodb")
         print(f"Error storing resume: {e}")
         return None
+
+def store_resumes(documents):
+    """Insert many prepared documents in one round-trip; returns the ids that were written."""
+    if not documents:
+        return []
+    from pymongo.errors import BulkWriteError
+    collection = get_db_connection()["resumes"]
+    try:
+        with span("db"):
+            result = collection.insert_many(documents, ordered=False)
+        print(f"Stored {len(result.inserted_ids)} resumes")
+        return [str(i) for i in result.inserted_ids]
+    except BulkWriteError as e:
+        upstream_error("mongodb")
+        failed = {err["index"] for err in e.details.get("writeErrors", [])}
+        print(f"Error storing {len(failed)} of {len(documents)} resumes: {e}")
+        return [str(doc["_id"]) for i, doc in enumerate(documents) if i not in failed]
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error storing resumes: {e}")
+        return []
+
+def update_resume(resume_id, fields):
+    if _writer is not None and _writer.update_pending(resume_id, fields):
+        return True
+    return _update_stored_resume(resume_id, fields)
+
+def _update_stored_resume(resume_id, fields):
+    if not ObjectId.is_valid(resume_id):
+        return False
+    db = get_db_connection()
+    try:
+        with span("db"):
+            return db["resumes"].update_one({"_id": ObjectId(resume_id)}, {"$set": fields}).matched_count > 0
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error updating resume: {e}")
+        return False
+
+def get_resumes_by_ids(resume_ids, fields=("name", "email", "score", "category")):
+    """Fetch a subset of fields for the given resume ids, keyed by id string."""
+    db = get_db_connection()
+    object_ids = [ObjectId(rid) for rid in resume_ids if ObjectId.is_valid(rid)]
+    projection = {field: 1 for field in fields}
+    try:
+        return {str(doc.pop("_id")): doc for doc in db["resumes"].find({"_id": {"$in": object_ids}}, projection)}
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error fetching resumes: {e}")
+        return {}
+
+def get_resume(resume_id, fields=("name", "email", "score", "category")):
+    """
+    One resume's fields, or None if there is no such resume. Raises
+    DatabaseUnavailableError when the lookup itself fails.
+    """
+    if not ObjectId.is_valid(resume_id):
+        return None
+    db = get_db_connection()
+    try:
+        with span("db"):
+            document = db["resumes"].find_one({"_id": ObjectId(resume_id)}, {field: 1 for field in fields})
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error fetching resume {resume_id}: {e}")
+        raise DatabaseUnavailableError(str(e)) from e
+    if document is not None:
+        document.pop("_id")
+    return document
+
+def find_resumes_with_skills(skills, job_description=None, limit=50, fields=("name", "email", "score", "category", "skills")):
+    """Resumes that list every skill in `skills` (optionally for one job), best score first."""
+    query = {"skills": {"$all": list(skills)}}
+    if job_description:
+        query["job_hash"] = job_hash(job_description)
+    projection = {field: 1 for field in fields}
+    db = get_db_connection()
+    try:
+        cursor = db["resumes"].find(query, projection).sort("score", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        return [{"id": str(doc.pop("_id")), **doc} for doc in cursor]
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error filtering resumes by skills: {e}")
+        return []
+
+def delete_resume(resume_id):
+    if not ObjectId.is_valid(resume_id):
+        return False
+    db = get_db_connection()
+    try:
+        return db["resumes"].delete_one({"_id": ObjectId(resume_id)}).deleted_count > 0
+    except Exception as e:
+        upstream_error("mongodb")
+        print(f"Error deleting resume: {e}")
+        return False
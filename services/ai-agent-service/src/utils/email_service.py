@@ -1,70 +1,248 @@
-import yagmail
 from dotenv import load_dotenv
+import atexit
+import io
 import os
+import queue
+import threading
+import time
+from services.metrics import span
 
 load_dotenv()
 
+_STOP = object()
+
+def _print_auth_help(error):
+    if "534" in str(error) or "Application-specific password required" in str(error):
+        print("\n❌ GMAIL AUTHENTICATION ERROR: You need to use an App Password due to 2FA.")
+        print("1. Go to https://myaccount.google.com/apppasswords")
+        print("2. Create a new app password for 'Mail'")
+        print("3. Update GMAIL_PASSWORD in your .env file with this 16-character code.\n")
+
+def _credentials():
+    return os.getenv("GMAIL_USER"), os.getenv("GMAIL_PASSWORD")
+
+def _skip_login():
+    return os.getenv("SMTP_SKIP_LOGIN", "false").lower() == "true"
+
+def _connect_smtp():
+    import yagmail  # only needed once the dispatcher actually connects
+    user, password = _credentials()
+    return yagmail.SMTP(
+        user or "hr@localhost",
+        password,
+        host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+        port=int(os.getenv("SMTP_PORT", "465")),
+        smtp_ssl=os.getenv("SMTP_SSL", "true").lower() == "true",
+        smtp_starttls=os.getenv("SMTP_STARTTLS", "false").lower() == "true",
+        smtp_skip_login=_skip_login(),
+    )
+
+def _attachment_files(attachments):
+    """
+    yagmail names a file attachment after its basename, and stored resumes are named
+    after their digest, so {display name: path} attachments are sent as named buffers.
+    """
+    if not isinstance(attachments, dict):
+        return attachments
+    files = []
+    for name, path in attachments.items():
+        with open(path, "rb") as f:
+            buffer = io.BytesIO(f.read())
+        buffer.name = name
+        files.append(buffer)
+    return files
+
+class EmailDispatcher:
+    """
+    Sends mail from a background thread over one reusable authenticated SMTP
+    connection. Sends are rate limited and retried (reconnecting on failure), and
+    HR forwards of shortlisted resumes are collected into periodic digest emails.
+    """
+
+    def __init__(self, connect=None, max_retries=None, rate_per_second=None,
+                 hr_batch_size=None, hr_batch_interval=None):
+        self.connect = connect or _connect_smtp
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("EMAIL_MAX_RETRIES", "3"))
+        rate = rate_per_second or float(os.getenv("EMAIL_RATE_PER_SECOND", "5"))
+        self.min_interval = 1.0 / rate
+        self.hr_batch_size = hr_batch_size or int(os.getenv("EMAIL_HR_BATCH_SIZE", "10"))
+        self.hr_batch_interval = hr_batch_interval or float(os.getenv("EMAIL_HR_BATCH_INTERVAL", "300"))
+
+        self._queue = queue.Queue()
+        self._hr_batch = []
+        self._hr_batch_started = None
+        self._smtp = None
+        self._last_send = 0.0
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+                    self._thread.start()
+
+    def enqueue(self, to, subject, contents, attachments=None):
+        self._ensure_worker()
+        self._queue.put({"to": to, "subject": subject, "contents": contents, "attachments": attachments})
+
+    def forward_to_hr(self, hr_email, candidate_name, resume_path, resume_name=None):
+        self._ensure_worker()
+        self._queue.put({"hr_forward": (hr_email, candidate_name, resume_path, resume_name)})
+
+    def _run(self):
+        while True:
+            try:
+                message = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._maybe_flush_hr()
+                continue
+            try:
+                if message is _STOP:
+                    self._flush_hr()
+                    return
+                if "hr_forward" in message:
+                    self._add_hr_forward(*message["hr_forward"])
+                else:
+                    self._send(message)
+                self._maybe_flush_hr()
+            finally:
+                self._queue.task_done()
+
+    def _add_hr_forward(self, hr_email, candidate_name, resume_path, resume_name=None):
+        if not self._hr_batch:
+            self._hr_batch_started = time.monotonic()
+        self._hr_batch.append((hr_email, candidate_name, resume_path, resume_name or os.path.basename(resume_path)))
+
+    def _maybe_flush_hr(self):
+        if not self._hr_batch:
+            return
+        if (len(self._hr_batch) >= self.hr_batch_size
+                or time.monotonic() - self._hr_batch_started >= self.hr_batch_interval):
+            self._flush_hr()
+
+    def _flush_hr(self):
+        batch, self._hr_batch = self._hr_batch, []
+        by_recipient = {}
+        for hr_email, candidate_name, resume_path, resume_name in batch:
+            by_recipient.setdefault(hr_email, []).append((candidate_name, resume_path, resume_name))
+        for hr_email, candidates in by_recipient.items():
+            names = [name for name, _, _ in candidates]
+            attachments = {}
+            for candidate_name, resume_path, resume_name in candidates:
+                # Two candidates may both have uploaded "resume.pdf"
+                if resume_name in attachments:
+                    resume_name = f"{candidate_name}_{resume_name}"
+                attachments[resume_name] = resume_path
+            body = "The following candidates have been shortlisted:\n\n" + "\n".join(f"- {name}" for name in names)
+            self._send({
+                "to": hr_email,
+                "subject": f"Shortlisted Resumes ({len(names)}): {', '.join(names)}",
+                "contents": body,
+                "attachments": attachments,
+            })
+
+    def _send(self, message):
+        for attempt in range(self.max_retries + 1):
+            # Simple rate limit so bursts don't trip the provider's throttling
+            wait = self._last_send + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                with span("email", upstream="smtp"):
+                    if self._smtp is None:
+                        self._smtp = self.connect()
+                    self._smtp.send(**{**message, "attachments": _attachment_files(message.get("attachments"))})
+                self._last_send = time.monotonic()
+                self.sent += 1
+                print(f"Email '{message['subject']}' sent to {message['to']}")
+                return True
+            except Exception as e:
+                self._last_send = time.monotonic()
+                print(f"Error sending email to {message['to']} (attempt {attempt + 1}): {e}")
+                _print_auth_help(e)
+                self._close()
+                if attempt < self.max_retries:
+                    self.retries += 1
+                    time.sleep(min(2 ** attempt, 30))
+        self.failed += 1
+        return False
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def stop(self, timeout=30):
+        """Drain queued mail (and pending HR forwards) and close the connection."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        self._close()
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "hr_pending": len(self._hr_batch),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def get_email_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = EmailDispatcher()
+                atexit.register(_dispatcher.stop)
+    return _dispatcher
+
+def _can_send(kind, recipient_email):
+    user, password = _credentials()
+    if not _skip_login() and (not user or not password):
+        print(f"Warning: Email credentials not set. Skipping {kind} email to {recipient_email}.")
+        return False
+    return True
+
 def send_acknowledgment_email(recipient_email, candidate_name):
-    user = os.getenv("GMAIL_USER")
-    password = os.getenv("GMAIL_PASSWORD")
-    
-    if not user or not password:
-        print(f"Warning: Email credentials not set. Skipping acknowledgment email to {recipient_email}.")
+    if not _can_send("acknowledgment", recipient_email):
         return
 
-    try:
-        yag = yagmail.SMTP(user, password)
-        subject = "Resume Submission Received"
-        body = f"Dear {candidate_name},\n\nThank you for submitting your resume. We will review it and get back to you soon.\n\nBest regards,\nHR Team"
-        yag.send(to=recipient_email, subject=subject, contents=body)
-        print(f"Acknowledgment email sent to {recipient_email}")
-    except Exception as e:
-        print(f"Error sending acknowledgment email: {e}")
-        if "534" in str(e) or "Application-specific password required" in str(e):
-            print("\n❌ GMAIL AUTHENTICATION ERROR: You need to use an App Password due to 2FA.")
-            print("1. Go to https://myaccount.google.com/apppasswords")
-            print("2. Create a new app password for 'Mail'")
-            print("3. Update GMAIL_PASSWORD in your .env file with this 16-character code.\n")
-
-def send_congratulatory_email(recipient_email, candidate_name, resume_path):
-    user = os.getenv("GMAIL_USER")
-    password = os.getenv("GMAIL_PASSWORD")
-
-    if not user or not password:
-        print(f"Warning: Email credentials not set. Skipping congratulatory email to {recipient_email}.")
+    subject = "Resume Submission Received"
+    body = f"Dear {candidate_name},\n\nThank you for submitting your resume. We will review it and get back to you soon.\n\nBest regards,\nHR Team"
+    get_email_dispatcher().enqueue(recipient_email, subject, body)
+
+def send_congratulatory_email(recipient_email, candidate_name, resume_path, resume_name=None):
+    if not _can_send("congratulatory", recipient_email):
         return
 
-    try:
-        yag = yagmail.SMTP(user, password)
-        subject = "Congratulations! Your Resume Has Been Shortlisted"
-        body = f"Dear {candidate_name},\n\nCongratulations! Your resume has been shortlisted for the next step. We have forwarded it to our HR team.\n\nBest regards,\nHR Team"
-        yag.send(to=recipient_email, subject=subject, contents=body, attachments=resume_path)
-        
-        # Forward to HR
-        hr_email = os.getenv("HR_EMAIL")
-        if hr_email:
-            yag.send(to=hr_email, subject=f"Shortlisted Resume: {candidate_name}", contents=body, attachments=resume_path)
-        print(f"Congratulatory email sent to {recipient_email}")
-    except Exception as e:
-        print(f"Error sending congratulatory email: {e}")
-        if "534" in str(e) or "Application-specific password required" in str(e):
-            print("\n❌ GMAIL AUTHENTICATION ERROR")
+    dispatcher = get_email_dispatcher()
+    subject = "Congratulations! Your Resume Has Been Shortlisted"
+    body = f"Dear {candidate_name},\n\nCongratulations! Your resume has been shortlisted for the next step. We have forwarded it to our HR team.\n\nBest regards,\nHR Team"
+    # Attach under the candidate's own file name rather than the stored digest name
+    resume_name = resume_name or os.path.basename(resume_path)
+    dispatcher.enqueue(recipient_email, subject, body, attachments={resume_name: resume_path})
 
-def send_rejection_email(recipient_email, candidate_name, reason):
-    user = os.getenv("GMAIL_USER")
-    password = os.getenv("GMAIL_PASSWORD")
+    # Forward to HR (batched into a digest)
+    hr_email = os.getenv("HR_EMAIL")
+    if hr_email:
+        dispatcher.forward_to_hr(hr_email, candidate_name, resume_path, resume_name)
 
-    if not user or not password:
-        print(f"Warning: Email credentials not set. Skipping rejection email to {recipient_email}.")
+def send_rejection_email(recipient_email, candidate_name, reason):
+    if not _can_send("rejection", recipient_email):
         return
 
-    try:
-        yag = yagmail.SMTP(user, password)
-        subject = "Resume Submission Update"
-        body = f"Dear {candidate_name},\n\nThank you for your application. Unfortunately, your resume did not meet the requirements for this role due to {reason}. We encourage you to apply for other positions that match your skills.\n\nBest regards,\nHR Team"
-        yag.send(to=recipient_email, subject=subject, contents=body)
-        print(f"Rejection email sent to {recipient_email}")
-    except Exception as e:
-        print(f"Error sending rejection email: {e}")
-        if "534" in str(e) or "Application-specific password required" in str(e):
-            print("\n❌ GMAIL AUTHENTICATION ERROR")
\ No newline at end of file
+    subject = "Resume Submission Update"
+    body = f"Dear {candidate_name},\n\nThank you for your application. Unfortunately, your resume did not meet the requirements for this role due to {reason}. We encourage you to apply for other positions that match your skills.\n\nBest regards,\nHR Team"
+    get_email_dispatcher().enqueue(recipient_email, subject, body)
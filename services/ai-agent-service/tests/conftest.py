@@ -0,0 +1,50 @@
+import atexit
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+# Mirror the container layout (PYTHONPATH=/app/src)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("WARM_MODELS_ON_STARTUP", "false")
+# Uploads, caches and indexes written through Config go to a scratch directory, not src/data
+_data_dir = tempfile.mkdtemp(prefix="ai-agent-tests-")
+atexit.register(shutil.rmtree, _data_dir, ignore_errors=True)
+os.environ.setdefault("DATA_DIR", _data_dir)
+os.environ.setdefault("UPLOAD_FOLDER", os.path.join(_data_dir, "uploads"))
+
+
+class FakeEmbeddingModel:
+    """Deterministic bag-of-words encoder with the SentenceTransformer.encode signature."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim
+                vectors[row, bucket] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+@pytest.fixture
+def fake_model():
+    from config.config import Config
+    from services import model_registry
+
+    model = FakeEmbeddingModel()
+    model_registry.clear()
+    model_registry.register_model(Config.EMBEDDING_MODEL, model)
+    yield model
+    model_registry.clear()
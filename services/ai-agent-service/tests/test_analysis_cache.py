@@ -0,0 +1,43 @@
+import time
+
+from services.analysis_cache import AnalysisCache, analysis_key
+
+
+def test_key_depends_on_every_component():
+    base = analysis_key("resume", "job", "1", "gemini-2.5-flash")
+    assert base == analysis_key("resume", "job", "1", "gemini-2.5-flash")
+    assert base != analysis_key("resume", "job", "2", "gemini-2.5-flash")
+    assert base != analysis_key("resume", "job", "1", "gemini-2.5-pro")
+    assert base != analysis_key("resum", "ejob", "1", "gemini-2.5-flash")
+
+
+def test_duplicate_analysis_is_computed_once(tmp_path):
+    cache = AnalysisCache(capacity=8, ttl_seconds=60, db_path=str(tmp_path / "cache.sqlite3"))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "strong match"
+
+    assert cache.get_or_compute("k", compute) == "strong match"
+    assert cache.get_or_compute("k", compute) == "strong match"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # A fresh process sees the SQLite tier
+    other = AnalysisCache(capacity=8, ttl_seconds=60, db_path=str(tmp_path / "cache.sqlite3"))
+    assert other.get("k") == "strong match"
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_expired_and_evicted_entries_miss():
+    cache = AnalysisCache(capacity=2, ttl_seconds=60, db_path="")
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("c", "3")
+    assert cache.get("a") is None
+
+    cache._memory["b"] = ("2", time.time() - 1)
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+from services import rag_pipeline, resume_service
+from services.candidate_index import CandidateIndex
+
+
+@pytest.fixture
+def client(fake_model, tmp_path, monkeypatch):
+    from config.config import Config
+    from services import content_store, job_embeddings
+
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path / "jobs"))
+    monkeypatch.setattr(Config, "PARSED_CACHE_DIR", tmp_path / "parsed")
+    monkeypatch.setattr(content_store, "extract_text", lambda path: open(path).read())
+    monkeypatch.setattr(resume_service, "store_resumes", lambda docs: [str(d["_id"]) for d in docs])
+    index = CandidateIndex(directory=tmp_path / "candidates", dim=fake_model.dim)
+    monkeypatch.setattr(resume_service, "get_candidate_index", lambda: index)
+
+    import server
+    monkeypatch.setattr(server, "resume_service", resume_service.ResumeService(str(tmp_path / "uploads")))
+    return server.app.test_client()
+
+
+def test_batch_scores_match_single_scoring(fake_model, tmp_path, monkeypatch):
+    from services import job_embeddings
+
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path))
+    job = "python flask developer"
+    resumes = ["python flask developer", "java spring", "python data analyst"]
+
+    batch = rag_pipeline.compute_match_scores(resumes, job)
+    single = [rag_pipeline.cosine_score(fake_model.encode([r])[0], fake_model.encode([job])[0]) for r in resumes]
+
+    assert batch == pytest.approx(single, abs=1e-4)
+    assert batch[0] == pytest.approx(100.0, abs=1e-3)
+
+
+def test_submit_batch_encodes_all_resumes_in_one_call(client, fake_model):
+    data = {
+        "job_description": "python flask developer",
+        "resumes": [
+            (io.BytesIO(b"python flask developer"), "a.txt"),
+            (io.BytesIO(b"java spring"), "b.txt"),
+        ],
+        "names": ["Ada", "Bob"],
+    }
+    response = client.post("/submit/batch", data=data, content_type="multipart/form-data")
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["name"] for r in results] == ["Ada", "Bob"]
+    assert results[0]["category"] == "Match"
+    resume_calls = [call for call in fake_model.calls if len(call) == 2]
+    assert len(resume_calls) == 1
+
+
+def test_submit_batch_requires_job_description(client):
+    response = client.post("/submit/batch", json={"candidates": [{"resume_url": "http://x"}]})
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(__file__), "..", "benchmarks")
+
+
+def _load_runner(name="run_benchmarks"):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BENCHMARKS, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_slower_stages_only():
+    runner = _load_runner()
+    baseline = {"stages": [
+        {"stage": "embed", "p95_ms": 10.0, "throughput_per_s": 100.0},
+        {"stage": "submit", "p95_ms": 50.0, "throughput_per_s": 20.0},
+    ]}
+    results = [
+        {"stage": "embed", "p95_ms": 11.0, "throughput_per_s": 95.0},
+        {"stage": "submit", "p95_ms": 80.0, "throughput_per_s": 12.0},
+        {"stage": "similarity", "p95_ms": 1.0, "throughput_per_s": 1.0},
+    ]
+
+    regressions = runner.compare(results, baseline, tolerance=0.25)
+
+    assert regressions == ["submit: p95 50.0 ms -> 80.0 ms", "submit: throughput 20.0/s -> 12.0/s"]
+
+
+def test_calibrated_thresholds_keep_the_old_category_shares():
+    calibrate = _load_runner("calibrate_thresholds")
+    old_scores = [10, 20, 35, 40, 55, 60, 65, 75, 80, 90]
+    # Same ranking, shifted up by the chunked score
+    new_scores = [score + 12 for score in old_scores]
+
+    thresholds = calibrate.matched_thresholds(old_scores, new_scores, (70, 50, 30))
+
+    assert calibrate.category_shares(new_scores, thresholds) == calibrate.category_shares(old_scores, (70, 50, 30))
+    assert calibrate.category_shares(old_scores, (70, 50, 30)) == [0.3, 0.3, 0.2, 0.2]
+
+
+def test_benchmark_smoke_run(tmp_path):
+    # Tiny run with the hashing encoder: keeps the suite runnable without the model download
+    report_path = tmp_path / "report.json"
+    result = subprocess.run(
+        [sys.executable, os.path.join(BENCHMARKS, "run_benchmarks.py"), "--fake-model", "-n", "2",
+         "--concurrency", "2", "--pool-size", "10", "--json", str(report_path)],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(report_path.read_text())
+    stages = {stage["stage"]: stage for stage in report["stages"]}
+    assert {"extract_pdf", "extract_docx", "embed", "similarity", "process_submission", "submit"} <= set(stages)
+    for stage in stages.values():
+        assert stage["calls"] >= 1
+        assert stage["p50_ms"] <= stage["p95_ms"] <= stage["p99_ms"]
+    assert report["max_rss_mb"] > 0
@@ -0,0 +1,81 @@
+import numpy as np
+
+from services.candidate_index import CandidateIndex
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def test_search_add_remove_and_persist(tmp_path):
+    vectors = _vectors(5)
+    index = CandidateIndex(directory=tmp_path, dim=16, save_every=1)
+    index.add_many([f"r{i}" for i in range(5)], vectors)
+
+    top = index.search(vectors[3], k=2)
+    assert top[0][0] == "r3"
+    assert round(top[0][1]) == 100
+
+    assert index.remove("r3")
+    assert "r3" not in [rid for rid, _ in index.search(vectors[3], k=5)]
+
+    reloaded = CandidateIndex(directory=tmp_path, dim=16)
+    assert len(reloaded) == 4
+    assert reloaded.search(vectors[1], k=1)[0][0] == "r1"
+
+
+def test_readding_a_resume_replaces_its_vector(tmp_path):
+    vectors = _vectors(2)
+    index = CandidateIndex(directory=tmp_path, dim=16)
+    index.add("r0", vectors[0])
+    index.add("r0", vectors[1])
+
+    assert len(index) == 1
+    assert index.search(vectors[1], k=1)[0][0] == "r0"
+
+
+def test_large_pool_switches_to_ivf(tmp_path):
+    vectors = _vectors(400)
+    index = CandidateIndex(directory=tmp_path, dim=16, ivf_threshold=300, nprobe=64)
+    index.add_many([f"r{i}" for i in range(400)], vectors)
+
+    assert index.is_ivf
+    assert index.search(vectors[42], k=1)[0][0] == "r42"
+    assert index.remove("r42")
+    index.save()
+    assert CandidateIndex(directory=tmp_path, dim=16).is_ivf
+
+
+def test_backfill_indexes_stored_resumes(fake_model, tmp_path, monkeypatch):
+    import mongomock
+    from services import job_embeddings
+    from services.content_store import ContentStore
+    from services.index_backfill import backfill_candidate_index
+    from services.rag_pipeline import encode_resumes
+    from utils import database
+
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path / "jobs"))
+    monkeypatch.setattr(database, "_client", mongomock.MongoClient())
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "cache")
+    uploaded = encode_resumes(["python flask developer"])[0]
+    store.put_embedding("a" * 64, uploaded.vectors, uploaded.sections)
+    flask_id = database.store_resume("Ada", "a@x", "python flask developer", "job", 80.0, "Match", None,
+                                     digest="a" * 64)
+    nurse_id = database.store_resume("Bob", "b@x", "registered nurse", "job", 10.0, "Irrelevant", None)
+    database.store_resume("Cy", "c@x", "", "job", 0.0, "Irrelevant", None)
+    index = CandidateIndex(directory=tmp_path / "index", dim=fake_model.dim)
+    index.add("deleted-resume", _vectors(1, dim=fake_model.dim)[0])
+    fake_model.calls.clear()
+
+    stats = backfill_candidate_index(index=index, collection=database.get_db_connection()["resumes"], store=store)
+
+    assert stats == {"stored": 3, "added": 2, "cached": 1, "removed": 1}
+    # Only the resume without cached vectors was encoded
+    assert fake_model.calls == [["registered nurse"]]
+    assert sorted(index.ids()) == sorted([flask_id, nurse_id])
+    assert index.search(uploaded.centroid(), k=1)[0][0] == flask_id
+    assert len(CandidateIndex(directory=tmp_path / "index", dim=fake_model.dim)) == 2
+
+    # A second run finds nothing to do
+    again = backfill_candidate_index(index=index, collection=database.get_db_connection()["resumes"], store=store)
+    assert (again["added"], again["removed"]) == (0, 0)
@@ -0,0 +1,65 @@
+import pytest
+
+from services import job_embeddings, rag_pipeline
+from services.chunking import chunk_resume, split_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+SKILLS
+python flask docker kubernetes
+
+Work Experience
+""" + " ".join(["managed retail store operations and inventory"] * 60) + """
+
+Education:
+BSc Computer Science
+"""
+
+
+def test_sections_are_detected_from_headings():
+    sections = [name for name, _ in split_sections(RESUME)]
+    assert sections == ["other", "skills", "experience", "education"]
+
+
+def test_long_sections_are_windowed_with_overlap():
+    chunks = chunk_resume(RESUME, max_words=100, overlap=20)
+    experience = [text for section, text in chunks if section == "experience"]
+    assert len(experience) == 5
+    assert all(len(text.split()) <= 100 for _, text in chunks)
+    assert experience[0].split()[-20:] == experience[1].split()[:20]
+
+
+def test_matching_section_is_not_drowned_out(fake_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path))
+    monkeypatch.setattr(rag_pipeline.Config, "RESUME_SCORING", "chunked")
+    job = "python flask docker kubernetes"
+
+    chunked_score, embedding = rag_pipeline.score_resume(RESUME, job)
+    whole_text_score = rag_pipeline.cosine_score(fake_model.encode([RESUME])[0], fake_model.encode([job])[0])
+
+    assert chunked_score > whole_text_score
+    # Every chunk was encoded in a single batched call
+    assert [len(call) for call in fake_model.calls].count(len(embedding.sections)) == 1
+
+
+def test_document_scoring_is_the_whole_text_cosine(fake_model, tmp_path, monkeypatch):
+    # The default until the thresholds are calibrated for the chunked score
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path))
+    monkeypatch.setattr(rag_pipeline.Config, "RESUME_SCORING", "document")
+    job = "python flask docker kubernetes"
+
+    score, embedding = rag_pipeline.score_resume(RESUME, job)
+
+    assert len(embedding.sections) == 1
+    assert score == pytest.approx(rag_pipeline.cosine_score(fake_model.encode([RESUME])[0], fake_model.encode([job])[0]),
+                                  abs=1e-3)
+
+
+def test_batched_scores_equal_individual_scores(fake_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path))
+    resumes = [RESUME, "java spring hibernate", "SKILLS\npython"]
+
+    batch = rag_pipeline.compute_match_scores(resumes, "python flask")
+    single = [rag_pipeline.score_resume(r, "python flask")[0] for r in resumes]
+    assert batch == pytest.approx(single, abs=1e-4)
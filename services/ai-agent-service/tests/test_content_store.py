@@ -0,0 +1,63 @@
+import io
+
+import numpy as np
+from werkzeug.datastructures import FileStorage
+
+from services import content_store
+from services.content_store import ContentStore
+
+
+def test_duplicate_uploads_share_one_file_and_one_parse(tmp_path, monkeypatch):
+    parses = []
+
+    def fake_extract(path):
+        parses.append(path)
+        return open(path).read()
+
+    monkeypatch.setattr(content_store, "extract_text", fake_extract)
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+
+    first = store.save_upload(FileStorage(io.BytesIO(b"python developer"), "cv.pdf"), ".pdf")
+    second = store.save_upload(FileStorage(io.BytesIO(b"python developer"), "copy.pdf"), ".pdf")
+
+    assert first == second
+    assert [p.name for p in (tmp_path / "uploads").iterdir()] == [f"{first[0]}.pdf"]
+    assert store.get_text(*first) == store.get_text(*second) == "python developer"
+    assert len(parses) == 1
+
+
+def test_chunk_embeddings_are_cached_by_digest(tmp_path):
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+    assert store.get_embedding("abc") is None
+
+    store.put_embedding("abc", np.ones((2, 4)), ["skills", "education"])
+    vectors, sections = store.get_embedding("abc")
+    assert np.array_equal(vectors, np.ones((2, 4), dtype=np.float32))
+    assert sections == ["skills", "education"]
+
+
+def test_chunk_embeddings_are_keyed_by_chunking_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_store.Config, "RESUME_SCORING", "chunked")
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+    store.put_embedding("abc", np.ones((2, 4)), ["skills", "education"])
+
+    monkeypatch.setattr(content_store.Config, "CHUNK_MAX_WORDS", content_store.Config.CHUNK_MAX_WORDS + 50)
+    assert store.get_embedding("abc") is None
+    # Whole-document vectors are cached apart from chunk vectors
+    store.put_embedding("abc", np.ones((2, 4)), ["skills", "education"])
+    monkeypatch.setattr(content_store.Config, "RESUME_SCORING", "document")
+    assert store.get_embedding("abc") is None
+
+
+def test_partial_file_is_removed_when_stream_fails(tmp_path):
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+
+    def chunks():
+        yield b"partial"
+        raise IOError("connection reset")
+
+    try:
+        store.save_stream(chunks(), ".pdf")
+    except IOError:
+        pass
+    assert list((tmp_path / "uploads").iterdir()) == []
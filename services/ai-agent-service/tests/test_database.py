@@ -0,0 +1,102 @@
+import mongomock
+import pytest
+
+from utils import database
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(database, "_client", client)
+    return client
+
+
+def test_client_is_shared(mongo):
+    assert database.get_client() is database.get_client() is mongo
+
+
+def test_store_resume_and_indexes(mongo):
+    database.ensure_indexes()
+    resume_id = database.store_resume("Ada", "ada@example.com", "text", "Python  dev", 82.0, "Match", "good")
+
+    doc = database.get_db_connection()["resumes"].find_one()
+    assert str(doc["_id"]) == resume_id
+    assert doc["job_hash"] == database.job_hash("Python dev")
+    index_keys = [list(spec["key"]) for spec in database.get_db_connection()["resumes"].index_information().values()]
+    assert [("job_hash", 1), ("score", -1)] in [[tuple(k) for k in key] for key in index_keys]
+
+
+def test_bulk_writer_flushes_when_the_batch_fills(mongo):
+    writer = database.BulkResumeWriter(batch_size=3, interval=60)
+    docs = [database.build_resume_document(f"c{i}", "", "t", "job", 10.0, "Irrelevant", None) for i in range(4)]
+
+    ids = [writer.add(doc) for doc in docs]
+    collection = database.get_db_connection()["resumes"]
+    assert collection.count_documents({}) == 3
+    assert writer.pending() == 1
+
+    writer.flush()
+    assert collection.count_documents({}) == 4
+    assert sorted(ids) == sorted(str(d["_id"]) for d in collection.find())
+
+
+def test_bulk_writer_flushes_after_the_interval(mongo):
+    import time
+
+    writer = database.BulkResumeWriter(batch_size=100, interval=0.05)
+    writer.add(database.build_resume_document("c0", "", "t", "job", 10.0, "Irrelevant", None))
+    collection = database.get_db_connection()["resumes"]
+    assert collection.count_documents({}) == 0
+
+    deadline = time.monotonic() + 5
+    while collection.count_documents({}) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert collection.count_documents({}) == 1
+    assert writer.pending() == 0
+
+
+def test_update_during_flush_is_not_lost(mongo, monkeypatch):
+    writer = database.BulkResumeWriter(batch_size=100, interval=60)
+    monkeypatch.setattr(database, "_writer", writer)
+    resume_id = writer.add(database.build_resume_document("c0", "", "t", "job", 10.0, "Irrelevant", None, "pending"))
+    real_store = database.store_resumes
+
+    def slow_store(documents):
+        # The analysis finishes while insert_many is still running
+        database.update_resume(resume_id, {"analysis": "good", "analysis_status": "done"})
+        return real_store(documents)
+
+    monkeypatch.setattr(database, "store_resumes", slow_store)
+    writer.flush()
+
+    doc = database.get_db_connection()["resumes"].find_one()
+    assert (doc["analysis"], doc["analysis_status"]) == ("good", "done")
+
+
+def test_failed_inserts_are_requeued_then_dropped(mongo, monkeypatch):
+    dropped = []
+    writer = database.BulkResumeWriter(batch_size=100, interval=60, max_attempts=2, on_drop=dropped.append)
+    monkeypatch.setattr(database, "store_resumes", lambda documents: [])
+    resume_id = writer.add(database.build_resume_document("c0", "", "t", "job", 10.0, "Irrelevant", None))
+
+    writer.flush()
+    assert writer.pending() == 1
+    assert writer.update_pending(resume_id, {"analysis_status": "done"})
+    assert dropped == []
+
+    writer.flush()
+    assert writer.stats() == {"pending": 0, "written": 0, "dropped": 1}
+    assert dropped == [resume_id]
+
+
+def test_dropped_resumes_leave_the_candidate_index(tmp_path, monkeypatch):
+    import numpy as np
+    from services import candidate_index
+
+    index = candidate_index.CandidateIndex(directory=tmp_path, dim=4)
+    index.add("r1", np.ones(4, dtype=np.float32))
+    monkeypatch.setattr(candidate_index, "get_candidate_index", lambda: index)
+
+    database._unindex_resume("r1")
+
+    assert "r1" not in index
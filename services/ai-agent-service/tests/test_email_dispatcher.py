@@ -0,0 +1,101 @@
+import socket
+
+import pytest
+
+from utils.email_service import EmailDispatcher
+
+
+class FakeSMTP:
+    connections = 0
+
+    def __init__(self, fail_first=0):
+        FakeSMTP.connections += 1
+        self.sent = []
+        self.fail_first = fail_first
+
+    def send(self, **message):
+        if self.fail_first:
+            self.fail_first -= 1
+            raise ConnectionError("server disconnected")
+        self.sent.append(message)
+
+    def close(self):
+        pass
+
+
+def test_connection_is_reused_and_hr_forwards_are_batched(tmp_path):
+    FakeSMTP.connections = 0
+    smtp = FakeSMTP()
+    dispatcher = EmailDispatcher(connect=lambda: smtp, rate_per_second=1000, hr_batch_size=3, hr_batch_interval=60)
+    # Stored resumes are named after their digest
+    for digest in ("a1", "b2", "c3"):
+        (tmp_path / f"{digest}.pdf").write_bytes(digest.encode())
+
+    dispatcher.enqueue("a@example.com", "Hi", "body")
+    dispatcher.enqueue("b@example.com", "Hi", "body")
+    dispatcher.forward_to_hr("hr@example.com", "Ada", str(tmp_path / "a1.pdf"), "ada_cv.pdf")
+    dispatcher.forward_to_hr("hr@example.com", "Bob", str(tmp_path / "b2.pdf"), "resume.pdf")
+    dispatcher.forward_to_hr("hr@example.com", "Cy", str(tmp_path / "c3.pdf"), "resume.pdf")
+    dispatcher.stop()
+
+    assert [m["to"] for m in smtp.sent] == ["a@example.com", "b@example.com", "hr@example.com"]
+    attachments = smtp.sent[-1]["attachments"]
+    assert [(f.name, f.read()) for f in attachments] == [
+        ("ada_cv.pdf", b"a1"), ("resume.pdf", b"b2"), ("Cy_resume.pdf", b"c3"),
+    ]
+    assert dispatcher.stats() == {"queue_depth": 0, "hr_pending": 0, "sent": 3, "failed": 0, "retries": 0}
+
+
+def test_failed_send_reconnects_and_retries(monkeypatch):
+    import utils.email_service as email_service
+    monkeypatch.setattr(email_service.time, "sleep", lambda s: None)
+    connections = []
+
+    def connect():
+        connections.append(FakeSMTP(fail_first=1 if not connections else 0))
+        return connections[-1]
+
+    dispatcher = EmailDispatcher(connect=connect, rate_per_second=1000)
+    dispatcher.enqueue("a@example.com", "Hi", "body")
+    dispatcher.stop()
+
+    assert len(connections) == 2
+    assert dispatcher.stats()["retries"] == 1
+    assert dispatcher.stats()["sent"] == 1
+
+
+def test_sends_through_local_smtp_server(monkeypatch, tmp_path):
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+
+    class Recorder(Sink):
+        messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            Recorder.messages.append(envelope)
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    controller = controller_module.Controller(Recorder(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+        monkeypatch.setenv("SMTP_PORT", str(port))
+        monkeypatch.setenv("SMTP_SSL", "false")
+        monkeypatch.setenv("SMTP_SKIP_LOGIN", "true")
+        dispatcher = EmailDispatcher(rate_per_second=1000)
+        stored = tmp_path / "9f86d081884c7d65.pdf"
+        stored.write_bytes(b"%PDF-1.4 resume")
+        dispatcher.enqueue("candidate@example.com", "Resume Submission Received", "Thanks")
+        dispatcher.enqueue("hr@example.com", "Shortlisted", "See attached", attachments={"ada_cv.pdf": str(stored)})
+        dispatcher.stop()
+    finally:
+        controller.stop()
+
+    assert [m.rcpt_tos for m in Recorder.messages] == [["candidate@example.com"], ["hr@example.com"]]
+    # The attachment carries the candidate's file name, not the digest it is stored under
+    attached = Recorder.messages[1].content.decode()
+    assert 'filename="ada_cv.pdf"' in attached
+    assert "9f86d081884c7d65" not in attached
@@ -0,0 +1,73 @@
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+transformers = pytest.importorskip("transformers")
+torch = pytest.importorskip("torch")
+
+from config.config import Config
+from services.embedding_backends import OnnxBackend, SentenceTransformerBackend, export_onnx
+
+JOB = "Backend engineer with Python, Flask, MongoDB and Docker experience"
+RESUMES = [
+    "Five years building Flask APIs in Python, deploying with Docker and MongoDB.",
+    "Registered nurse with ICU experience and patient care certifications.",
+    "Data analyst skilled in SQL, Excel dashboards and some Python scripting.",
+    "Senior Java developer, Spring Boot microservices on Kubernetes.",
+]
+
+
+def _tiny_bert(directory):
+    """A small randomly initialised BERT saved locally, so the export path runs without hub access."""
+    words = {w.strip(",.").lower() for text in RESUMES + [JOB] for w in text.split()}
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words)
+    (directory / "vocab.txt").write_text("\n".join(vocab))
+    transformers.BertTokenizerFast(str(directory / "vocab.txt")).save_pretrained(directory)
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=4, intermediate_size=128
+    )
+    transformers.BertModel(config).save_pretrained(directory)
+    return str(directory)
+
+
+@pytest.fixture(scope="module")
+def backends(tmp_path_factory):
+    # Set EMBEDDING_PARITY_REAL_MODEL=1 to check the configured model (downloads it from the hub)
+    if os.getenv("EMBEDDING_PARITY_REAL_MODEL"):
+        model = Config.EMBEDDING_MODEL
+    else:
+        model = _tiny_bert(tmp_path_factory.mktemp("tiny-bert"))
+
+    out_dir = export_onnx(model, tmp_path_factory.mktemp("onnx"), quantize=True)
+    return {
+        "torch": SentenceTransformerBackend(model),
+        "onnx": OnnxBackend(model, model_dir=out_dir),
+        "onnx-int8": OnnxBackend(model, quantized=True, model_dir=out_dir),
+    }
+
+
+def _scores(backend):
+    job = backend.encode([JOB])[0]
+    return backend.encode(RESUMES) @ job * 100
+
+
+@pytest.mark.parametrize("name, tolerance", [("onnx", 0.5), ("onnx-int8", 3.0)])
+def test_onnx_scores_match_torch(backends, name, tolerance):
+    expected = _scores(backends["torch"])
+    actual = _scores(backends[name])
+
+    assert np.max(np.abs(actual - expected)) <= tolerance
+    # Ranking of candidates must not change
+    assert list(np.argsort(-actual)) == list(np.argsort(-expected))
+
+
+def test_onnx_pads_mixed_length_batches(backends):
+    batched = backends["onnx"].encode(RESUMES)
+    one_by_one = np.vstack([backends["onnx"].encode([text]) for text in RESUMES])
+
+    np.testing.assert_allclose(batched, one_by_one, atol=1e-5)
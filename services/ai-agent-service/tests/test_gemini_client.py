@@ -0,0 +1,126 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.gemini_client import GeminiClient, LLMUnavailableError
+
+
+class StubGemini:
+    """Local HTTP server replaying a scripted list of (status, body) responses."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests += 1
+                status, text = stub.script.pop(0) if stub.script else (200, "ok")
+                body = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1beta"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    from config.config import Config
+    monkeypatch.setattr(Config, "GEMINI_MAX_RETRIES", 2)
+    monkeypatch.setattr(Config, "GEMINI_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(Config, "GEMINI_CIRCUIT_FAILURES", 2)
+    monkeypatch.setattr(Config, "GEMINI_CIRCUIT_RESET_SECONDS", 60)
+
+
+def test_retries_transient_errors_then_succeeds(fast_retries):
+    with StubGemini([(503, ""), (429, ""), (200, "analysis")]) as stub:
+        client = GeminiClient(api_base=stub.base, api_key="k")
+        assert client.generate("prompt") == "analysis"
+        assert stub.requests == 3
+
+
+def test_breaker_opens_after_repeated_failures(fast_retries):
+    with StubGemini([(500, "")] * 6) as stub:
+        client = GeminiClient(api_base=stub.base, api_key="k")
+        for _ in range(2):
+            with pytest.raises(LLMUnavailableError):
+                client.generate("prompt")
+        assert client.breaker.state == "open"
+
+        requests_before = stub.requests
+        with pytest.raises(LLMUnavailableError):
+            client.generate("prompt")
+        assert stub.requests == requests_before
+
+
+def test_client_errors_are_not_retried(fast_retries):
+    import requests
+
+    with StubGemini([(400, "")]) as stub:
+        client = GeminiClient(api_base=stub.base, api_key="k")
+        with pytest.raises(requests.HTTPError):
+            client.generate("prompt")
+        assert stub.requests == 1
+        assert client.breaker.state == "closed"
+
+
+def test_broken_response_during_half_open_trial_reopens_the_breaker(fast_retries, monkeypatch):
+    import requests
+
+    client = GeminiClient(api_base="http://127.0.0.1:9/v1beta", api_key="k")
+    client.breaker.opened_at = 0.0  # reset window long over: the next call is the half-open trial
+    client.breaker.failures = 2
+
+    def broken_post(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken mid-body")
+
+    monkeypatch.setattr(client.session, "post", broken_post)
+    with pytest.raises(LLMUnavailableError):
+        client.generate("prompt")
+
+    assert client.breaker.state == "open"
+    assert client.breaker._trial_in_flight is False
+
+
+def test_malformed_success_body_is_unavailable_not_stuck(fast_retries):
+    class Blocked:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"promptFeedback": {"blockReason": "SAFETY"}}
+
+    client = GeminiClient(api_base="http://127.0.0.1:9/v1beta", api_key="k")
+    client.breaker.opened_at = 0.0
+    client.session.post = lambda *args, **kwargs: Blocked()
+
+    with pytest.raises(LLMUnavailableError):
+        client.generate("prompt")
+    # Gemini answered, so the trial closes the breaker
+    assert client.breaker.state == "closed"
@@ -0,0 +1,34 @@
+import numpy as np
+
+from services.job_embeddings import JobEmbeddingStore, job_key
+
+
+def test_job_vectors_are_encoded_once_and_reused_across_restarts(tmp_path, fake_model):
+    store = JobEmbeddingStore(directory=tmp_path, capacity=4)
+    first = store.get("Senior Python engineer   with Flask")
+    again = store.get("Senior Python engineer with Flask")
+
+    assert len(fake_model.calls) == 1
+    assert np.array_equal(first, again)
+    assert store.stats()["hits"] == 1
+
+    restarted = JobEmbeddingStore(directory=tmp_path, capacity=4)
+    from_disk = restarted.get("Senior Python engineer with Flask")
+    assert len(fake_model.calls) == 1
+    assert restarted.stats()["disk_hits"] == 1
+    assert np.array_equal(first, from_disk)
+
+
+def test_lru_evicts_oldest_in_memory_entry(tmp_path, fake_model):
+    store = JobEmbeddingStore(directory=tmp_path, capacity=2)
+    for job in ("job a", "job b", "job c"):
+        store.get(job)
+
+    assert store.stats()["in_memory"] == 2
+    assert job_key("job a") not in store._cache
+    assert (tmp_path / f"{job_key('job a')}.npy").exists()
+
+
+def test_key_depends_on_model_and_backend():
+    assert job_key("job a", "model-a", "torch") != job_key("job a", "model-b", "torch")
+    assert job_key("job a", "model-a", "torch") != job_key("job a", "model-a", "onnx-int8")
@@ -0,0 +1,83 @@
+import io
+import time
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from services import content_store, metrics
+from services.content_store import ContentStore
+from services.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, stage="parse")
+
+    text = registry.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'stage="parse",le="0.1"} 1' in text
+    assert 'stage="parse",le="1.0"} 3' in text
+    assert 'stage="parse",le="+Inf"} 4' in text
+    assert 'demo_seconds_sum{stage="parse"} 4.05' in text
+    assert 'stage="parse"} 4\n' in text
+
+
+def test_span_counts_errors_and_still_records_time():
+    before = metrics.STAGE_SECONDS.count(stage="test_stage")
+    with pytest.raises(ValueError):
+        with metrics.span("test_stage"):
+            raise ValueError("boom")
+
+    assert metrics.STAGE_SECONDS.count(stage="test_stage") == before + 1
+    assert metrics.STAGE_ERRORS.value(stage="test_stage") >= 1
+
+
+def test_span_overhead_is_negligible():
+    iterations = 20000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.span("overhead"):
+            pass
+    per_call = (time.perf_counter() - start) / iterations
+    # A few microseconds; far below any stage it wraps
+    assert per_call < 50e-6
+
+
+def test_parse_is_timed_and_cache_misses_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_store, "extract_text", lambda path: open(path).read())
+    store = ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+    before = metrics.STAGE_SECONDS.count(stage="parse")
+
+    upload = store.save_upload(FileStorage(io.BytesIO(b"python developer"), "cv.pdf"), ".pdf")
+    store.get_text(*upload)
+    store.get_text(*upload)
+
+    assert metrics.STAGE_SECONDS.count(stage="parse") == before + 1
+    assert store.stats()["text_hits"] == 1 and store.stats()["text_misses"] == 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    import server
+    client = server.app.test_client()
+    client.get("/health/live")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{method="GET"' in text
+    assert 'endpoint="/health/live",status="200"' in text
+    assert 'cache="analysis",result="miss"' in text
+    assert "# TYPE resume_stage_duration_seconds histogram" in text
+
+
+def test_render_has_no_per_process_labels():
+    registry = MetricsRegistry()
+    registry.counter("demo_total", "Demo.").inc()
+
+    # A pid label would start new series on every restart
+    assert registry.render() == "# HELP demo_total Demo.\n# TYPE demo_total counter\ndemo_total 1\n"
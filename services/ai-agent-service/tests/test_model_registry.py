@@ -0,0 +1,46 @@
+import threading
+
+from services import model_registry
+
+
+def test_model_is_loaded_once_across_threads(monkeypatch):
+    model_registry.clear()
+    loads = []
+
+    class Model:
+        def encode(self, texts, **kwargs):
+            return [[0.0] for _ in texts]
+
+    def fake_loader(name):
+        loads.append(name)
+        return Model()
+
+    monkeypatch.setattr(model_registry, "_load_backend", fake_loader)
+
+    entries = []
+    threads = [threading.Thread(target=lambda: entries.append(model_registry.get_model("mini"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loads == ["mini"]
+    assert len({id(e) for e in entries}) == 1
+    assert model_registry.loaded_models()[0]["name"] == "mini"
+    model_registry.clear()
+
+
+def test_warm_up_encodes_with_registered_model(fake_model):
+    model_registry.warm_up()
+    assert fake_model.calls == [["warm-up"]]
+
+
+def test_memory_falls_back_to_rss_growth():
+    class Model:
+        def encode(self, texts, **kwargs):
+            return [[0.0] for _ in texts]
+
+    assert model_registry._rss_bytes() > 0
+    assert model_registry._model_memory_bytes(Model(), 100, 350) == 250
+    # Platforms without psutil or /proc report no figure rather than a wrong one
+    assert model_registry._model_memory_bytes(Model(), None, None) is None
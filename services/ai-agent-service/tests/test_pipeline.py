@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from services.pipeline import Pipeline, PipelineError
+
+
+def test_independent_stages_overlap_and_dependents_get_results():
+    barrier = threading.Barrier(2, timeout=2)
+
+    def slow(value):
+        barrier.wait()  # only passes if both stages run at the same time
+        time.sleep(0.01)
+        return value
+
+    pipeline = Pipeline()
+    pipeline.add("analysis", lambda: slow("analysis"))
+    pipeline.add("store", lambda: slow("id-1"))
+    pipeline.add("save", lambda rid, analysis: f"{rid}:{analysis}", deps=["store", "analysis"])
+    outcome = pipeline.run()
+
+    assert outcome.results["save"] == "id-1:analysis"
+    assert set(outcome.timings) == {"analysis", "store", "save"}
+
+
+def test_failure_skips_dependents_but_not_siblings():
+    def boom():
+        raise RuntimeError("mongo down")
+
+    pipeline = Pipeline()
+    pipeline.add("store", boom)
+    pipeline.add("index", lambda rid: rid, deps=["store"])
+    pipeline.add("email", lambda: "sent")
+    outcome = pipeline.run()
+
+    assert outcome.results == {"email": "sent"}
+    assert outcome.skipped == ["index"]
+    with pytest.raises(PipelineError, match="store"):
+        outcome.raise_for_errors()
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        Pipeline().add("index", lambda rid: rid, deps=["store"])
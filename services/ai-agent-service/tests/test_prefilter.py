@@ -0,0 +1,146 @@
+import mongomock
+import numpy as np
+import pytest
+
+from services import resume_service
+from services.prefilter import AnalysisGate, keyword_coverage
+from utils import database
+
+JOB = "Python Flask developer with MongoDB and Docker"
+
+
+class _Embedding:
+    def centroid(self):
+        return np.ones(4, dtype=np.float32)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    mongo = mongomock.MongoClient()
+    monkeypatch.setattr(database, "_client", mongo)
+    llm_calls = []
+
+    def fake_analysis(resume_text, job_description):
+        llm_calls.append(resume_text)
+        return f"analysis of {resume_text}"
+
+    monkeypatch.setattr(resume_service, "analyze_match", fake_analysis)
+    monkeypatch.setattr(resume_service, "get_candidate_index", lambda: type("Index", (), {"add": lambda *a: None})())
+    for name in ("send_acknowledgment_email", "send_congratulatory_email", "send_rejection_email"):
+        monkeypatch.setattr(resume_service, name, lambda *a: None)
+
+    svc = resume_service.ResumeService(str(tmp_path / "uploads"))
+    svc.gate = AnalysisGate(min_score=30, max_score=100, keyword_rescue=0.6)
+    svc.llm_calls = llm_calls
+    return svc
+
+
+def _complete(svc, text, score):
+    screening = {"digest": "f" * 64, "resume_path": "r.pdf", "resume_text": text, "score": score,
+                 "resume_embedding": _Embedding()}
+    return svc.complete_submission(screening, JOB, "Ada", "ada@example.com")
+
+
+def test_gate_bands_and_keyword_rescue():
+    gate = AnalysisGate(min_score=30, max_score=90, keyword_rescue=0.6)
+
+    assert gate.decide(55, "anything", JOB) == (True, "in_band")
+    assert gate.decide(95, "anything", JOB) == (False, "above_band")
+    assert gate.decide(12, "Registered nurse, ICU", JOB) == (False, "below_band")
+    assert gate.decide(12, "python flask mongodb docker developer", JOB) == (True, "keyword_match")
+    assert gate.stats()["skipped"] == 2 and gate.stats()["skip_ratio"] == 0.5
+
+
+def test_keyword_coverage_ignores_filler_words():
+    assert keyword_coverage("python flask", "Python and Flask with experience") == 1.0
+    assert keyword_coverage("anything", "") == 0.0
+
+
+def test_irrelevant_resume_skips_llm_and_is_stored_as_skipped(service):
+    result = _complete(service, "Registered nurse, ICU", 12.0)
+
+    assert service.llm_calls == []
+    assert result["analysis"] is None and result["analysis_status"] == "skipped"
+    assert "analysis" not in result["timings_ms"]
+    doc = database.get_db_connection()["resumes"].find_one()
+    assert doc["analysis_status"] == "skipped"
+
+
+def test_in_band_resume_gets_llm_analysis(service):
+    result = _complete(service, "Flask services in Python", 64.0)
+
+    assert service.llm_calls == ["Flask services in Python"]
+    assert result["analysis_status"] == "done"
+    doc = database.get_db_connection()["resumes"].find_one()
+    assert (doc["analysis"], doc["analysis_status"]) == ("analysis of Flask services in Python", "done")
+    # Rescoring finds the cached chunk vectors through the upload digest
+    assert doc["digest"] == "f" * 64
+
+
+def test_skipped_resume_can_be_analyzed_on_demand(service, monkeypatch):
+    resume_id = _complete(service, "Registered nurse, ICU", 12.0)["id"]
+
+    import server
+    monkeypatch.setattr(server, "resume_service", service)
+    client = server.app.test_client()
+    response = client.post(f"/resumes/{resume_id}/analysis")
+
+    assert response.status_code == 200
+    assert response.get_json()["analysis"] == "analysis of Registered nurse, ICU"
+    assert database.get_db_connection()["resumes"].find_one()["analysis_status"] == "done"
+    # A second request returns the stored analysis without calling Gemini again
+    client.post(f"/resumes/{resume_id}/analysis")
+    assert service.llm_calls == ["Registered nurse, ICU"]
+    assert client.post("/resumes/000000000000000000000000/analysis").status_code == 404
+
+
+def test_on_demand_analysis_reports_a_database_outage(service, monkeypatch):
+    import server
+
+    class _Unreachable:
+        def find_one(self, *args, **kwargs):
+            raise RuntimeError("server selection timeout")
+
+    monkeypatch.setattr(server, "resume_service", service)
+    monkeypatch.setattr(database, "get_db_connection", lambda: {"resumes": _Unreachable()})
+    response = server.app.test_client().post("/resumes/000000000000000000000000/analysis")
+
+    # Not a 404: the resume may well exist
+    assert response.status_code == 503
+    assert service.llm_calls == []
+
+
+def test_failed_analysis_marks_the_resume_and_the_submission_succeeds(service, monkeypatch):
+    import requests
+
+    def forbidden(resume_text, job_description):
+        raise requests.HTTPError("403 Client Error: Forbidden")
+
+    def broken_index():
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(resume_service, "analyze_match", forbidden)
+    monkeypatch.setattr(resume_service, "get_candidate_index", broken_index)
+    result = _complete(service, "Flask services in Python", 64.0)
+
+    assert result["status"] == "success"
+    assert result["analysis_status"] == "failed"
+    doc = database.get_db_connection()["resumes"].find_one()
+    assert str(doc["_id"]) == result["id"]
+    assert (doc["analysis"], doc["analysis_status"]) == (None, "failed")
+
+
+def test_acknowledgment_is_sent_before_the_decision(service, monkeypatch):
+    import time
+
+    sent = []
+
+    def slow_acknowledgment(email, name):
+        time.sleep(0.05)
+        sent.append("acknowledgment")
+
+    monkeypatch.setattr(resume_service, "send_acknowledgment_email", slow_acknowledgment)
+    monkeypatch.setattr(resume_service, "send_rejection_email", lambda *a: sent.append("rejection"))
+    _complete(service, "Registered nurse, ICU", 12.0)
+
+    assert sent == ["acknowledgment", "rejection"]
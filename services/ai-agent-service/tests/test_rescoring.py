@@ -0,0 +1,147 @@
+import json
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from services.content_store import ContentStore
+from services.rescoring import Rescorer
+from utils import database
+
+OLD_JOB = "java spring developer"
+NEW_JOB = "python flask developer"
+
+
+class RecordingCollection:
+    """
+    A mongomock collection whose bulk_write applies the UpdateOne operations one by one:
+    mongomock's own bulk_write predates the installed pymongo's UpdateOne.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.bulk_writes = []
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def bulk_write(self, operations, ordered=True):
+        from pymongo import UpdateOne
+        assert ordered is False and all(isinstance(op, UpdateOne) for op in operations)
+        self.bulk_writes.append(len(operations))
+        modified = sum(self.collection.update_one(op._filter, op._doc).modified_count for op in operations)
+        return SimpleNamespace(modified_count=modified)
+
+
+@pytest.fixture
+def resumes(fake_model, tmp_path, monkeypatch):
+    from services import job_embeddings
+
+    monkeypatch.setattr(job_embeddings, "_store", job_embeddings.JobEmbeddingStore(directory=tmp_path / "jobs"))
+    monkeypatch.setattr(database, "_client", mongomock.MongoClient())
+    texts = ["python flask developer", "java spring", "python flask", "nurse", "flask developer"]
+    for i, text in enumerate(texts):
+        database.store_resume(f"c{i}", f"c{i}@x", text, OLD_JOB, 10.0, "Irrelevant", f"old analysis {i}")
+    database.store_resume("other", "o@x", "python flask developer", "another job", 5.0, "Irrelevant", None)
+    return RecordingCollection(database.get_db_connection()["resumes"])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "cache")
+
+
+def test_rescores_selected_resumes_in_bulk(resumes, store, tmp_path):
+    rescorer = Rescorer(NEW_JOB, query={"job_hash": database.job_hash(OLD_JOB)}, batch_size=2,
+                        checkpoint_path=str(tmp_path / "ckpt.json"), collection=resumes, store=store)
+
+    stats = rescorer.run()
+
+    assert stats["processed"] == stats["updated"] == 5
+    assert resumes.bulk_writes == [2, 2, 1]
+    best = resumes.find_one({"name": "c0"})
+    assert best["score"] == pytest.approx(100.0, abs=1e-3)
+    assert best["category"] == "Match"
+    assert best["job_hash"] == database.job_hash(NEW_JOB)
+    assert best["analysis"] is None and best["analysis_status"] == "stale"
+    # Resumes for other jobs are untouched
+    assert resumes.find_one({"name": "other"})["score"] == 5.0
+    assert json.loads((tmp_path / "ckpt.json").read_text())["done"] is True
+
+
+def test_interrupted_run_resumes_from_checkpoint(resumes, store, tmp_path, fake_model):
+    checkpoint = str(tmp_path / "ckpt.json")
+    first = Rescorer(NEW_JOB, query={"job_hash": database.job_hash(OLD_JOB)}, batch_size=2, checkpoint_path=checkpoint,
+                     collection=resumes, store=store)
+    first.run(max_batches=1)
+    assert resumes.count_documents({"analysis_status": "stale"}) == 2
+    fake_model.calls.clear()
+
+    second = Rescorer(NEW_JOB, query={"job_hash": database.job_hash(OLD_JOB)}, batch_size=2, checkpoint_path=checkpoint,
+                      collection=resumes, store=store)
+    stats = second.run()
+
+    assert stats["processed"] == 5
+    assert resumes.count_documents({"job_hash": database.job_hash(NEW_JOB)}) == 5
+    # Only the three remaining resumes were encoded again
+    assert sum(len(call) for call in fake_model.calls) == 3
+
+
+def test_dry_run_and_foreign_checkpoint(resumes, store, tmp_path):
+    checkpoint = str(tmp_path / "ckpt.json")
+    stats = Rescorer(NEW_JOB, dry_run=True, checkpoint_path=checkpoint, collection=resumes, store=store).run()
+
+    assert stats["processed"] == 6 and stats["updated"] == 0
+    assert resumes.count_documents({"analysis_status": "stale"}) == 0
+
+    Rescorer(NEW_JOB, batch_size=10, checkpoint_path=checkpoint, collection=resumes, store=store).run(max_batches=1)
+    with pytest.raises(ValueError):
+        Rescorer("some other job", checkpoint_path=checkpoint, collection=resumes, store=store).run()
+
+
+def test_cached_chunk_vectors_are_reused(resumes, store, tmp_path, fake_model):
+    from services.job_embeddings import get_job_embedding
+    from services.rag_pipeline import encode_resumes
+
+    # Keep the job encodes out of the counts below
+    get_job_embedding(NEW_JOB)
+    get_job_embedding(OLD_JOB)
+    # An upload screened earlier: its chunk vectors are cached under the file digest
+    uploaded = encode_resumes(["python flask developer"])[0]
+    store.put_embedding("a" * 64, uploaded.vectors, uploaded.sections)
+    database.store_resume("uploaded", "u@x", "python flask developer", OLD_JOB, 10.0, "Irrelevant", None,
+                          digest="a" * 64)
+    fake_model.calls.clear()
+    query = {"job_hash": database.job_hash(OLD_JOB)}
+
+    stats = Rescorer(NEW_JOB, query=query, checkpoint_path=str(tmp_path / "first.json"),
+                     collection=resumes, store=store).run()
+
+    # Only the five resumes without cached vectors were encoded
+    assert sum(len(call) for call in fake_model.calls) == 5
+    assert stats["cached"] == 1 and stats["updated"] == 6
+    assert resumes.find_one({"name": "uploaded"})["score"] == pytest.approx(100.0, abs=1e-3)
+
+    # Their vectors were cached by text hash, so rescoring for another job encodes nothing
+    fake_model.calls.clear()
+    query = {"job_hash": database.job_hash(NEW_JOB)}
+    stats = Rescorer(OLD_JOB, query=query, checkpoint_path=str(tmp_path / "second.json"),
+                     collection=resumes, store=store).run()
+
+    assert fake_model.calls == []
+    assert stats["cached"] == stats["updated"] == 6
+    assert resumes.count_documents({"job_hash": database.job_hash(OLD_JOB), "analysis_status": "stale"}) == 6
+
+
+def test_previous_job_selects_resumes_stored_before_job_hash(resumes, store, tmp_path):
+    legacy = database.build_resume_document("legacy", "l@x", "python flask developer", OLD_JOB, 10.0, "Irrelevant", None)
+    del legacy["job_hash"]
+    resumes.insert_one(legacy)
+
+    # --previous-job-file keeps the file's trailing newline
+    stats = Rescorer(NEW_JOB, query=database.job_query(OLD_JOB + "\n"), checkpoint_path=str(tmp_path / "ckpt.json"),
+                     collection=resumes, store=store).run()
+
+    assert stats["updated"] == 6
+    assert resumes.find_one({"name": "legacy"})["job_hash"] == database.job_hash(NEW_JOB)
+    assert resumes.find_one({"name": "other"})["job_description"] == "another job"
@@ -0,0 +1,89 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.content_store import ContentStore
+from services.resume_fetcher import FetchError, ResumeFetcher, normalize_url
+
+PDF = b"%PDF-1.4 fake resume body"
+INTERSTITIAL = b'<!DOCTYPE html><html><form><input type="hidden" name="confirm" value="t0k3n"></form></html>'
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/drive") and "confirm=t0k3n" in self.path:
+            body = PDF
+        elif self.path.startswith("/drive"):
+            body = INTERSTITIAL
+        elif self.path == "/login":
+            body = b"<html><body>Sign in</body></html>"
+        elif self.path == "/big":
+            body = PDF * 100
+        else:
+            body = PDF
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(tmp_path / "uploads", cache_dir=tmp_path / "parsed")
+
+
+def test_pdf_is_sniffed_and_stored(base_url, store):
+    digest, path = ResumeFetcher().fetch(f"{base_url}/cv", store)
+    assert path.endswith(f"{digest}.pdf")
+    assert open(path, "rb").read() == PDF
+
+
+def test_html_pages_are_rejected_early(base_url, store):
+    with pytest.raises(FetchError, match="HTML"):
+        ResumeFetcher().fetch(f"{base_url}/login", store)
+
+
+def test_confirm_token_flow_is_followed(base_url, store):
+    _, path = ResumeFetcher().fetch(f"{base_url}/drive?id=abc&export=download", store)
+    assert open(path, "rb").read() == PDF
+
+
+def test_content_length_over_cap_is_rejected(base_url, store):
+    with pytest.raises(FetchError, match="byte limit"):
+        ResumeFetcher(max_bytes=len(PDF) * 10).fetch(f"{base_url}/big", store)
+
+
+def test_prefetch_downloads_concurrently_and_reports_errors(base_url, store):
+    results = ResumeFetcher(concurrency=4).prefetch([f"{base_url}/a", f"{base_url}/login", f"{base_url}/a"], store)
+    assert set(results) == {f"{base_url}/a", f"{base_url}/login"}
+    assert isinstance(results[f"{base_url}/login"], FetchError)
+
+
+def test_drive_share_links_are_normalized():
+    url = "https://drive.google.com/file/d/17SsX_4k20JH12lBalstW5B7xQa9m6LDr/view?usp=drive_link"
+    assert normalize_url(url) == "https://drive.google.com/uc?id=17SsX_4k20JH12lBalstW5B7xQa9m6LDr&export=download"
+
+
+def test_downloaded_resumes_keep_a_readable_attachment_name(base_url, tmp_path):
+    from services.resume_service import ResumeService
+
+    service = ResumeService(str(tmp_path / "uploads"))
+    _, path, name = service._save_resume(None, f"{base_url}/files/ada_cv.pdf", "Ada Lovelace", "ada@example.com")
+    assert name == "ada_cv.pdf"
+    assert not path.endswith(name)
+
+    # Share links rarely end in a file name
+    _, _, name = service._save_resume(None, f"{base_url}/cv?id=42", "Ada Lovelace", "ada@example.com")
+    assert name == "Ada_Lovelace_resume.pdf"
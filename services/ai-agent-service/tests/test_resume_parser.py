@@ -0,0 +1,67 @@
+import fitz
+import pytest
+
+from config.config import Config
+from services import resume_parser
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i} Python Flask experience")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_parallel_extraction_matches_sequential(tmp_path, monkeypatch):
+    path = tmp_path / "long.pdf"
+    _make_pdf(path, 12)
+
+    monkeypatch.setattr(Config, "PARALLEL_PDF_MIN_PAGES", 1000)
+    sequential = resume_parser.extract_text(str(path))
+
+    monkeypatch.setattr(Config, "PARALLEL_PDF_MIN_PAGES", 4)
+    monkeypatch.setattr(Config, "PARSER_WORKERS", 2)
+    parallel = resume_parser.extract_text(str(path))
+
+    assert parallel == sequential
+    assert "Page 11" in parallel
+
+
+def test_pages_beyond_cap_are_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "huge.pdf"
+    _make_pdf(path, 5)
+    monkeypatch.setattr(Config, "MAX_RESUME_PAGES", 2)
+
+    pages = list(resume_parser.iter_text(str(path)))
+    assert len(pages) == 2
+
+
+def test_oversized_files_are_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "big.pdf"
+    _make_pdf(path, 1)
+    monkeypatch.setattr(Config, "MAX_RESUME_BYTES", 10)
+
+    with pytest.raises(Exception, match="byte limit"):
+        resume_parser.extract_text(str(path))
+
+
+def test_ocr_fallbacks_are_counted_in_the_parent(tmp_path, monkeypatch):
+    path = tmp_path / "scanned.pdf"
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    monkeypatch.setattr(resume_parser, "has_ocr", lambda: True)
+    monkeypatch.setattr(resume_parser, "_ocr_page", lambda page, dpi: f"scanned page {page.number}")
+    before = resume_parser.OCR_FALLBACKS.value(kind="pdf_page")
+
+    # What a pool worker returns: counting there would be lost with the worker's memory
+    pages = resume_parser._extract_pdf_range(str(path), 0, 2, Config.OCR_MIN_PAGE_CHARS, Config.OCR_DPI)
+    assert pages == [("scanned page 0", True), ("scanned page 1", True)]
+    assert resume_parser.OCR_FALLBACKS.value(kind="pdf_page") == before
+
+    assert list(resume_parser._counted(pages)) == ["scanned page 0", "scanned page 1"]
+    assert resume_parser.OCR_FALLBACKS.value(kind="pdf_page") == before + 2
@@ -0,0 +1,77 @@
+import os
+import runpy
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import server
+from services.task_queue import TaskQueue
+
+GUNICORN_CONF = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+
+
+class _Recorder:
+    def __init__(self, calls, name):
+        self.calls, self.name = calls, name
+
+    def flush(self):
+        self.calls.append(f"{self.name}.flush")
+
+    def stop(self):
+        self.calls.append(f"{self.name}.stop")
+
+
+def test_gunicorn_config_preloads_and_reads_env(monkeypatch):
+    monkeypatch.setenv("WEB_WORKERS", "3")
+    monkeypatch.setenv("WEB_THREADS", "4")
+    monkeypatch.setenv("PORT", "6000")
+    monkeypatch.setenv("EMBEDDING_THREADS", "2")
+
+    conf = runpy.run_path(str(GUNICORN_CONF))
+
+    assert conf["preload_app"] is True
+    assert (conf["workers"], conf["threads"], conf["bind"]) == (3, 4, "0.0.0.0:6000")
+    assert callable(conf["when_ready"]) and callable(conf["post_fork"]) and callable(conf["worker_exit"])
+    assert callable(conf["post_worker_init"])
+
+
+def test_gunicorn_defaults_to_one_worker(monkeypatch):
+    # Background jobs, the candidate index and metrics are per-process
+    monkeypatch.delenv("WEB_WORKERS", raising=False)
+    monkeypatch.setenv("EMBEDDING_THREADS", "1")
+    assert runpy.run_path(str(GUNICORN_CONF))["workers"] == 1
+
+
+def test_importing_the_app_does_not_touch_mongo():
+    # A fresh interpreter, since this process imported the app long ago
+    code = (
+        "import utils.database as database\n"
+        "database.ensure_indexes = lambda: print('ensure_indexes called')\n"
+        "import server, time\n"
+        "time.sleep(0.2)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                            env={**os.environ, "PYTHONPATH": str(GUNICORN_CONF.parent / "src")})
+    assert result.returncode == 0, result.stderr
+    assert "ensure_indexes called" not in result.stdout
+
+
+def test_drain_finishes_queued_submissions_before_flushing(monkeypatch):
+    calls = []
+    queue = TaskQueue(workers=1, max_pending=10)
+
+    def submission(n):
+        time.sleep(0.05)
+        calls.append(f"job{n}")
+
+    job_ids = [queue.submit(submission, n) for n in range(3)]
+    monkeypatch.setattr(server, "get_task_queue", lambda: queue)
+    monkeypatch.setattr(server, "get_bulk_writer", lambda: _Recorder(calls, "writer"))
+    monkeypatch.setattr(server, "get_candidate_index", lambda: _Recorder(calls, "index"))
+    monkeypatch.setattr(server, "get_email_dispatcher", lambda: _Recorder(calls, "email"))
+
+    server.drain()
+
+    assert calls == ["job0", "job1", "job2", "writer.flush", "index.flush", "email.stop"]
+    assert all(queue.get(job_id)["status"] == "done" for job_id in job_ids)
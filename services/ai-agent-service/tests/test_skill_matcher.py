@@ -0,0 +1,60 @@
+import mongomock
+import numpy as np
+
+from services.candidate_index import CandidateIndex
+from services.skill_matcher import SkillMatcher, get_skill_matcher, normalize_skills
+from utils import database
+
+
+def test_extracts_whole_skills_in_one_pass():
+    text = """Senior engineer: JavaScript, TypeScript, Node.js and React.js front ends.
+    Backend in C++, C# / ASP.NET and Python/Django; deployed with Docker on K8s via CI/CD.
+    Familiar with machine learning (scikit-learn)."""
+
+    skills = get_skill_matcher().extract(text)
+
+    assert skills == [
+        ".net", "c#", "c++", "ci/cd", "django", "docker", "javascript", "kubernetes",
+        "machine learning", "node.js", "python", "react", "scikit-learn", "typescript",
+    ]
+    # "java" must not fire inside "javascript"
+    assert "java" not in skills
+
+
+def test_multi_word_aliases_and_overlaps():
+    matcher = SkillMatcher({"x": {"spring boot": ["spring boot"], "boot camp": ["boot camp"], "go": ["golang"]}})
+
+    assert matcher.extract("Spring Boot camp, then golang") == ["boot camp", "go", "spring boot"]
+    assert matcher.extract("spring, boot") == []
+    assert matcher.extract("") == []
+
+
+def test_by_category_and_normalize():
+    matcher = get_skill_matcher()
+
+    assert matcher.by_category(["python", "docker", "unknown"]) == {
+        "languages": ["python"], "cloud_devops": ["docker"], "other": ["unknown"],
+    }
+    assert normalize_skills(["Node", "k8s", " Cobol ", "nodejs"]) == ["node.js", "kubernetes", "cobol"]
+
+
+def test_must_have_filter_uses_stored_skills(monkeypatch):
+    monkeypatch.setattr(database, "_client", mongomock.MongoClient())
+    job = "Backend developer"
+    database.store_resume("Ada", "a@x", "", job, 80.0, "Highly Recommended", None, skills=["docker", "python"])
+    database.store_resume("Bob", "b@x", "", job, 90.0, "Highly Recommended", None, skills=["python"])
+    database.store_resume("Cy", "c@x", "", "Other job", 95.0, "Highly Recommended", None, skills=["docker", "python"])
+
+    everyone = database.find_resumes_with_skills(["python", "docker"])
+    assert [c["name"] for c in everyone] == ["Cy", "Ada"]
+    assert [c["name"] for c in database.find_resumes_with_skills(["python"], job)] == ["Bob", "Ada"]
+
+
+def test_index_search_restricted_to_allowed_ids(tmp_path):
+    vectors = np.random.default_rng(0).normal(size=(6, 16)).astype(np.float32)
+    index = CandidateIndex(directory=tmp_path, dim=16)
+    index.add_many([f"r{i}" for i in range(6)], vectors)
+
+    top = index.search(vectors[2], k=5, allowed_ids=["r4", "r5", "missing"])
+    assert sorted(rid for rid, _ in top) == ["r4", "r5"]
+    assert index.search(vectors[2], k=5, allowed_ids=[]) == []
@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from services.warmup import WarmUp
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Importing server.py must stay cheap: health checks answer before any of these load
+IMPORT_BUDGET_SECONDS = 1.5
+HEAVY_MODULES = [
+    "torch", "sentence_transformers", "onnxruntime", "transformers", "faiss",
+    "langchain_core", "fitz", "pymupdf", "docx", "pytesseract", "yagmail",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import server
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _import_server():
+    env = dict(os.environ, GEMINI_API_KEY="test-key", WARM_MODELS_ON_STARTUP="false", PYTHONPATH=str(SRC))
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=SRC, env=env, capture_output=True, text=True, timeout=120, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_server_import_defers_heavy_dependencies():
+    # Warm once so the measurement is not dominated by a cold disk cache
+    _import_server()
+    result = _import_server()
+
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS, f"server import took {result['seconds']:.2f}s"
+
+
+def test_spawned_workers_do_not_warm_up():
+    # multiprocessing's spawn start method re-runs the parent's main script like this in
+    # every child, so under `python src/server.py` each parser worker imports server.py
+    code = (
+        "import runpy, threading\n"
+        f"module = runpy.run_path({str(SRC / 'server.py')!r}, run_name='__mp_main__')\n"
+        "print(module['warm_up'].started_at, [t.name for t in threading.enumerate()])\n"
+    )
+    env = dict(os.environ, GEMINI_API_KEY="test-key", WARM_MODELS_ON_STARTUP="true", PYTHONPATH=str(SRC))
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, env=env, capture_output=True, text=True, timeout=120, check=True
+    ).stdout
+
+    assert out.strip().splitlines()[-1].startswith("None ")
+    assert "warm-up" not in out and "[WarmUp]" not in out
+
+
+def test_warm_up_runs_in_background_and_reports_ready():
+    release = threading.Event()
+    warm_up = WarmUp([("model", release.wait), ("parsers", lambda: None)]).start()
+
+    status = warm_up.status()
+    assert status["ready"] is False
+    assert status["steps"]["model"]["status"] == "running"
+
+    release.set()
+    assert warm_up.wait(5) is True
+    assert all(step["status"] == "done" for step in warm_up.status()["steps"].values())
+
+
+def test_failed_step_keeps_service_unready():
+    def broken():
+        raise RuntimeError("model files missing")
+
+    warm_up = WarmUp([("model", broken), ("parsers", lambda: None)]).start()
+
+    assert warm_up.wait(5) is False
+    steps = warm_up.status()["steps"]
+    assert steps["model"] == {"status": "failed", "seconds": steps["model"]["seconds"], "error": "model files missing"}
+    assert steps["parsers"]["status"] == "done"
+
+
+def test_liveness_and_readiness_endpoints(monkeypatch):
+    import server
+
+    client = server.app.test_client()
+    release = threading.Event()
+    monkeypatch.setattr(server, "warm_up", WarmUp([("model", release.wait)]).start())
+
+    assert client.get("/health/live").status_code == 200
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["steps"]["model"]["status"] == "running"
+
+    release.set()
+    server.warm_up.wait(5)
+    assert client.get("/health/ready").status_code == 200
@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from services.task_queue import QueueFullError, TaskQueue
+
+
+def test_job_status_moves_from_queued_to_done():
+    queue = TaskQueue(workers=1, max_pending=4, result_ttl=60)
+    job_id = queue.submit(lambda a, b: a + b, 2, 3)
+    queue.shutdown(wait=True)
+
+    job = queue.get(job_id)
+    assert job["status"] == "done"
+    assert job["result"] == 5
+
+
+def test_failures_are_recorded_not_raised():
+    queue = TaskQueue(workers=1, max_pending=4, result_ttl=60)
+
+    def boom():
+        raise RuntimeError("gemini down")
+
+    job_id = queue.submit(boom)
+    queue.shutdown(wait=True)
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.get(job_id)["error"] == "gemini down"
+
+
+def test_queue_rejects_work_beyond_its_bound():
+    queue = TaskQueue(workers=1, max_pending=2, result_ttl=60)
+    release = threading.Event()
+    queue.submit(release.wait)
+    queue.submit(release.wait)
+
+    with pytest.raises(QueueFullError):
+        queue.submit(release.wait)
+
+    release.set()
+    queue.shutdown(wait=True)
+    assert queue.stats()["jobs"] == {"done": 2}
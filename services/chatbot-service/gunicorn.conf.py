@@ -0,0 +1,23 @@
+"""
+Production serving for the chatbot service:
+
+    gunicorn -c gunicorn.conf.py server:app
+
+Chat requests mostly wait on Gemini and a streamed reply holds its thread until the
+answer ends, so one worker (the default) runs many threads. /metrics reports the
+process that answers the scrape; with more WEB_WORKERS each scrape would see only one
+of them. History is shared through the SQLite session store, but never raise
+WEB_WORKERS with CHAT_SESSION_BACKEND=memory, since each worker would then hold its
+own conversations.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5006')}"
+workers = int(os.getenv("WEB_WORKERS", "1"))
+threads = int(os.getenv("WEB_THREADS", "32"))
+worker_class = "gthread"
+preload_app = True
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("SHUTDOWN_GRACE_SECONDS", "30"))
+keepalive = 5
+accesslog = "-"
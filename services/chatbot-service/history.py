@@ -0,0 +1,112 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and an HR assistant.
+Keep facts the assistant will need later (names, roles, dates, requests, decisions); drop small talk.
+Answer with the new summary only, in at most {max_words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}
+"""
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English; close enough for budgeting without a tokenizer call
+    return len(text or "") // 4 + 1
+
+
+def message_tokens(message):
+    return sum(estimate_tokens(part) for part in message["parts"])
+
+
+def split_window(history, budget):
+    """
+    Split history into (older, window): `window` is the newest run of messages whose
+    estimated tokens fit in `budget`, starting on a user turn as Gemini requires.
+    """
+    used, start = 0, len(history)
+    while start > 0 and used + message_tokens(history[start - 1]) <= budget:
+        start -= 1
+        used += message_tokens(history[start])
+    while start < len(history) and history[start]["role"] != "user":
+        start += 1
+    return history[:start], history[start:]
+
+
+class HistoryCompactor:
+    """
+    Builds the history sent with each chat turn: a rolling summary of older turns
+    followed by the newest turns that fit CHAT_HISTORY_TOKEN_BUDGET. Turns that fall
+    out of the window are folded into the summary by a background thread, so the
+    request never waits on the summarization call.
+    """
+
+    def __init__(self, store, summarize, token_budget=None, workers=1):
+        self.store = store
+        self.summarize = summarize
+        self.token_budget = token_budget or int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+        self.workers = workers
+        self.compactions = 0
+        self.failures = 0
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def context(self, session_id):
+        """History for start_chat(): the summary (if any) plus the budgeted window."""
+        summary, messages, trimmed = self.store.snapshot(session_id)
+        history = [{"role": role, "parts": [content]} for _, role, content in messages]
+        older, window = split_window(history, max(self.token_budget - estimate_tokens(summary), 0))
+        # Turns cut by the store's message cap are summarized along with those outside the window
+        unsummarized = trimmed + messages[:len(older)]
+        if unsummarized:
+            self._schedule(session_id, summary, unsummarized)
+        if not summary:
+            return window
+        return [
+            {"role": "user", "parts": [f"Summary of our conversation so far: {summary}"]},
+            {"role": "model", "parts": ["Understood, I'll keep that in mind."]},
+        ] + window
+
+    def _schedule(self, session_id, summary, messages):
+        with self._lock:
+            # One compaction per session at a time; the next turn picks up anything left over
+            if session_id in self._in_flight:
+                return
+            self._in_flight.add(session_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="summarize")
+        self._executor.submit(self._compact, session_id, summary, messages)
+
+    def _compact(self, session_id, summary, messages):
+        try:
+            transcript = "\n".join(f"{role}: {content}" for _, role, content in messages)
+            new_summary = self.summarize(summary, transcript)
+            # Delete exactly what was summarized: appends may have trimmed or added turns meanwhile
+            self.store.compact(session_id, new_summary, [message_id for message_id, _, _ in messages])
+            self.compactions += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Error summarizing session {session_id}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(session_id)
+
+    def wait(self):
+        """Block until queued compactions finish (tests and shutdown)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        return {
+            "token_budget": self.token_budget,
+            "compactions": self.compactions,
+            "failures": self.failures,
+            "in_flight": len(self._in_flight),
+        }
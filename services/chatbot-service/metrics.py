@@ -0,0 +1,22 @@
+import os
+import sys
+
+try:
+    from prometheus_text import MetricsRegistry, StageMetrics
+except ImportError:
+    # Images copy it next to the app; in a checkout it lives in the repo's shared/python
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared", "python"))
+    from prometheus_text import MetricsRegistry, StageMetrics
+
+
+REGISTRY = MetricsRegistry()
+
+STAGES = StageMetrics(REGISTRY, "chat", "chat", ("gemini",))
+STAGE_SECONDS, STAGE_ERRORS, UPSTREAM_ERRORS = STAGES.seconds, STAGES.errors, STAGES.upstream_errors
+HTTP_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency (streamed replies: until the stream starts).",
+    ["method", "endpoint", "status"]
+)
+
+span = STAGES.span
+upstream_error = STAGES.upstream_error
@@ -1,8 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
+import time
 from dotenv import load_dotenv
 import google.generativeai as genai
+from session_store import create_session_store
+from history import SUMMARY_PROMPT, HistoryCompactor
+from streaming import StreamMetrics, chunk_text, sse
+from metrics import REGISTRY, HTTP_SECONDS, span, upstream_error
 
 load_dotenv()
 
@@ -13,8 +18,14 @@ CORS(app)  # Enable CORS for frontend
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 genai.configure(api_key=GEMINI_API_KEY)
 
-# Initialize Gemini model
-model = genai.GenerativeModel('gemini-2.5-flash')
+MODEL_NAME = 'gemini-2.5-flash'
+
+GENERATION_CONFIG = genai.types.GenerationConfig(
+    temperature=0.7,
+    top_p=0.95,
+    top_k=40,
+    max_output_tokens=500,
+)
 
 # System prompt for HR chatbot
 SYSTEM_PROMPT = """You are an intelligent HR Assistant for an HR-ERP system. Your role is to help users with:
@@ -36,12 +47,76 @@ Be helpful, professional, and concise. If you don't know something, be honest ab
 Provide actionable guidance and next steps when possible.
 """
 
-# Conversation history storage (in production, use Redis or database)
-conversations = {}
+# Initialize Gemini model. The system prompt goes in once as the system instruction
+# instead of being prepended to every user message.
+model = genai.GenerativeModel(MODEL_NAME, system_instruction=SYSTEM_PROMPT)
+summary_model = genai.GenerativeModel(MODEL_NAME)
+
+SUMMARY_CONFIG = genai.types.GenerationConfig(temperature=0.2, max_output_tokens=300)
+
+def summarize_history(summary, transcript):
+    prompt = SUMMARY_PROMPT.format(max_words=150, summary=summary or "(none)", transcript=transcript)
+    with span("summarize", upstream="gemini"):
+        return summary_model.generate_content(prompt, generation_config=SUMMARY_CONFIG).text.strip()
+
+# Conversation history: bounded per session, persisted in SQLite by default so
+# restarts keep conversations and every worker sees the same history
+sessions = create_session_store()
+stream_metrics = StreamMetrics()
+# Only the newest turns that fit the token budget are sent; older ones are
+# summarized in the background
+compactor = HistoryCompactor(sessions, summarize_history)
+
+def _summary(name, documentation, stats):
+    quantiles = stats.quantiles()
+    return (name, "summary", documentation, [
+        *[({"quantile": str(q)}, seconds) for q, seconds in quantiles.items()],
+        ("_sum", {}, stats.total),
+        ("_count", {}, stats.count),
+    ])
+
+def collect_chat_metrics():
+    """Stream and history counters the service already keeps, read at scrape time."""
+    history = compactor.stats()
+    return [
+        ("chat_streams_total", "counter", "Streamed replies by outcome.", [
+            ({"outcome": "started"}, stream_metrics.started),
+            ({"outcome": "completed"}, stream_metrics.duration.count),
+            ({"outcome": "failed"}, stream_metrics.failed),
+            ({"outcome": "cancelled"}, stream_metrics.cancelled),
+        ]),
+        _summary("chat_time_to_first_token_seconds", "Time to the first streamed token.", stream_metrics.ttft),
+        _summary("chat_stream_duration_seconds", "Time to the end of a streamed reply.", stream_metrics.duration),
+        ("chat_history_compactions_total", "counter", "Background history summarizations by outcome.", [
+            ({"result": "done"}, history["compactions"]),
+            ({"result": "failed"}, history["failures"]),
+        ]),
+        ("chat_sessions", "gauge", "Conversations held by the session store.", [({}, sessions.stats()["sessions"])]),
+    ]
+
+REGISTRY.register_collector(collect_chat_metrics)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.get("request_start")
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                             endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint: stage latencies, Gemini errors, streaming and history stats."""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route("/", methods=["GET"])
 def index():
-    return jsonify({"status": "Chatbot Service is running", "model": "gemini-2.5-flash"}), 200
+    return jsonify({"status": "Chatbot Service is running", "model": MODEL_NAME}), 200
 
 @app.route("/chat", methods=["POST"])
 def chat():
@@ -53,41 +128,21 @@ def chat():
         if not user_message:
             return jsonify({"error": "Message is required"}), 400
         
-        # Get or create conversation history
-        if session_id not in conversations:
-            conversations[session_id] = []
-        
-        # Add user message to history
-        conversations[session_id].append({
-            "role": "user",
-            "parts": [user_message]
-        })
-        
-        # Create chat with history
-        chat = model.start_chat(history=conversations[session_id][:-1])
+        # Create chat with the summary plus the budgeted window of recent turns
+        with span("history"):
+            chat = model.start_chat(history=compactor.context(session_id))
         
         # Get response from Gemini
-        response = chat.send_message(
-            f"{SYSTEM_PROMPT}\n\nUser: {user_message}",
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.7,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=500,
+        with span("llm", upstream="gemini"):
+            response = chat.send_message(
+                user_message,
+                generation_config=GENERATION_CONFIG
             )
-        )
-        
-        bot_response = response.text
+            bot_response = response.text
         
-        # Add bot response to history
-        conversations[session_id].append({
-            "role": "model",
-            "parts": [bot_response]
-        })
-        
-        # Keep only last 10 messages to avoid token limits
-        if len(conversations[session_id]) > 20:
-            conversations[session_id] = conversations[session_id][-20:]
+        # Store the exchange only once it succeeded; the store trims old messages
+        with span("session_store"):
+            sessions.append(session_id, [("user", user_message), ("model", bot_response)])
         
         return jsonify({
             "response": bot_response,
@@ -102,6 +157,77 @@ def chat():
             "response": "I apologize, but I'm having trouble processing your request. Please try again."
         }), 500
 
+@app.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    """
+    Same as /chat, but the reply is sent as Server-Sent Events while Gemini
+    generates it: `token` events carry text chunks, then one `done` (or `error`)
+    event. The exchange is written to the history only once the reply is complete.
+    """
+    data = request.get_json(silent=True) or {}
+    user_message = data.get("message", "")
+    session_id = data.get("session_id", "default")
+    if not user_message:
+        return jsonify({"error": "Message is required"}), 400
+    with span("history"):
+        history = compactor.context(session_id)
+
+    def generate():
+        stream_metrics.stream_started()
+        start = time.perf_counter()
+        ttft = None
+        parts = []
+        try:
+            chat = model.start_chat(history=history)
+            response = chat.send_message(
+                user_message,
+                generation_config=GENERATION_CONFIG,
+                stream=True
+            )
+            for chunk in response:
+                text = chunk_text(chunk)
+                if not text:
+                    continue
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                    stream_metrics.ttft.record(ttft)
+                parts.append(text)
+                yield sse("token", {"text": text})
+
+            bot_response = "".join(parts)
+            with span("session_store"):
+                sessions.append(session_id, [("user", user_message), ("model", bot_response)])
+            stream_metrics.duration.record(time.perf_counter() - start)
+            yield sse("done", {
+                "response": bot_response,
+                "session_id": session_id,
+                "status": "success",
+                "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None
+            })
+        except GeneratorExit:
+            # Client went away mid-reply; nothing is committed to the history
+            stream_metrics.stream_cancelled()
+            raise
+        except Exception as e:
+            print(f"Error in chat stream: {e}")
+            stream_metrics.stream_failed()
+            upstream_error("gemini")
+            yield sse("error", {
+                "error": str(e),
+                "response": "I apologize, but I'm having trouble processing your request. Please try again."
+            })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/chat/metrics", methods=["GET"])
+def chat_metrics():
+    return jsonify({**stream_metrics.snapshot(), "history": compactor.stats()}), 200
+
 @app.route("/reset", methods=["POST"])
 def reset_conversation():
     """Reset conversation history for a session"""
@@ -109,8 +235,7 @@ def reset_conversation():
         data = request.json
         session_id = data.get("session_id", "default")
         
-        if session_id in conversations:
-            del conversations[session_id]
+        sessions.reset(session_id)
         
         return jsonify({
             "status": "success",
@@ -0,0 +1,270 @@
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Limits:
+    """Per-session caps shared by every backend."""
+
+    def __init__(self, max_sessions=None, ttl_seconds=None, max_messages=None, max_message_chars=None):
+        self.max_sessions = max_sessions or int(os.getenv("CHAT_MAX_SESSIONS", "10000"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("CHAT_SESSION_TTL_SECONDS", str(24 * 3600)))
+        self.max_messages = max_messages or int(os.getenv("CHAT_MAX_HISTORY_MESSAGES", "20"))
+        self.max_message_chars = max_message_chars or int(os.getenv("CHAT_MAX_MESSAGE_CHARS", "4000"))
+
+    def clip(self, text):
+        return (text or "")[:self.max_message_chars]
+
+
+def _to_history(rows):
+    # The shape Gemini's start_chat(history=...) expects
+    return [{"role": role, "parts": [content]} for role, content in rows]
+
+
+class _Session:
+    __slots__ = ("messages", "trimmed", "summary", "expires_at")
+
+    def __init__(self):
+        self.messages = []  # [(id, role, content), ...] in the live history
+        self.trimmed = []   # cut by the max_messages cap, waiting to be summarized
+        self.summary = ""
+        self.expires_at = 0.0
+
+
+class MemorySessionStore(_Limits):
+    """
+    Conversation history in process memory: an LRU over sessions with an idle TTL.
+    Fast, but lost on restart and private to one worker.
+    """
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        self._sessions = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _live(self, session_id):
+        # Caller holds the lock
+        session = self._sessions.get(session_id)
+        if session is not None and session.expires_at <= time.time():
+            del self._sessions[session_id]
+            return None
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._live(session_id)
+            if session is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            return _to_history((role, content) for _, role, content in session.messages)
+
+    def get_summary(self, session_id):
+        with self._lock:
+            session = self._live(session_id)
+            return session.summary if session else ""
+
+    def snapshot(self, session_id):
+        """(summary, messages, trimmed) with messages as [(id, role, content), ...]."""
+        with self._lock:
+            session = self._live(session_id)
+            if session is None:
+                return "", [], []
+            return session.summary, list(session.messages), list(session.trimmed)
+
+    def append(self, session_id, messages):
+        """
+        Add [(role, text), ...] to a session. Past max_messages the oldest messages leave
+        the live history but are kept (up to another max_messages) for the next summary.
+        """
+        with self._lock:
+            session = self._live(session_id) or _Session()
+            session.messages.extend((next(self._ids), role, self.clip(text)) for role, text in messages)
+            overflow = len(session.messages) - self.max_messages
+            if overflow > 0:
+                session.trimmed.extend(session.messages[:overflow])
+                del session.messages[:overflow]
+                del session.trimmed[:-self.max_messages]
+            session.expires_at = time.time() + self.ttl_seconds
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def compact(self, session_id, summary, message_ids):
+        """Replace the messages with the given ids by a rolling summary of them."""
+        summarized = set(message_ids)
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.summary = summary
+                session.messages = [m for m in session.messages if m[0] not in summarized]
+                session.trimmed = [m for m in session.trimmed if m[0] not in summarized]
+
+    def reset(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        return {"backend": "memory", "sessions": len(self._sessions), "max_sessions": self.max_sessions}
+
+
+class SQLiteSessionStore(_Limits):
+    """
+    Conversation history in a SQLite file (WAL mode), so it survives restarts and
+    every gunicorn worker on the host serves the same conversations.
+    """
+
+    def __init__(self, db_path=None, **limits):
+        super().__init__(**limits)
+        self.db_path = db_path or os.getenv(
+            "CHAT_SESSION_DB", os.path.join(os.path.dirname(__file__), "data", "chat_sessions.sqlite3")
+        )
+        self._db = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _conn(self):
+        # Connections must not cross a fork, so each process opens its own
+        if self._db is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._pid = os.getpid()
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(session_id TEXT PRIMARY KEY, expires_at REAL NOT NULL, summary TEXT NOT NULL DEFAULT '')"
+            )
+            # trimmed = 1: cut from the live history by max_messages, waiting to be summarized
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "session_id TEXT NOT NULL, role TEXT NOT NULL, content TEXT NOT NULL, "
+                "trimmed INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(messages)")]
+            if "trimmed" not in columns:
+                self._db.execute("ALTER TABLE messages ADD COLUMN trimmed INTEGER NOT NULL DEFAULT 0")
+            self._db.execute("CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+            self._db.commit()
+        return self._db
+
+    def get(self, session_id):
+        with self._lock:
+            db = self._conn()
+            live = db.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ? AND expires_at > ?", (session_id, time.time())
+            ).fetchone()
+            if live is None:
+                return []
+            rows = db.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? AND trimmed = 0 ORDER BY id", (session_id,)
+            ).fetchall()
+            return _to_history(rows)
+
+    def get_summary(self, session_id):
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT summary FROM sessions WHERE session_id = ? AND expires_at > ?", (session_id, time.time())
+            ).fetchone()
+            return row[0] if row else ""
+
+    def snapshot(self, session_id):
+        """(summary, messages, trimmed) with messages as [(id, role, content), ...]."""
+        with self._lock:
+            db = self._conn()
+            row = db.execute(
+                "SELECT summary FROM sessions WHERE session_id = ? AND expires_at > ?", (session_id, time.time())
+            ).fetchone()
+            if row is None:
+                return "", [], []
+            messages, trimmed = [], []
+            for message_id, role, content, is_trimmed in db.execute(
+                "SELECT id, role, content, trimmed FROM messages WHERE session_id = ? ORDER BY id", (session_id,)
+            ):
+                (trimmed if is_trimmed else messages).append((message_id, role, content))
+            return row[0], messages, trimmed
+
+    def append(self, session_id, messages):
+        """
+        Add [(role, text), ...] to a session. Past max_messages the oldest messages leave
+        the live history but are kept (up to another max_messages) for the next summary.
+        """
+        with self._lock:
+            db = self._conn()
+            with db:
+                expired = db.execute(
+                    "SELECT 1 FROM sessions WHERE session_id = ? AND expires_at <= ?", (session_id, time.time())
+                ).fetchone()
+                if expired is not None:
+                    db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                    db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                db.executemany(
+                    "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+                    [(session_id, role, self.clip(text)) for role, text in messages],
+                )
+                db.execute(
+                    "UPDATE messages SET trimmed = 1 WHERE session_id = ? AND trimmed = 0 AND id NOT IN "
+                    "(SELECT id FROM messages WHERE session_id = ? AND trimmed = 0 ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_messages),
+                )
+                db.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND trimmed = 1 AND id NOT IN "
+                    "(SELECT id FROM messages WHERE session_id = ? AND trimmed = 1 ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_messages),
+                )
+                db.execute(
+                    "INSERT INTO sessions (session_id, expires_at) VALUES (?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET expires_at = excluded.expires_at",
+                    (session_id, time.time() + self.ttl_seconds),
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._evict(db)
+
+    def _evict(self, db):
+        db.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+        # Over the cap: drop the sessions that have been idle longest
+        db.execute(
+            "DELETE FROM sessions WHERE session_id NOT IN "
+            "(SELECT session_id FROM sessions ORDER BY expires_at DESC LIMIT ?)",
+            (self.max_sessions,),
+        )
+        db.execute("DELETE FROM messages WHERE session_id NOT IN (SELECT session_id FROM sessions)")
+
+    def compact(self, session_id, summary, message_ids):
+        """Replace the messages with the given ids by a rolling summary of them."""
+        with self._lock:
+            db = self._conn()
+            with db:
+                db.execute("UPDATE sessions SET summary = ? WHERE session_id = ?", (summary, session_id))
+                db.executemany(
+                    "DELETE FROM messages WHERE session_id = ? AND id = ?",
+                    [(session_id, message_id) for message_id in message_ids],
+                )
+
+    def reset(self, session_id):
+        with self._lock:
+            db = self._conn()
+            with db:
+                db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def stats(self):
+        with self._lock:
+            sessions = self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": "sqlite", "sessions": sessions, "max_sessions": self.max_sessions}
+
+
+def create_session_store(backend=None):
+    """Build the store selected by CHAT_SESSION_BACKEND ("sqlite" or "memory")."""
+    backend = backend or os.getenv("CHAT_SESSION_BACKEND", "sqlite")
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "memory":
+        return MemorySessionStore()
+    raise ValueError(f"Unknown CHAT_SESSION_BACKEND '{backend}'")
@@ -0,0 +1,92 @@
+import json
+import threading
+from collections import deque
+
+
+def sse(event, data):
+    """One Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def chunk_text(chunk):
+    """
+    Text of one streamed Gemini chunk, "" when it carries none. `chunk.text` raises
+    ValueError on chunks without parts, such as the last one with finish_reason STOP
+    or MAX_TOKENS, so the parts are read directly.
+    """
+    try:
+        parts = chunk.parts
+    except ValueError:
+        # No candidate at all, e.g. a chunk that only carries usage metadata
+        return ""
+    return "".join(getattr(part, "text", "") or "" for part in parts)
+
+
+class LatencyStats:
+    """Percentiles over a rolling window of recent latencies, plus a running count and total."""
+
+    def __init__(self, window=1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)):
+        """{q: seconds} over the window (empty if nothing was recorded)."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in qs}
+
+    def snapshot(self):
+        quantiles = self.quantiles()
+        if not quantiles:
+            return {"count": self.count, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+        return {
+            "count": self.count,
+            "p50_ms": round(quantiles[0.5] * 1000, 1),
+            "p95_ms": round(quantiles[0.95] * 1000, 1),
+            "p99_ms": round(quantiles[0.99] * 1000, 1),
+        }
+
+
+class StreamMetrics:
+    """Time-to-first-token and full-reply latency of streamed chat responses."""
+
+    def __init__(self):
+        self.ttft = LatencyStats()
+        self.duration = LatencyStats()
+        self.started = 0
+        self.failed = 0
+        self.cancelled = 0
+        self._lock = threading.Lock()
+
+    def _bump(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stream_started(self):
+        self._bump("started")
+
+    def stream_failed(self):
+        self._bump("failed")
+
+    def stream_cancelled(self):
+        self._bump("cancelled")
+
+    def snapshot(self):
+        return {
+            "streams": self.started,
+            "completed": self.duration.count,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "time_to_first_token": self.ttft.snapshot(),
+            "total_duration": self.duration.snapshot(),
+        }
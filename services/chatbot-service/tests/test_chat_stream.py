@@ -0,0 +1,124 @@
+import json
+import time
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+import server
+from history import HistoryCompactor
+from session_store import MemorySessionStore
+from streaming import StreamMetrics
+
+
+class _Part:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Chunk:
+    """Like a streamed genai response chunk: `.text` raises on a chunk without parts."""
+
+    def __init__(self, text):
+        self.parts = [_Part(text)] if text else []
+
+    @property
+    def text(self):
+        if not self.parts:
+            raise ValueError("The `response.text` quick accessor requires the response to contain a valid `Part`")
+        return "".join(part.text for part in self.parts)
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel: yields the reply in chunks, optionally failing midway."""
+
+    def __init__(self, chunks, fail_after=None, delay=0.0):
+        self.chunks, self.fail_after, self.delay = chunks, fail_after, delay
+        self.histories = []
+        self.prompts = []
+
+    def start_chat(self, history):
+        self.histories.append(history)
+        return self
+
+    def send_message(self, prompt, generation_config=None, stream=False):
+        assert stream
+        self.prompts.append(prompt)
+        return self._stream()
+
+    def _stream(self):
+        for i, text in enumerate(self.chunks):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("quota exceeded")
+            time.sleep(self.delay)
+            yield _Chunk(text)
+        # Gemini ends the stream with a chunk holding only finish_reason
+        yield _Chunk("")
+
+
+def _events(response):
+    events = []
+    for frame in response.get_data(as_text=True).strip().split("\n\n"):
+        event, data = frame.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = MemorySessionStore()
+    monkeypatch.setattr(server, "sessions", store)
+    monkeypatch.setattr(server, "compactor", HistoryCompactor(store, lambda summary, transcript: "summary"))
+    monkeypatch.setattr(server, "stream_metrics", StreamMetrics())
+    return server.app.test_client()
+
+
+def test_stream_forwards_chunks_and_commits_history(client, monkeypatch):
+    fake = FakeModel(["Leave requests ", "go through ", "the HR portal."], delay=0.01)
+    monkeypatch.setattr(server, "model", fake)
+
+    response = client.post("/chat/stream", json={"message": "How do I request leave?", "session_id": "s1"})
+
+    assert response.mimetype == "text/event-stream"
+    events = _events(response)
+    assert [e for e, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(d["text"] for e, d in events if e == "token") == "Leave requests go through the HR portal."
+    assert events[-1][1]["response"] == "Leave requests go through the HR portal."
+    assert events[-1][1]["ttft_ms"] >= 10
+
+    history = server.sessions.get("s1")
+    assert [(m["role"], m["parts"][0]) for m in history] == [
+        ("user", "How do I request leave?"),
+        ("model", "Leave requests go through the HR portal."),
+    ]
+
+    # The next turn sees the committed exchange; the system prompt travels as the
+    # model's system instruction, not inside the message
+    client.post("/chat/stream", json={"message": "Thanks", "session_id": "s1"}).get_data()
+    assert len(fake.histories[-1]) == 2
+    assert fake.prompts == ["How do I request leave?", "Thanks"]
+
+
+def test_failed_stream_reports_error_and_keeps_history_clean(client, monkeypatch):
+    monkeypatch.setattr(server, "model", FakeModel(["partial ", "reply"], fail_after=1))
+
+    events = _events(client.post("/chat/stream", json={"message": "hi", "session_id": "s2"}))
+
+    assert [e for e, _ in events] == ["token", "error"]
+    assert "quota exceeded" in events[-1][1]["error"]
+    assert server.sessions.get("s2") == []
+
+
+def test_metrics_report_time_to_first_token(client, monkeypatch):
+    monkeypatch.setattr(server, "model", FakeModel(["a", "b"], delay=0.02))
+    for _ in range(3):
+        client.post("/chat/stream", json={"message": "hi", "session_id": "s3"}).get_data()
+
+    metrics = client.get("/chat/metrics").get_json()
+    assert metrics["streams"] == metrics["completed"] == 3
+    assert metrics["time_to_first_token"]["count"] == 3
+    assert metrics["time_to_first_token"]["p50_ms"] >= 20
+    assert metrics["total_duration"]["p50_ms"] >= metrics["time_to_first_token"]["p50_ms"]
+
+
+def test_stream_requires_message(client):
+    assert client.post("/chat/stream", json={"session_id": "s4"}).status_code == 400
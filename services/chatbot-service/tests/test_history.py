@@ -0,0 +1,133 @@
+import threading
+import pytest
+
+from history import HistoryCompactor, estimate_tokens, split_window
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**limits):
+        if request.param == "memory":
+            return MemorySessionStore(**limits)
+        return SQLiteSessionStore(db_path=str(tmp_path / "sessions.sqlite3"), **limits)
+    return make
+
+
+def _message(name):
+    # 20 characters, 6 estimated tokens
+    return name.ljust(20, ".")
+
+
+def _turns(store, session_id, n, words=40):
+    for i in range(n):
+        store.append(session_id, [("user", f"question {i} " + "word " * words), ("model", f"answer {i} " + "word " * words)])
+
+
+def test_split_window_keeps_newest_turns_within_budget():
+    history = [{"role": r, "parts": [t]} for r, t in [("user", "a" * 400), ("model", "b" * 400), ("user", "c" * 40), ("model", "d" * 40)]]
+
+    older, window = split_window(history, budget=estimate_tokens("c" * 40) * 2)
+    assert [m["parts"][0][0] for m in window] == ["c", "d"]
+    assert len(older) == 2
+
+    # A window never starts on a model turn
+    older, window = split_window(history, budget=estimate_tokens("d" * 40))
+    assert window == [] and len(older) == 4
+
+
+def test_older_turns_are_folded_into_a_background_summary():
+    store = MemorySessionStore(max_messages=100)
+    calls = []
+
+    def summarize(summary, transcript):
+        calls.append((summary, transcript))
+        return f"summary #{len(calls)}"
+
+    compactor = HistoryCompactor(store, summarize, token_budget=250)
+    _turns(store, "s1", 6)
+
+    first = compactor.context("s1")
+    assert sum(estimate_tokens(m["parts"][0]) for m in first) <= 250
+    compactor.wait()
+
+    assert calls[0][0] == "" and "question 0" in calls[0][1]
+    assert store.get_summary("s1") == "summary #1"
+    # Summarized turns leave the store; the next request sends summary + recent turns
+    second = compactor.context("s1")
+    assert second[0]["parts"][0] == "Summary of our conversation so far: summary #1"
+    assert second[2:] == store.get("s1")[-len(second[2:]):]
+    assert len(store.get("s1")) < 12
+    compactor.wait()
+    assert compactor.stats()["compactions"] >= 1
+
+
+def test_failed_summary_keeps_history():
+    store = MemorySessionStore(max_messages=100)
+
+    def summarize(summary, transcript):
+        raise RuntimeError("quota exceeded")
+
+    compactor = HistoryCompactor(store, summarize, token_budget=100)
+    _turns(store, "s1", 4)
+    compactor.context("s1")
+    compactor.wait()
+
+    assert len(store.get("s1")) == 8
+    assert store.get_summary("s1") == ""
+    assert compactor.stats()["failures"] == 1
+
+
+def test_turns_appended_during_a_summary_are_not_lost(make_store):
+    store = make_store(max_messages=4)
+    started, release = threading.Event(), threading.Event()
+    transcripts = []
+
+    def summarize(summary, transcript):
+        transcripts.append(transcript)
+        started.set()
+        release.wait(5)
+        return "S"
+
+    # Room for two messages next to the (at most one-token) summary
+    compactor = HistoryCompactor(store, summarize, token_budget=13)
+    store.append("s1", [("user", _message("u1")), ("model", _message("m2"))])
+    store.append("s1", [("user", _message("u3")), ("model", _message("m4"))])
+    compactor.context("s1")
+    assert started.wait(5)
+
+    # The cap pushes u1/m2 out while they are being summarized
+    store.append("s1", [("user", _message("u5")), ("model", _message("m6"))])
+    release.set()
+    compactor.wait()
+
+    assert "u1" in transcripts[0] and "u3" not in transcripts[0]
+    assert store.get_summary("s1") == "S"
+    assert [m["parts"][0][:2] for m in store.get("s1")] == ["u3", "m4", "u5", "m6"]
+
+    # u3/m4 fall outside the window next time and are summarized, not dropped
+    compactor.context("s1")
+    compactor.wait()
+    assert "u3" in transcripts[1] and "m4" in transcripts[1]
+    assert [m["parts"][0][:2] for m in store.get("s1")] == ["u5", "m6"]
+
+
+def test_turns_cut_by_the_message_cap_are_summarized(make_store):
+    store = make_store(max_messages=2)
+    transcripts = []
+
+    def summarize(summary, transcript):
+        transcripts.append(transcript)
+        return "asked u1"
+
+    compactor = HistoryCompactor(store, summarize, token_budget=1000)
+    store.append("s1", [("user", _message("u1")), ("model", _message("m2"))])
+    store.append("s1", [("user", _message("u3")), ("model", _message("m4"))])
+
+    window = compactor.context("s1")
+    compactor.wait()
+
+    assert [m["parts"][0][:2] for m in window] == ["u3", "m4"]
+    assert "u1" in transcripts[0] and "m2" in transcripts[0] and "u3" not in transcripts[0]
+    assert store.snapshot("s1")[0] == "asked u1"
+    assert store.snapshot("s1")[2] == []
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+import server
+from history import HistoryCompactor
+from metrics import MetricsRegistry, UPSTREAM_ERRORS
+from session_store import MemorySessionStore
+from streaming import LatencyStats, StreamMetrics
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+        self.parts = [self]
+
+
+class FakeModel:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def start_chat(self, history):
+        return self
+
+    def send_message(self, prompt, generation_config=None, stream=False):
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        if stream:
+            return iter([_Chunk("Hello "), _Chunk("there")])
+        return _Chunk("Hello there")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    store = MemorySessionStore()
+    monkeypatch.setattr(server, "sessions", store)
+    monkeypatch.setattr(server, "compactor", HistoryCompactor(store, lambda summary, transcript: "summary"))
+    monkeypatch.setattr(server, "stream_metrics", StreamMetrics())
+    return server.app.test_client()
+
+
+def test_metrics_endpoint_reports_streams_stages_and_requests(client, monkeypatch):
+    monkeypatch.setattr(server, "model", FakeModel())
+    client.post("/chat/stream", json={"message": "hi", "session_id": "s1"}).get_data()
+    client.post("/chat", json={"message": "hi again", "session_id": "s1"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    assert 'chat_streams_total{outcome="completed"} 1' in text
+    assert "# TYPE chat_time_to_first_token_seconds summary" in text
+    assert 'quantile="0.95"}' in text
+    assert "chat_time_to_first_token_seconds_count " in text
+    assert 'chat_stage_duration_seconds_count{stage="session_store"}' in text
+    assert 'stage="llm"}' in text
+    assert 'endpoint="/chat",status="200"' in text
+    assert "chat_sessions " in text
+
+
+def test_failed_chat_counts_gemini_error(client, monkeypatch):
+    monkeypatch.setattr(server, "model", FakeModel(fail=True))
+    # Module-level counters are shared across tests, so compare against a baseline
+    errors = UPSTREAM_ERRORS.value(upstream="gemini")
+
+    assert client.post("/chat", json={"message": "hi"}).status_code == 500
+    assert UPSTREAM_ERRORS.value(upstream="gemini") == errors + 1
+
+
+def test_collector_samples_and_latency_quantiles():
+    registry = MetricsRegistry()
+    stats = LatencyStats()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        stats.record(seconds)
+    registry.register_collector(lambda: [
+        ("demo_seconds", "summary", "Demo.", [({"quantile": "0.5"}, stats.quantiles()[0.5]), ("_count", {}, stats.count)]),
+    ])
+
+    text = registry.render()
+
+    assert 'demo_seconds{quantile="0.5"} 0.3' in text
+    assert text.rstrip().endswith("demo_seconds_count 4")
+    assert stats.total == pytest.approx(1.0)
@@ -0,0 +1,107 @@
+import time
+import pytest
+
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**limits):
+        if request.param == "memory":
+            return MemorySessionStore(**limits)
+        return SQLiteSessionStore(db_path=str(tmp_path / "sessions.sqlite3"), **limits)
+    return make
+
+
+def test_history_is_capped_per_session(make_store):
+    store = make_store(max_messages=4, max_message_chars=5)
+    for i in range(5):
+        store.append("s1", [("user", f"question {i}"), ("model", f"answer {i}")])
+
+    history = store.get("s1")
+    assert [m["role"] for m in history] == ["user", "model", "user", "model"]
+    # Oldest exchanges dropped, long messages clipped
+    assert [m["parts"][0] for m in history] == ["quest", "answe", "quest", "answe"]
+    assert store.get("other") == []
+
+
+def test_idle_sessions_expire(make_store):
+    store = make_store(ttl_seconds=0.05)
+    store.append("s1", [("user", "hi"), ("model", "hello")])
+    time.sleep(0.1)
+
+    assert store.get("s1") == []
+    store.append("s1", [("user", "again"), ("model", "hello again")])
+    assert len(store.get("s1")) == 2
+
+
+def test_reset_clears_history(make_store):
+    store = make_store()
+    store.append("s1", [("user", "hi"), ("model", "hello")])
+    store.reset("s1")
+
+    assert store.get("s1") == []
+
+
+def test_memory_store_evicts_least_recently_used_session():
+    store = MemorySessionStore(max_sessions=2)
+    store.append("a", [("user", "1")])
+    store.append("b", [("user", "2")])
+    store.get("a")
+    store.append("c", [("user", "3")])
+
+    assert store.get("b") == []
+    assert store.get("a") and store.get("c")
+    assert store.stats()["sessions"] == 2
+
+
+def test_sqlite_store_is_shared_between_workers_and_restarts(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    worker_a = SQLiteSessionStore(db_path=path)
+    worker_b = SQLiteSessionStore(db_path=path)
+
+    worker_a.append("s1", [("user", "hi"), ("model", "hello")])
+    worker_b.append("s1", [("user", "how are you?"), ("model", "fine")])
+
+    restarted = SQLiteSessionStore(db_path=path)
+    assert [m["parts"][0] for m in restarted.get("s1")] == ["hi", "hello", "how are you?", "fine"]
+
+
+def test_sqlite_store_keeps_session_count_flat(tmp_path):
+    store = SQLiteSessionStore(db_path=str(tmp_path / "sessions.sqlite3"), max_sessions=50)
+    for i in range(300):
+        store.append(f"session-{i}", [("user", "hi"), ("model", "hello")])
+
+    assert store.stats()["sessions"] == 50
+    assert store.get("session-299") and store.get("session-0") == []
+
+
+def test_compact_replaces_oldest_messages_with_summary(make_store):
+    store = make_store()
+    store.append("s1", [("user", "q1"), ("model", "a1"), ("user", "q2"), ("model", "a2")])
+
+    _, messages, _ = store.snapshot("s1")
+    store.compact("s1", "asked q1", [message_id for message_id, _, _ in messages[:2]])
+
+    assert store.get_summary("s1") == "asked q1"
+    assert [m["parts"][0] for m in store.get("s1")] == ["q2", "a2"]
+    # The summary survives later appends and goes away with the session
+    store.append("s1", [("user", "q3"), ("model", "a3")])
+    assert store.get_summary("s1") == "asked q1"
+    store.reset("s1")
+    assert store.get_summary("s1") == ""
+
+
+def test_capped_messages_wait_in_the_snapshot_for_the_next_summary(make_store):
+    store = make_store(max_messages=2)
+    store.append("s1", [("user", "q1"), ("model", "a1"), ("user", "q2"), ("model", "a2")])
+
+    summary, messages, trimmed = store.snapshot("s1")
+    assert [m["parts"][0] for m in store.get("s1")] == ["q2", "a2"]
+    assert [content for _, _, content in messages] == ["q2", "a2"]
+    assert [content for _, _, content in trimmed] == ["q1", "a1"]
+
+    store.compact("s1", "asked q1", [message_id for message_id, _, _ in trimmed])
+    assert store.snapshot("s1")[0] == "asked q1"
+    assert store.snapshot("s1")[2] == []
+    assert [m["parts"][0] for m in store.get("s1")] == ["q2", "a2"]
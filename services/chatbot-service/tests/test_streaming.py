@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+from streaming import chunk_text, sse
+
+
+class _FinalChunk:
+    """A streamed chunk with finish_reason and no parts: genai's `.text` raises on it."""
+
+    parts = []
+
+    @property
+    def text(self):
+        raise ValueError("The `response.text` quick accessor requires the response to contain a valid `Part`")
+
+
+class _EmptyChunk:
+    @property
+    def parts(self):
+        raise ValueError("`response.candidates` is empty")
+
+
+def test_chunk_text_joins_parts_and_tolerates_empty_chunks():
+    chunk = SimpleNamespace(parts=[SimpleNamespace(text="Leave requests "), SimpleNamespace(text="go through HR.")])
+
+    assert chunk_text(chunk) == "Leave requests go through HR."
+    assert chunk_text(_FinalChunk()) == ""
+    assert chunk_text(_EmptyChunk()) == ""
+
+
+def test_sse_frames_json_payloads():
+    assert sse("token", {"text": "hi"}) == 'event: token\ndata: {"text": "hi"}\n\n'
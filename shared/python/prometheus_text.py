@@ -0,0 +1,189 @@
+"""
+Counters, histograms and scrape-time collectors rendered in the Prometheus text format,
+shared by the Python services (each image copies this file next to its own metrics.py).
+
+Values live in process memory, so a scrape reports the worker that answered it. The
+services therefore run one gunicorn worker (sized with WEB_THREADS) and are scraped
+per container; raising WEB_WORKERS splits the series across workers, and a scrape
+would then see only one of them.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; spans range from sub-millisecond lookups to multi-second LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Prometheus-style histogram: cumulative bucket counts, sum and count per label set."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, **labels):
+        entry = self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Metrics rendered in the Prometheus text format. Hot paths only touch counters and
+    histograms (a dict update under a lock); values that services already track, like
+    cache hits or queue depth, are read by collectors at scrape time instead.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collect):
+        """
+        `collect()` returns [(name, type, documentation, samples), ...] where each sample
+        is (labels, value), or (suffix, labels, value) for e.g. a summary's "_sum".
+        """
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for sample in samples:
+                    suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+                    if value is not None:
+                        lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class StageMetrics:
+    """
+    Per-stage latency and error counters plus failed calls to external services, as
+    `<prefix>_stage_duration_seconds`, `<prefix>_stage_errors_total` and
+    `upstream_errors_total`, with `span()` to time a stage.
+    """
+
+    def __init__(self, registry, prefix, label, upstreams):
+        self.seconds = registry.histogram(
+            f"{prefix}_stage_duration_seconds", f"Time spent in each {label} stage.", ["stage"]
+        )
+        self.errors = registry.counter(
+            f"{prefix}_stage_errors_total", f"{label.capitalize()} stages that raised.", ["stage"]
+        )
+        self.upstream_errors = registry.counter(
+            "upstream_errors_total", f"Failed calls to external services ({', '.join(upstreams)}).", ["upstream"]
+        )
+
+    @contextmanager
+    def span(self, stage, upstream=None):
+        """
+        Time a block as `stage`; exceptions are counted (also as an `upstream` error
+        when the block is a call to an external service) and re-raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors.inc(stage=stage)
+            if upstream:
+                self.upstream_errors.inc(upstream=upstream)
+            raise
+        finally:
+            self.seconds.observe(time.perf_counter() - start, stage=stage)
+
+    def upstream_error(self, upstream):
+        self.upstream_errors.inc(upstream=upstream)